@@ -4,6 +4,8 @@ from .game import router as game_router
 from .lobby import router as lobby_router
 from .player import router as player_router
 from .mission import router as mission_router
+from .archive import router as archive_router
+from .user import router as user_router
 
 __all__ = [
     "auth_router",
@@ -11,4 +13,6 @@ __all__ = [
     "lobby_router",
     "player_router",
     "mission_router",
+    "archive_router",
+    "user_router",
 ]
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from schemas import UserResponse
+from services.archive_service import ArchivedGame, ArchiveService
+from utils.streaming import iter_csv, iter_ndjson
+from .dependencies import get_archive_service, get_current_active_user
+
+router = APIRouter(prefix="/api/archives", tags=["archives"])
+
+
+@router.get("/export", name="export_archives")
+async def export_archives(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    game_id: Optional[UUID] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    archive_service: ArchiveService = Depends(get_archive_service),
+    current_user: UserResponse = Depends(get_current_active_user),
+):
+    """
+    Exporte les parties archivées en flux (mémoire constante).
+
+    - ``ndjson`` : une partie par ligne, joueurs et missions imbriqués
+    - ``csv`` : une ligne par joueur et par partie
+    """
+    archives = archive_service.stream_archives(game_id=game_id, since=since, until=until)
+
+    if format == "csv":
+        rows = (row async for archive in archives for row in archive.csv_rows())
+        return StreamingResponse(
+            iter_csv(ArchivedGame.CSV_HEADER, rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="game_archive.csv"'},
+        )
+
+    return StreamingResponse(
+        iter_ndjson(archive.to_dict() async for archive in archives),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="game_archive.ndjson"'},
+    )
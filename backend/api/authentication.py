@@ -22,6 +22,7 @@ from services.auth import (
     get_account_activation_manager,
     get_current_active_user,
 )
+from db.database import commit_unit_of_work
 
 # Error messages
 LOGIN_BAD_CREDENTIALS = "Credentials are incorrect"
@@ -36,7 +37,11 @@ REGISTER_EMPTY_FIELDS = "Empty fields"
 REGISTER_WEAK_PASSWORD = "Weak password"
 REGISTER_SPECIAL_CHARACTERS_IN_USERNAME = "Special characters are not allowed in username"
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(
+    prefix="/auth",
+    tags=["auth"],
+    dependencies=[Depends(commit_unit_of_work, scope="function")],
+)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED, name="register")
@@ -95,10 +100,8 @@ async def activate_account(
     if str(account_activation_token.user_id) != str(payload.user_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ACCOUNT_ACTIVATION_BAD_TOKEN)
 
-    await auth_service.set_user_active(account_activation_token.user_id, True)
+    user = await auth_service.set_user_active(account_activation_token.user_id, True)
     await account_activation_manager.mark_token_used(account_activation_token)
-
-    user = await auth_service.get_user_by_id(account_activation_token.user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ACCOUNT_ACTIVATION_BAD_TOKEN)
 
@@ -2,9 +2,13 @@
 from fastapi import Depends
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.database import get_async_session
+from db.database import get_async_session, commit_unit_of_work
 
-from repositories import GameRepository, MissionRepository, PlayerRepository, LobbyRepository
+from repositories import GameRepository, MissionRepository, PlayerRepository, LobbyRepository, UserRepository
+from services.archive_service import ArchiveService
+from services.catalog_export_service import CatalogExportService
+from services.content_import_service import ContentImportService
+from services.stats_service import UserStatsService
 
 from services.auth import (
     get_authentication_service,
@@ -24,12 +28,33 @@ def get_mission_repository(db: AsyncSession = Depends(get_async_session)):
 def get_player_repository(db: AsyncSession = Depends(get_async_session)):
     return PlayerRepository(db)
 
+def get_user_repository(db: AsyncSession = Depends(get_async_session)):
+    return UserRepository(db)
+
+def get_archive_service(db: AsyncSession = Depends(get_async_session)):
+    return ArchiveService(db)
+
+def get_user_stats_service(db: AsyncSession = Depends(get_async_session)):
+    return UserStatsService(db)
+
+def get_catalog_export_service(db: AsyncSession = Depends(get_async_session)):
+    return CatalogExportService(db)
+
+def get_content_import_service(db: AsyncSession = Depends(get_async_session)):
+    return ContentImportService(db)
+
 
 __all__ = [
+    "commit_unit_of_work",
+    "get_archive_service",
     "get_authentication_service",
+    "get_catalog_export_service",
+    "get_content_import_service",
     "get_current_user",
     "get_current_active_user",
     "get_game_repository",
     "get_mission_repository",
     "get_player_repository",
+    "get_user_repository",
+    "get_user_stats_service",
 ]
@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from schemas import (
     GameResponse,
@@ -9,15 +10,27 @@ from schemas import (
     GameUpdate,
     UserResponse,
     MissionResponse,
+    ImportReport,
 )
 
 from repositories.game_repository import GameRepository
 from repositories.mission_repository import MissionRepository
-from .dependencies import get_game_repository, get_mission_repository, get_current_active_user
+from services.catalog_export_service import CatalogExportService
+from services.content_import_service import ContentImportService
+from utils.streaming import iter_gzip, iter_lines, iter_ndjson, parse_records
+from .dependencies import (
+    get_game_repository,
+    get_mission_repository,
+    get_catalog_export_service,
+    get_content_import_service,
+    get_current_active_user,
+    commit_unit_of_work,
+)
 
 router = APIRouter(
     prefix="/api/games",
-    tags=["games"]
+    tags=["games"],
+    dependencies=[Depends(commit_unit_of_work, scope="function")],
 )
 
 
@@ -44,6 +57,75 @@ async def create_game(
     return GameResponse.model_validate(game)
 
 
+@router.post("/import", response_model=ImportReport, name="import_games")
+async def import_games(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    import_service: ContentImportService = Depends(get_content_import_service),
+    current_user: UserResponse = Depends(get_current_active_user),
+):
+    """
+    Import games and their tags from a streamed NDJSON or CSV body (tags separated by | in CSV).
+    A catalog export (``GET /api/games/export``) is accepted as is: its missions are attached
+    to the imported games.
+    """
+    records = parse_records(iter_lines(request.stream()), format)
+    return await import_service.import_games(records, created_by=current_user.id)
+
+
+def _export_response(export_service: CatalogExportService, game_id: Optional[UUID], gzip: bool, filename: str):
+    """NDJSON en flux (un jeu puis ses missions), compressé au fil de l'eau si ``gzip``"""
+    body = iter_ndjson(export_service.stream_catalog(game_id))
+    if gzip:
+        return StreamingResponse(
+            iter_gzip(body),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson.gz"'},
+        )
+    return StreamingResponse(
+        body,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
+
+
+@router.get("/export", name="export_catalog")
+async def export_catalog(
+    gzip: bool = False,
+    export_service: CatalogExportService = Depends(get_catalog_export_service),
+    current_user: UserResponse = Depends(get_current_active_user),
+):
+    """Export the whole catalog (games, tags, missions) as streamed NDJSON"""
+    return _export_response(export_service, None, gzip, "catalog")
+
+
+@router.get("/search", response_model=List[GameResponse], name="search_games")
+async def search_games(
+    q: Optional[str] = Query(None, max_length=200, description="Mots recherchés (préfixes) dans le nom et la description"),
+    tags: List[str] = Query([], description="Tags du jeu (paramètre répétable)"),
+    tag_match: Literal["all", "any"] = Query("all", description="Tous les tags (all) ou au moins un (any)"),
+    difficulty_min: Optional[int] = Query(None, ge=0, le=100),
+    difficulty_max: Optional[int] = Query(None, ge=0, le=100),
+    game_type_id: Optional[UUID] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    game_repository: GameRepository = Depends(get_game_repository),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """Search games by text, tags, game type and mission difficulty"""
+    games = await game_repository.search_games(
+        query=q,
+        tags=tags,
+        match_all_tags=tag_match == "all",
+        difficulty_min=difficulty_min,
+        difficulty_max=difficulty_max,
+        game_type_id=game_type_id,
+        skip=skip,
+        limit=limit,
+    )
+    return [GameResponse.model_validate(game) for game in games]
+
+
 @router.get("/{game_id}", response_model=GameResponse, name="get_game")
 async def get_game(
     game_id: UUID,
@@ -98,6 +180,22 @@ async def delete_game(
     await game_repository.delete_game(game_id)
 
 
+@router.get("/{game_id}/export", name="export_game")
+async def export_game(
+    game_id: UUID,
+    gzip: bool = False,
+    export_service: CatalogExportService = Depends(get_catalog_export_service),
+    current_user: UserResponse = Depends(get_current_active_user),
+):
+    """Export a game, its tags and its missions as streamed NDJSON (constant memory)"""
+    if not await export_service.game_exists(game_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Game not found"
+        )
+    return _export_response(export_service, game_id, gzip, f"game_{game_id}")
+
+
 @router.get("/{game_id}/missions", response_model=List[MissionResponse], name="get_game_missions")
 async def get_game_missions(
     game_id: UUID,
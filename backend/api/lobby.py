@@ -3,6 +3,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 
+from models import LobbyStatus
 from repositories import LobbyRepository, GameRepository, PlayerRepository
 
 from schemas import (
@@ -12,12 +13,22 @@ from schemas import (
     LobbyCreate,
 )
 
-from .dependencies import get_lobby_repository, get_game_repository, get_player_repository, get_current_active_user
+from services.archive_service import ArchiveService
+from services.leaderboard import leaderboards
+from .dependencies import (
+    get_archive_service,
+    get_lobby_repository,
+    get_game_repository,
+    get_player_repository,
+    get_current_active_user,
+    commit_unit_of_work,
+)
 
 
 router = APIRouter(
     prefix="/api/lobbies",
-    tags=["lobbies"]
+    tags=["lobbies"],
+    dependencies=[Depends(commit_unit_of_work, scope="function")],
 )
 
 
@@ -77,6 +88,7 @@ async def update_lobby(
     lobby_id: UUID,
     lobby_data: LobbyUpdate,
     lobby_repository: LobbyRepository = Depends(get_lobby_repository),
+    archive_service: ArchiveService = Depends(get_archive_service),
     current_user: UserResponse = Depends(get_current_active_user)
 ):
     """Mettre à jour un lobby"""
@@ -86,8 +98,14 @@ async def update_lobby(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not the host of this lobby"
         )
-    
+    was_ended = lobby.status == LobbyStatus.ENDED
+
     updated_lobby = await lobby_repository.update_lobby(lobby_id, lobby_data)
+    if updated_lobby.status == LobbyStatus.ENDED and not was_ended:
+        # Partie terminée : archivée dans la même transaction (statistiques des joueurs à
+        # jour immédiatement), le janitor supprimera les lignes live après la rétention
+        await archive_service.archive_lobbies([lobby_id])
+        leaderboards.drop(str(lobby_id))
     return LobbyResponse.model_validate(updated_lobby)
 
 
@@ -113,6 +131,7 @@ async def delete_lobby(
         )
 
     await lobby_repository.delete_lobby(lobby_id)
+    leaderboards.drop(str(lobby_id))
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -1,18 +1,22 @@
 
 from uuid import UUID
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Response
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from models.mission import MissionType
 from repositories import MissionRepository
-from schemas import UserResponse, MissionResponse, MissionCreate, MissionUpdate
-from .dependencies import get_mission_repository, get_current_active_user
+from schemas import UserResponse, MissionResponse, MissionCreate, MissionUpdate, ImportReport
+from services.content_import_service import ContentImportService
+from utils.streaming import iter_lines, parse_records
+from .dependencies import get_mission_repository, get_content_import_service, get_current_active_user, commit_unit_of_work
 
 
 router = APIRouter(
     prefix="/api/missions",
-    tags=["missions"]
+    tags=["missions"],
+    dependencies=[Depends(commit_unit_of_work, scope="function")],
 )
 
 
@@ -29,6 +33,54 @@ async def create_mission(
     return MissionResponse.model_validate(mission)
 
 
+# Importer des missions en masse
+@router.post("/import", response_model=ImportReport, name="import_missions")
+async def import_missions(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    game_id: Optional[UUID] = Query(None, description="Jeu des lignes qui ne précisent pas de game_id"),
+    import_service: ContentImportService = Depends(get_content_import_service),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Importer des missions depuis le corps de la requête (NDJSON ou CSV avec en-tête), lu
+    en flux : la mémoire ne dépend pas de la taille du fichier. Les lignes invalides sont
+    listées dans le rapport, les autres sont importées.
+    """
+    records = parse_records(iter_lines(request.stream()), format)
+    return await import_service.import_missions(records, game_id=game_id, created_by=current_user.id)
+
+
+# Rechercher des missions
+@router.get("/search", response_model=List[MissionResponse], name="search_missions")
+async def search_missions(
+    q: Optional[str] = Query(None, max_length=200, description="Mots recherchés (préfixes) dans le titre et la description"),
+    tags: List[str] = Query([], description="Tags du jeu de la mission (paramètre répétable)"),
+    tag_match: Literal["all", "any"] = Query("all", description="Tous les tags (all) ou au moins un (any)"),
+    difficulty_min: Optional[int] = Query(None, ge=0, le=100),
+    difficulty_max: Optional[int] = Query(None, ge=0, le=100),
+    type: Optional[MissionType] = None,
+    game_id: Optional[UUID] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    mission_repository: MissionRepository = Depends(get_mission_repository),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """Rechercher des missions par texte, tags du jeu, difficulté et type"""
+    missions = await mission_repository.search_missions(
+        query=q,
+        tags=tags,
+        match_all_tags=tag_match == "all",
+        difficulty_min=difficulty_min,
+        difficulty_max=difficulty_max,
+        mission_type=type,
+        game_id=game_id,
+        skip=skip,
+        limit=limit,
+    )
+    return [MissionResponse.model_validate(mission) for mission in missions]
+
+
 # Récupérer une mission
 @router.get("/{mission_id}", response_model=MissionResponse, name="get_mission")
 async def get_mission(
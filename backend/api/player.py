@@ -6,12 +6,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from schemas import UserResponse, PlayerResponse, PlayerUpdate, MissionResponse
 from repositories.player_repository import PlayerRepository
 from repositories.lobby_repository import LobbyRepository
-from .dependencies import get_player_repository, get_lobby_repository, get_current_active_user
+from services.leaderboard import leaderboards
+from .dependencies import get_player_repository, get_lobby_repository, get_current_active_user, commit_unit_of_work
 
 
 router = APIRouter(
     prefix="/api/players",
-    tags=["players"]
+    tags=["players"],
+    dependencies=[Depends(commit_unit_of_work, scope="function")],
 )
 
 
@@ -63,6 +65,9 @@ async def update_player(
         )
     
     updated_player = await player_repository.update_player(player_id, player_data)
+    if player_data.score is not None:
+        # Score absolu imposé : le classement en mémoire sera rechargé à la prochaine validation
+        leaderboards.drop(str(player.lobby_id))
     return PlayerResponse.model_validate(updated_player)
 
 
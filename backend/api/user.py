@@ -0,0 +1,31 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from schemas import UserResponse, UserStatsResponse
+from repositories.user_repository import UserRepository
+from services.stats_service import UserStatsService
+from .dependencies import get_current_active_user, get_user_repository, get_user_stats_service
+
+
+router = APIRouter(prefix="/api/users", tags=["users"])
+
+
+@router.get("/{user_id}/stats", response_model=UserStatsResponse, name="get_user_stats")
+async def get_user_stats(
+    user_id: UUID,
+    stats_service: UserStatsService = Depends(get_user_stats_service),
+    user_repository: UserRepository = Depends(get_user_repository),
+    current_user: UserResponse = Depends(get_current_active_user),
+):
+    """Statistiques globales d'un utilisateur (une ligne ``user_stats``)"""
+    stats = await stats_service.get_stats(user_id)
+    if stats is not None:
+        return stats
+    # Pas encore de partie terminée : statistiques à zéro si l'utilisateur existe
+    if await user_repository.get_user(user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return UserStatsResponse(user_id=user_id)
@@ -26,7 +26,43 @@ class Settings(BaseSettings):
 
     FRONTEND_BASE_URL: str = "http://localhost:5173"
 
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_SAMPLE_RATES: str = ""                      # ex: "websocket=0.1,api.lobby=0.5"
+
     SOCKETIO_PATH: str = "/ws/socket.io"
+    SOCKETIO_PING_INTERVAL: float = 15.0            # secondes entre deux pings serveur
+    SOCKETIO_PING_TIMEOUT: float = 10.0             # délai max de réponse au ping
+    SOCKETIO_MAX_SOCKETS_PER_USER: int = 5
+    SOCKETIO_REAPER_INTERVAL: float = 30.0          # secondes entre deux passes du reaper
+    SOCKETIO_TRANSPORTS: str = "polling,websocket"  # "websocket" : sans long-polling, pas besoin de sessions collantes
+    SOCKETIO_MESSAGE_QUEUE: Optional[str] = None    # redis://… : diffusion des événements entre workers
+    HOST_MIGRATION_GRACE_PERIOD: float = 30.0       # délai avant de remplacer un hôte déconnecté
+
+    CHAT_HISTORY_SIZE: int = 50                     # derniers messages gardés en mémoire par lobby
+    CHAT_MAX_LENGTH: int = 500                      # caractères par message
+    CHAT_RATE: float = 1.0                          # messages par seconde et par utilisateur (débit soutenu)
+    CHAT_BURST: int = 5                             # rafale autorisée au-delà du débit soutenu
+    CHAT_PERSIST: bool = False                      # écrire les messages dans chat_messages
+    CHAT_FLUSH_INTERVAL: float = 1.0                # secondes entre deux écritures par lot
+    CHAT_FLUSH_BATCH_SIZE: int = 500                # messages max par INSERT
+    CHAT_MAX_PENDING: int = 10000                   # messages en attente d'écriture au-delà desquels les plus anciens sont abandonnés
+
+    LOBBY_JANITOR_INTERVAL: float = 300.0           # secondes entre deux passes du janitor
+    LOBBY_IDLE_TTL: float = 3600.0                  # lobby WAITING sans joueur actif expiré après ce délai
+    LOBBY_ENDED_RETENTION: float = 600.0            # lobby ENDED archivé puis supprimé après ce délai
+    LOBBY_JANITOR_BATCH_SIZE: int = 500             # lobbies supprimés par transaction
+    LOBBY_JANITOR_MAX_BATCHES: int = 20             # transactions max par passe
+
+    ROUND_TIMER_TICK: float = 1.0                   # résolution des timers de manche (secondes)
+    ROUND_TIMER_WHEEL_SIZE: int = 3600              # cases de la roue (un tour = TICK * WHEEL_SIZE secondes)
+
+    SERVER_WORKERS: int = 1                         # processus uvicorn (python -m server)
+    SERVER_TIMEOUT_KEEP_ALIVE: int = 5              # secondes avant de fermer une connexion HTTP inactive
+    SERVER_TIMEOUT_GRACEFUL_SHUTDOWN: int = 30      # secondes laissées aux requêtes en cours à l'arrêt
+    SHUTDOWN_TIMEOUT: float = 10.0                  # échéance de l'annonce, puis du vidage des files, à l'arrêt
+    SHUTDOWN_RECONNECT_DELAY: float = 2.0           # délai minimal de reconnexion annoncé aux clients (server_restarting)
+    SHUTDOWN_RECONNECT_JITTER: float = 8.0          # étalement aléatoire ajouté au délai, par socket
 
 
     SMTP_HOST: str = "localhost"
@@ -43,6 +79,8 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_DB: str
+    DATABASE_URL: Optional[str] = None              # remplace l'URL construite depuis POSTGRES_* (ex: SQLite en local)
+    DB_AUTO_MIGRATE: bool = True                    # migrer au démarrage si le schéma est en retard (sinon : erreur)
 
 
     @field_validator("ALLOWED_ORIGINS")
@@ -50,6 +88,8 @@ class Settings(BaseSettings):
         return v.split(",") if v else []
 
     def get_database_url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
     class Config:
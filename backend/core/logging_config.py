@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import contextlib
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+from core.config import settings
+
+
+# Identifiants de corrélation propagés via contextvars (requête HTTP, socket, lobby)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+sid_var: ContextVar[Optional[str]] = ContextVar("sid", default=None)
+lobby_id_var: ContextVar[Optional[str]] = ContextVar("lobby_id", default=None)
+
+_CONTEXT_VARS = {
+    "request_id": request_id_var,
+    "sid": sid_var,
+    "lobby_id": lobby_id_var,
+}
+
+# Attributs standards d'un LogRecord, exclus des champs "extra" du JSON
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@contextlib.contextmanager
+def log_context(**values: Optional[str]) -> Iterator[None]:
+    """Positionne des identifiants de corrélation pour la durée du bloc."""
+    tokens = [(_CONTEXT_VARS[name], _CONTEXT_VARS[name].set(value)) for name, value in values.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def bind_context(**values: Optional[str]) -> None:
+    """Positionne des identifiants de corrélation pour la tâche asyncio courante."""
+    for name, value in values.items():
+        _CONTEXT_VARS[name].set(value)
+
+
+class ContextFilter(logging.Filter):
+    """Copie les contextvars de corrélation sur le record (côté boucle, avant la file)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in _CONTEXT_VARS.items():
+            if not hasattr(record, name):
+                setattr(record, name, var.get())
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Échantillonne les logs DEBUG/INFO par module (préfixe de logger -> taux entre 0 et 1).
+    Les WARNING et au-delà ne sont jamais échantillonnés.
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        super().__init__()
+        # Préfixes les plus longs d'abord pour que la règle la plus spécifique gagne
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return rate >= 1 or random.random() < rate
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Empile le record tel quel : le ``prepare`` standard formate le message et la trace
+    sur la boucle (la trace finit alors dans ``message``). Ici ``args`` et ``exc_info``
+    sont conservés, seules les contextvars sont figées (``ContextFilter``) ; le thread du
+    listener fait tout le formatage.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formate un record en une ligne JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key in _RESERVED_ATTRS or key.startswith("_") or value is None:
+                continue
+            payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def parse_sample_rates(raw: str) -> Dict[str, float]:
+    """Parse ``"websocket=0.1,api.lobby=0.5"`` en dictionnaire."""
+    rates: Dict[str, float] = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        name, rate = item.split("=", 1)
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def setup_logging(
+    level: str | None = None,
+    json_output: bool | None = None,
+    sample_rates: Dict[str, float] | None = None,
+) -> logging.handlers.QueueListener:
+    """
+    Configure le logger racine : la boucle ne fait qu'empiler les records dans une file,
+    le formatage et l'écriture sur stdout se font dans le thread du ``QueueListener``.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = level or settings.LOG_LEVEL
+    json_output = settings.LOG_JSON if json_output is None else json_output
+    sample_rates = parse_sample_rates(settings.LOG_SAMPLE_RATES) if sample_rates is None else sample_rates
+
+    output = logging.StreamHandler()
+    output.setFormatter(
+        JsonFormatter() if json_output else logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rates))
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Vide la file et arrête le thread d'écriture."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """Middleware ASGI : positionne ``request_id`` (en-tête ``X-Request-ID`` ou généré)."""
+
+    header_name = b"x-request-id"
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == self.header_name:
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (self.header_name, request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Dict, Union
+
+
+Number = Union[int, float]
+
+
+class Counter:
+    """Compteur monotone."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self.value: Number = 0
+
+    def inc(self, amount: Number = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """Valeur instantanée (peut monter ou descendre)."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self.value: Number = 0
+
+    def set(self, value: Number) -> None:
+        self.value = value
+
+
+class MetricsRegistry:
+    """Registre de métriques en mémoire, exposé par ``GET /metrics``."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Union[Counter, Gauge]] = {}
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def _get_or_create(self, kind, name: str, description: str):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = kind(name, description)
+            self._metrics[name] = metric
+        elif not isinstance(metric, kind):
+            raise TypeError(f"Metric '{name}' already registered as {type(metric).__name__}")
+        return metric
+
+    def snapshot(self) -> Dict[str, Number]:
+        return {name: metric.value for name, metric in sorted(self._metrics.items())}
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,109 @@
+"""
+Arrêt coordonné d'un worker.
+
+Sur SIGTERM/SIGINT, uvicorn ferme d'abord le port et coupe les WebSocket (code 1012),
+attend les requêtes en cours, puis seulement déroule le lifespan : trop tard pour
+prévenir les clients, qui se reconnectent alors tous en même temps. ``GracefulShutdown``
+chaîne ses gestionnaires de signaux devant ceux d'uvicorn :
+
+1. au signal, les étapes ``on_signal`` tournent d'abord (annonce ``server_restarting``,
+   refus des nouvelles connexions), puis le signal est transmis à uvicorn ;
+2. dans le lifespan, ``flush`` vide les files et ferme les ressources dans l'ordre, avec
+   une échéance commune : une étape trop lente est abandonnée, les suivantes tournent
+   quand même (au moins ``MIN_STEP_SECONDS`` chacune).
+"""
+import asyncio
+import logging
+import signal
+import threading
+import time
+from typing import Awaitable, Callable, Iterable, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+Step = Callable[[], Awaitable[object]]
+
+# Budget minimal d'une étape, même une fois l'échéance commune dépassée
+MIN_STEP_SECONDS = 1.0
+
+
+class GracefulShutdown:
+    def __init__(self, timeout: float, signals: Iterable[signal.Signals] = (signal.SIGTERM, signal.SIGINT)) -> None:
+        self.timeout = timeout
+        self.signals = tuple(signals)
+        self.draining = False
+        self._hooks: list[tuple[str, Step]] = []
+        self._previous: dict[signal.Signals, object] = {}
+        self._drain_task: asyncio.Task | None = None
+
+    def on_signal(self, name: str, hook: Step) -> None:
+        """Étape lancée dès le signal, avant qu'uvicorn ne ferme les connexions."""
+        self._hooks.append((name, hook))
+
+    def install(self) -> None:
+        """Chaîne les gestionnaires devant ceux en place (uvicorn) ; thread principal uniquement."""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+        for sig in self.signals:
+            self._previous[sig] = signal.getsignal(sig)
+            signal.signal(sig, lambda sig, frame, loop=loop: loop.call_soon_threadsafe(self._on_signal, sig, frame))
+
+    def uninstall(self) -> None:
+        for sig, previous in self._previous.items():
+            signal.signal(sig, previous)
+        self._previous.clear()
+
+    def _on_signal(self, sig: signal.Signals, frame) -> None:
+        if self._drain_task is not None:
+            # Second signal : plus d'attente
+            self._forward(sig, frame)
+            return
+
+        async def drain_then_forward() -> None:
+            await self.drain()
+            self._forward(sig, frame)
+
+        self._drain_task = asyncio.create_task(drain_then_forward())
+
+    def _forward(self, sig: signal.Signals, frame) -> None:
+        previous = self._previous.get(sig)
+        if callable(previous):
+            previous(sig, frame)
+        elif previous == signal.SIG_DFL:
+            self.uninstall()
+            signal.raise_signal(sig)
+
+    async def drain(self) -> None:
+        """Étapes ``on_signal``, une seule fois (signal, ou arrêt sans signal)."""
+        if self.draining:
+            return
+        self.draining = True
+        await self.flush(self._hooks)
+
+    async def flush(self, steps: Sequence[tuple[str, Step]]) -> dict[str, float | None]:
+        """
+        Lance les étapes dans l'ordre avec une échéance commune de ``timeout`` secondes
+        (``MIN_STEP_SECONDS`` au moins par étape).
+
+        Retourne la durée de chaque étape (``None`` si abandonnée : échéance ou erreur).
+        """
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        durations: dict[str, float | None] = {}
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                await asyncio.wait_for(step(), max(MIN_STEP_SECONDS, deadline - step_started))
+                durations[name] = round((time.perf_counter() - step_started) * 1000, 1)
+            except asyncio.TimeoutError:
+                logger.error("shutdown step timed out", extra={"step": name, "timeout_s": self.timeout})
+                durations[name] = None
+            except Exception:
+                logger.exception("shutdown step failed", extra={"step": name})
+                durations[name] = None
+        logger.info("shutdown steps done", extra={
+            "steps_ms": durations, "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+        return durations
@@ -1,25 +1,28 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
 from core.config import settings
+from db.unit_of_work import UnitOfWork
 
 
 Base = declarative_base()
 
-database_url = settings.get_database_url()
+engine: AsyncEngine | None = None
+
+
+class _SessionMaker(async_sessionmaker):
+    """Crée le moteur à la première session ouverte (import de ``db.database`` sans pilote)."""
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        get_engine()
+        return super().__call__(**local_kw)
 
-# Création du moteur SQLAlchemy async
-engine = create_async_engine(
-    database_url,
-    #echo=settings.DEBUG,
-    future=True,
-)
 
-# Session factory
-async_session_maker = async_sessionmaker(
-    engine,
+# Session factory, liée au moteur par ``get_engine``
+async_session_maker = _SessionMaker(
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -27,18 +30,44 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def get_engine() -> AsyncEngine:
+    """
+    Moteur SQLAlchemy async, créé au premier appel (``lifespan`` au démarrage).
 
-
-async def create_db_and_tables():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    Le pilote (asyncpg) n'est importé qu'à ce moment : importer l'application, les
+    modèles ou un script ne coûte ni pilote ni pool.
+    """
+    global engine
+    if engine is None:
+        engine = create_async_engine(
+            settings.get_database_url(),
+            #echo=settings.DEBUG,
+            future=True,
+        )
+        async_session_maker.configure(bind=engine)
+    return engine
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session partagée par toutes les dépendances d'une requête (une seule transaction)."""
     async with async_session_maker() as session:
         yield session
 
 
+async def commit_unit_of_work(
+    session: AsyncSession = Depends(get_async_session),
+) -> AsyncGenerator[UnitOfWork, None]:
+    """
+    Valide la transaction de la requête à la sortie de l'endpoint.
+
+    À déclarer avec ``scope="function"`` : le commit a lieu avant l'envoi de la
+    réponse, donc une erreur de commit est bien renvoyée au client.
+    """
+    async with UnitOfWork(session) as unit_of_work:
+        yield unit_of_work
+
+
 async def close_db() -> None:
     """Close the database connections"""
-    await engine.dispose()
+    if engine is not None:
+        await engine.dispose()
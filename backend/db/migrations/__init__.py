@@ -0,0 +1,116 @@
+"""
+Migrations versionnées du schéma.
+
+Chaque migration (``db/migrations/vNNNN_*.py``) expose ``upgrade(connection)`` et est
+déclarée dans ``MIGRATIONS`` ; la table ``schema_version`` garde une ligne par migration
+appliquée.
+
+- Au démarrage, ``ensure_schema`` lit la version (une requête) : à jour, rien d'autre.
+- Sinon, ``migrate`` applique les migrations manquantes dans une seule transaction, sous
+  un verrou consultatif PostgreSQL (``pg_advisory_xact_lock``) : quand N workers démarrent
+  ensemble, un seul migre, les autres attendent le verrou puis relisent la version.
+
+Les migrations sont figées : elles décrivent leurs tables elles-mêmes, sans importer
+les modèles (qui évoluent). Une base créée par l'ancien ``create_all`` du démarrage n'a
+pas de ``schema_version`` : elle repart de la version 0, et chaque migration saute ce qui
+existe déjà (``checkfirst``, ``IF NOT EXISTS``, colonnes inspectées).
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Sequence
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from db.migrations import (
+    v0001_initial, v0002_mission_visibility, v0003_runtime_tables, v0004_search_indexes,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Clé du verrou consultatif des migrations ("SHDW")
+ADVISORY_LOCK_KEY = 0x53484457
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Schéma initial", v0001_initial.upgrade),
+    Migration(2, "Visibilité des missions", v0002_mission_visibility.upgrade),
+    Migration(3, "Timers, archive, statistiques et chat", v0003_runtime_tables.upgrade),
+    Migration(4, "Index de recherche", v0004_search_indexes.upgrade),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+class SchemaVersionError(RuntimeError):
+    """Le schéma de la base n'est pas à la version attendue par le code."""
+
+
+async def current_version(connection: AsyncConnection) -> int:
+    """Dernière version appliquée ; 0 si la base n'a jamais été migrée."""
+    try:
+        return await connection.scalar(select(func.max(schema_version.c.version))) or 0
+    except DBAPIError:
+        # Table absente : base vide ou créée avant les migrations
+        await connection.rollback()
+        return 0
+
+
+async def migrate(engine: AsyncEngine, migrations: Sequence[Migration] = MIGRATIONS) -> list[Migration]:
+    """Applique les migrations manquantes (une transaction, un seul processus à la fois)."""
+    async with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            await connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        # SQLite : une seule écriture à la fois, la transaction suffit
+        await connection.run_sync(schema_version.create, checkfirst=True)
+        version = await connection.scalar(select(func.max(schema_version.c.version))) or 0
+        pending = [migration for migration in migrations if migration.version > version]
+        for migration in pending:
+            logger.info("applying migration", extra={"version": migration.version, "description": migration.description})
+            await migration.upgrade(connection)
+            await connection.execute(insert(schema_version).values(
+                version=migration.version, description=migration.description, applied_at=datetime.now(timezone.utc),
+            ))
+    return pending
+
+
+async def ensure_schema(
+    engine: AsyncEngine,
+    auto_migrate: bool = True,
+    migrations: Sequence[Migration] = MIGRATIONS,
+) -> int:
+    """
+    Vérifie la version du schéma au démarrage et migre si besoin (``auto_migrate``).
+
+    Sans ``auto_migrate``, un schéma en retard lève ``SchemaVersionError`` : les
+    migrations sont alors lancées à part (``python -m scripts.migrate``).
+    """
+    latest = migrations[-1].version
+    async with engine.connect() as connection:
+        version = await current_version(connection)
+    if version >= latest:
+        if version > latest:
+            logger.warning("database schema is newer than the code", extra={"version": version, "expected": latest})
+        return version
+    if not auto_migrate:
+        raise SchemaVersionError(f"Database schema at version {version}, expected {latest}: run the migrations")
+    applied = await migrate(engine, migrations)
+    return applied[-1].version if applied else latest
@@ -0,0 +1,144 @@
+"""
+Schéma initial, figé : les tables telles que l'ancien ``create_all`` du démarrage les
+créait, avant les migrations.
+
+Définitions Core indépendantes des modèles (qui évoluent) : une base créée par l'ancien
+``create_all`` contient déjà exactement ces tables (``checkfirst``), les migrations
+suivantes apportent le reste. Les enums sont stockés par nom, comme ``SQLEnum(Enum)``.
+"""
+from sqlalchemy import (
+    Boolean, Column, DateTime, Enum, ForeignKey, Integer, MetaData, String, Table, Text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("email", String(255), unique=True, nullable=False, index=True),
+    Column("username", String(100), unique=True, nullable=False, index=True),
+    Column("hashed_password", String(255), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("is_superuser", Boolean, nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+for _name in ("password_reset_tokens", "account_activation_tokens"):
+    Table(
+        _name, metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+        Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True),
+        Column("token", String(255), nullable=False, unique=True, index=True),
+        Column("expires_at", DateTime(timezone=True), nullable=False),
+        Column("used", Boolean, nullable=False),
+        Column("created_at", DateTime(timezone=True)),
+    )
+
+Table(
+    "revoked_refresh_tokens", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True),
+    Column("jti", String(64), nullable=False, unique=True, index=True),
+    Column("expires_at", DateTime(timezone=True), nullable=False),
+    Column("revoked_at", DateTime(timezone=True)),
+    Column("reason", String(64), nullable=True),
+)
+
+Table(
+    "game_types", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("name", String(100), unique=True, nullable=False, index=True),
+    Column("description", Text, nullable=False),
+)
+
+Table(
+    "games", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("name", String(100), unique=True, nullable=False, index=True),
+    Column("description", Text, nullable=False),
+    Column("image_url", String(500), nullable=True),
+    Column("min_players", Integer, nullable=False),
+    Column("max_players", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+    Column("game_type_id", UUID(as_uuid=True), ForeignKey("game_types.id", ondelete="SET NULL")),
+)
+
+Table(
+    "tags", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("name", String(50), unique=True, index=True),
+)
+
+Table(
+    "game_tags", metadata,
+    Column("game_id", UUID(as_uuid=True), ForeignKey("games.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+)
+
+Table(
+    "lobbies", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("code", String(20), unique=True, nullable=False, index=True),
+    Column("game_id", UUID(as_uuid=True), ForeignKey("games.id"), nullable=False),
+    Column("host_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
+    Column("status", Enum("WAITING", "RUNNING", "PAUSED", "ENDED", name="lobbystatus"), nullable=False, index=True),
+    Column("phase", Enum("NONE", "SUGGESTION", "ROUND", "VALIDATION", name="lobbyphase"), nullable=False, index=True),
+    Column("min_players", Integer, nullable=False),
+    Column("max_players", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+Table(
+    "missions", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("game_id", UUID(as_uuid=True), ForeignKey("games.id"), nullable=False, index=True),
+    Column("title", String(200), nullable=False),
+    Column("created_by", UUID(as_uuid=True), ForeignKey("users.id"), nullable=True),
+    Column("type", Enum("MISSION", "ROLE", "HYBRID", name="missiontype"), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("image_url", String(500), nullable=True),
+    Column("difficulty", Integer, nullable=False),
+)
+
+Table(
+    "players", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("lobby_id", UUID(as_uuid=True), ForeignKey("lobbies.id"), nullable=False, index=True),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True),
+    Column("score", Integer, nullable=False),
+    Column("status", Enum("WAITING", "PLAYING", "COMPLETED", "LEFT", name="playerstatus"), nullable=False, index=True),
+    Column("joined_at", DateTime(timezone=True)),
+    Column("left_at", DateTime(timezone=True), nullable=True),
+)
+
+Table(
+    "mission_assigned", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("player_id", UUID(as_uuid=True), ForeignKey("players.id"), nullable=False, index=True),
+    Column("mission_id", UUID(as_uuid=True), ForeignKey("missions.id"), nullable=False, index=True),
+    Column("status", Enum("ACTIVE", "COMPLETED", "FAILED", "CANCELLED", name="missionassignedstatus"),
+           nullable=False, index=True),
+    Column("assigned_at", DateTime(timezone=True)),
+    Column("completed_at", DateTime(timezone=True), nullable=True),
+)
+
+Table(
+    "rounds", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, index=True),
+    Column("lobby_id", UUID(as_uuid=True), ForeignKey("lobbies.id"), nullable=False, index=True),
+    Column("round_number", Integer, nullable=False),
+    Column("status", Enum("RUNNING", "FINISHED", name="roundstatus"), nullable=False, index=True),
+    Column("started_at", DateTime(timezone=True)),
+    Column("ended_at", DateTime(timezone=True), nullable=True),
+)
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.run_sync(metadata.create_all)
@@ -0,0 +1,23 @@
+"""
+Visibilité des missions : ``is_known_by_player`` et ``is_known_by_others``.
+
+SQLite n'a pas de ``ADD COLUMN IF NOT EXISTS`` : les colonnes déjà présentes (base créée
+par un ``create_all`` plus récent que le schéma initial) sont sautées.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+COLUMNS = {
+    "is_known_by_player": "BOOLEAN NOT NULL DEFAULT TRUE",
+    "is_known_by_others": "BOOLEAN NOT NULL DEFAULT FALSE",
+}
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    existing = await connection.run_sync(
+        lambda sync: {column["name"] for column in inspect(sync).get_columns("missions")}
+    )
+    for name, ddl in COLUMNS.items():
+        if name not in existing:
+            await connection.execute(text(f"ALTER TABLE missions ADD COLUMN {name} {ddl}"))
@@ -0,0 +1,62 @@
+"""
+Tables ajoutées après le schéma initial : timers de manche, archive des parties,
+statistiques des joueurs et messages du chat.
+
+Définitions figées (indépendantes des modèles), créées si absentes.
+"""
+from sqlalchemy import (
+    JSON, Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+metadata = MetaData()
+
+# Cibles des clés étrangères, déjà créées par le schéma initial
+for _name in ("users", "lobbies"):
+    Table(_name, metadata, Column("id", UUID(as_uuid=True), primary_key=True))
+
+NEW_TABLES = [
+    Table(
+        "round_timers", metadata,
+        Column("lobby_id", UUID(as_uuid=True), ForeignKey("lobbies.id", ondelete="CASCADE"), primary_key=True),
+        Column("deadline_at", DateTime(timezone=True), nullable=True),
+        Column("remaining_seconds", Float, nullable=True),
+    ),
+    Table(
+        "game_archive", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("game_id", UUID(as_uuid=True), nullable=False, index=True),
+        Column("host_id", UUID(as_uuid=True), nullable=False),
+        Column("lobby_name", String(100), nullable=False),
+        Column("player_count", Integer, nullable=False),
+        Column("round_count", Integer, nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Column("ended_at", DateTime(timezone=True), nullable=False, index=True),
+        Column("payload", JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+    ),
+    Table(
+        "user_stats", metadata,
+        Column("user_id", UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        Column("games_played", Integer, nullable=False),
+        Column("games_won", Integer, nullable=False),
+        Column("missions_assigned", Integer, nullable=False),
+        Column("missions_completed", Integer, nullable=False),
+        Column("total_score", Integer, nullable=False),
+        Column("last_game_at", DateTime(timezone=True), nullable=True),
+        Column("updated_at", DateTime(timezone=True)),
+    ),
+    Table(
+        "chat_messages", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("lobby_id", UUID(as_uuid=True), ForeignKey("lobbies.id", ondelete="CASCADE"), nullable=False, index=True),
+        Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
+        Column("content", String(500), nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+    ),
+]
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.run_sync(metadata.create_all, tables=NEW_TABLES)
@@ -0,0 +1,24 @@
+"""
+Recherche plein texte des jeux et des missions (PostgreSQL uniquement) : colonne générée
+``search_vector``, index GIN et index trigrammes (voir ``db/search.py``).
+
+Les instructions sont idempotentes (``IF NOT EXISTS``) ; rien à faire sur SQLite, où la
+recherche retombe sur ``LIKE``.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from db.search import search_ddl
+
+
+SEARCHABLE = [
+    ("games", "name", "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))"),
+    ("missions", "title", "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"),
+]
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    for table, name_column, vector in SEARCHABLE:
+        for ddl in search_ddl(table, name_column, vector):
+            await connection.execute(ddl)
@@ -0,0 +1,17 @@
+from sqlalchemy import DDL
+
+
+def search_ddl(table: str, name_column: str, vector: str) -> list[DDL]:
+    """
+    Index de recherche PostgreSQL d'une table : colonne ``search_vector`` générée
+    (tsvector, index GIN) et index trigramme sur le nom pour les préfixes (ILIKE).
+    Une instruction par DDL : asyncpg n'accepte pas plusieurs requêtes préparées à la fois.
+    """
+    return [
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+        DDL(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({vector}) STORED"),
+        DDL(f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)"),
+        DDL(f"CREATE INDEX IF NOT EXISTS ix_{table}_{name_column}_trgm ON {table} USING gin ({name_column} gin_trgm_ops)"),
+    ]
+
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from types import TracebackType
+from typing import Optional, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    Une transaction par unité de travail (requête HTTP, passe d'un job…).
+
+    Les repositories se contentent de ``flush()`` : c'est l'unité de travail qui
+    valide (``commit``) une seule fois à la sortie, ou annule tout en cas d'exception.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    async def commit(self) -> None:
+        if self.session.in_transaction():
+            await self.session.commit()
+
+    async def rollback(self) -> None:
+        if self.session.in_transaction():
+            await self.session.rollback()
@@ -1,22 +1,101 @@
+import logging
+import time
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from contextlib import asynccontextmanager
 
-from websocket.socket_server import sio_app
 from core.config import settings
+from core.metrics import metrics
+from core.logging_config import RequestIdMiddleware, setup_logging, shutdown_logging
+from core.shutdown import GracefulShutdown
+
+from db.database import close_db, get_engine
+from db.migrations import ensure_schema
+
+from api import auth_router, game_router, lobby_router, player_router, mission_router, archive_router, user_router
+
+
+logger = logging.getLogger(__name__)
+
+
+class SocketIOApp:
+    """
+    Application Socket.IO montée sur ``SOCKETIO_PATH``, chargée au démarrage (lifespan).
 
-from db.database import create_db_and_tables, close_db
+    ``websocket.socket_server`` (socketio, engineio et son client HTTP) n'est plus importé
+    avec ``main`` : le serveur est créé dans ``lifespan``, ou à la première connexion
+    quand l'application tourne sans lifespan (client de test).
+    """
 
-from api import auth_router, game_router, lobby_router, player_router, mission_router
+    def __init__(self):
+        self.server = None
 
+    def load(self):
+        if self.server is None:
+            from websocket import socket_server
+
+            self.server = socket_server
+        return self.server
+
+    async def __call__(self, scope, receive, send):
+        await self.load().sio_app(scope, receive, send)
+
+
+socketio_app = SocketIOApp()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await create_db_and_tables()
+    started = time.perf_counter()
+    setup_logging()
+    schema_version = await ensure_schema(get_engine(), auto_migrate=settings.DB_AUTO_MIGRATE)
+    schema_seconds = time.perf_counter() - started
+    socket_server = socketio_app.load()
+    # Tâches de fond chargées ici, pas à l'import de ``main``
+    from services.lobby_janitor import LobbyJanitor
+    from services.round_timer import round_timer
+
+    janitor = LobbyJanitor()
+    shutdown = GracefulShutdown(timeout=settings.SHUTDOWN_TIMEOUT)
+    shutdown.on_signal("announce_restart", lambda: socket_server.manager.announce_restart(
+        settings.SHUTDOWN_RECONNECT_DELAY, settings.SHUTDOWN_RECONNECT_JITTER,
+    ))
+    shutdown.install()
+    socket_server.reaper.start()
+    janitor.on_deleted = socket_server.chat.drop_lobbies
+    janitor.start()
+    round_timer.broadcast = socket_server.manager.broadcast_public
+    round_timer.start()
+    if socket_server.chat_persister is not None:
+        socket_server.chat_persister.start()
+    boot_seconds = time.perf_counter() - started
+    metrics.gauge("boot_seconds", "Durée du démarrage (lifespan)").set(round(boot_seconds, 4))
+    metrics.gauge("boot_schema_seconds", "Vérification ou migration du schéma au démarrage").set(round(schema_seconds, 4))
+    logger.info("startup complete", extra={
+        "schema_version": schema_version,
+        "schema_ms": round(schema_seconds * 1000, 1),
+        "boot_ms": round(boot_seconds * 1000, 1),
+    })
     yield
+    # Arrêt sans signal (ex: tests) : annonce quand même ; sinon déjà faite au signal
+    await shutdown.drain()
+    shutdown.uninstall()
+    steps = [
+        ("reaper", socket_server.reaper.stop),
+        ("janitor", janitor.stop),
+        ("host_migrations", socket_server.manager.host_migration.stop),
+        ("round_timers", round_timer.stop),
+    ]
+    if socket_server.chat_persister is not None:
+        steps.append(("chat", socket_server.chat_persister.stop))
+    await shutdown.flush(steps)
+    if socket_server.chat_persister is not None and len(socket_server.chat_persister):
+        logger.error("chat messages lost at shutdown", extra={"pending": len(socket_server.chat_persister)})
+    # Toujours, même après une échéance dépassée
     await close_db()
+    shutdown_logging()
 
 
 # Créer l'application FastAPI
@@ -42,11 +121,15 @@ app.add_middleware(
     allow_headers=allowed_headers,
 )
 
+app.add_middleware(RequestIdMiddleware)
+
 app.include_router(auth_router)
 app.include_router(game_router)
 app.include_router(lobby_router)
 app.include_router(player_router)
 app.include_router(mission_router)
+app.include_router(archive_router)
+app.include_router(user_router)
 
 # Route racine FastAPI
 @app.get("/")
@@ -54,8 +137,13 @@ def home():
     return {"message": "Shadow Role API", "version": "0.1.0"}
 
 
+@app.get("/metrics")
+def read_metrics():
+    return metrics.snapshot()
+
+
 # Combiner FastAPI et Socket.IO dans une seule application ASGI
-app.mount(settings.SOCKETIO_PATH, sio_app)
+app.mount(settings.SOCKETIO_PATH, socketio_app)
 
 if __name__ == "__main__":
     import uvicorn
@@ -6,7 +6,10 @@ from .lobby import Lobby, LobbyStatus
 from .mission import Mission
 from .player import Player, PlayerStatus
 from .mission_assigned import MissionAssigned, MissionAssignedStatus
-from .round import Round, RoundStatus
+from .round import Round, RoundStatus, RoundTimer
+from .game_archive import GameArchive
+from .user_stats import UserStats
+from .chat_message import ChatMessage
 
 __all__ = [
     "User",
@@ -30,4 +33,10 @@ __all__ = [
 
     "Round",
     "RoundStatus",
+    "RoundTimer",
+
+    "GameArchive",
+    "UserStats",
+
+    "ChatMessage",
 ]
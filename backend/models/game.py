@@ -1,11 +1,12 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, ForeignKey, String, Table, Text, DateTime, Integer
+from sqlalchemy import Column, ForeignKey, String, Table, Text, DateTime, Integer, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 import uuid
 
 from db.database import Base
+from db.search import search_ddl
 
 
 GameTag = Table(
@@ -55,3 +56,10 @@ class GameType(Base):
 
     # Relations
     games = relationship("Game", back_populates="game_type", cascade="all, delete-orphan")
+
+
+for ddl in search_ddl(
+    "games", "name",
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))",
+):
+    event.listen(Game.__table__, "after_create", ddl.execute_if(dialect="postgresql"))
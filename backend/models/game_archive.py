@@ -0,0 +1,22 @@
+import uuid
+
+from sqlalchemy import Column, DateTime, Integer, String, JSON
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from db.database import Base
+
+
+class GameArchive(Base):
+    """Historique compact d'une partie terminée : une ligne par lobby archivé."""
+
+    __tablename__ = "game_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)  # id du lobby archivé
+    game_id = Column(UUID(as_uuid=True), nullable=False, index=True)        # pas de FK : survit au jeu
+    host_id = Column(UUID(as_uuid=True), nullable=False)
+    lobby_name = Column(String(100), nullable=False)
+    player_count = Column(Integer, nullable=False)
+    round_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    ended_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    payload = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
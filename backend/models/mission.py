@@ -4,12 +4,13 @@ from datetime import datetime, timezone
 import uuid
 import enum
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Boolean, Column, event, Integer, String, Text, ForeignKey, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 
 from db.database import Base
+from db.search import search_ddl
 
 
 class MissionType(str, enum.Enum):
@@ -29,6 +30,8 @@ class Mission(Base):
     description = Column(Text, nullable=False)
     image_url = Column(String(500), nullable=True)
     difficulty = Column(Integer, nullable=False)  # 0-100
+    is_known_by_player = Column(Boolean, nullable=False, default=True)    # le joueur connaît sa mission
+    is_known_by_others = Column(Boolean, nullable=False, default=False)   # les autres joueurs la connaissent
     mission_assigned = relationship("MissionAssigned", back_populates="mission", cascade="all, delete-orphan")
 
     # Relations
@@ -37,3 +40,8 @@ class Mission(Base):
     creator = relationship("User", foreign_keys=[created_by])
 
 
+for ddl in search_ddl(
+    "missions", "title",
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+):
+    event.listen(Mission.__table__, "after_create", ddl.execute_if(dialect="postgresql"))
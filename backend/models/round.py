@@ -2,7 +2,7 @@ import uuid
 import enum
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Float, Integer, ForeignKey, DateTime, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -25,4 +25,14 @@ class Round(Base):
     ended_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relations
-    lobby = relationship("Lobby", back_populates="rounds")
\ No newline at end of file
+    lobby = relationship("Lobby", back_populates="rounds")
+
+
+class RoundTimer(Base):
+    """Échéance persistée du timer de la manche en cours (une ligne par lobby)."""
+
+    __tablename__ = "round_timers"
+
+    lobby_id = Column(UUID(as_uuid=True), ForeignKey("lobbies.id", ondelete="CASCADE"), primary_key=True)
+    deadline_at = Column(DateTime(timezone=True), nullable=True)     # NULL si en pause
+    remaining_seconds = Column(Float, nullable=True)                 # temps restant figé pendant la pause
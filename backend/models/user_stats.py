@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from db.database import Base
+
+
+class UserStats(Base):
+    """Statistiques cumulées d'un utilisateur, toutes parties confondues (une ligne par utilisateur)."""
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    games_played = Column(Integer, nullable=False, default=0)
+    games_won = Column(Integer, nullable=False, default=0)
+    missions_assigned = Column(Integer, nullable=False, default=0)
+    missions_completed = Column(Integer, nullable=False, default=0)
+    total_score = Column(Integer, nullable=False, default=0)
+    last_game_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    @property
+    def win_rate(self) -> float:
+        return self.games_won / self.games_played if self.games_played else 0.0
+
+    @property
+    def average_score(self) -> float:
+        return self.total_score / self.games_played if self.games_played else 0.0
@@ -2,9 +2,12 @@ from .game_repository import GameRepository
 from .jwt_repository import JWTRepository
 from .lobby_repository import LobbyRepository
 from .mission_repository import MissionRepository
+from .mission_assigned_repository import MissionAssignedRepository
 from .player_repository import PlayerRepository
+from .round_timer_repository import RoundTimerRepository
 from .token_repository import TokenRepository
 from .user_repository import UserRepository
+from .user_stats_repository import UserStatsRepository
 from .gametype_repository import GameTypeRepository
 
 __all__ = [
@@ -14,7 +17,10 @@ __all__ = [
     "GameTypeRepository",
     "LobbyRepository",
     "MissionRepository",
+    "MissionAssignedRepository",
     "PlayerRepository",
+    "RoundTimerRepository",
     "TokenRepository",
     "UserRepository",
+    "UserStatsRepository",
 ]
@@ -1,14 +1,26 @@
 
 from uuid import UUID
-from typing import List
+from typing import AsyncIterator, List, Sequence
+
+import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import selectinload
 
 
-from models import Game, GameType, Tag
+from models import Game, GameType, Mission, Tag
+from models.game import GameTag
 from schemas import GameCreate, GameUpdate
+from repositories.search import normalize_tags, search_tokens, tagged_games, text_match, text_rank
+
+
+# Lignes lues par aller-retour lors d'un export en flux
+STREAM_BATCH_SIZE = 1000
+# Séparateur des tags agrégés (caractère de contrôle, absent des noms de tags)
+TAG_SEPARATOR = "\x1f"
 
 
 class GameRepository:
@@ -27,27 +39,58 @@ class GameRepository:
         )
         return list(result.scalars().all())
 
+    async def search_games(
+        self,
+        query: str | None = None,
+        tags: Sequence[str] = (),
+        match_all_tags: bool = True,
+        difficulty_min: int | None = None,
+        difficulty_max: int | None = None,
+        game_type_id: UUID | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[Game]:
+        """
+        Search games by text (name, description), tags, game type and difficulty
+        (games having at least one mission in the range)
+        """
+        dialect = self.db.get_bind().dialect.name
+        statement = select(Game).options(selectinload(Game.tags))
+        tokens = search_tokens(query)
+        if tokens:
+            statement = statement.where(text_match(dialect, Game.__table__, [Game.name, Game.description], tokens))
+        tags = normalize_tags(tags)
+        if tags:
+            statement = statement.where(Game.id.in_(tagged_games(tags, match_all_tags)))
+        if game_type_id is not None:
+            statement = statement.where(Game.game_type_id == game_type_id)
+        if difficulty_min is not None or difficulty_max is not None:
+            missions = select(Mission.game_id).where(Mission.game_id == Game.id)
+            if difficulty_min is not None:
+                missions = missions.where(Mission.difficulty >= difficulty_min)
+            if difficulty_max is not None:
+                missions = missions.where(Mission.difficulty <= difficulty_max)
+            statement = statement.where(missions.exists())
+
+        rank = text_rank(dialect, Game.__table__, tokens) if tokens else None
+        order = [rank.desc()] if rank is not None else []
+        result = await self.db.execute(
+            statement.order_by(*order, Game.name).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def create_game(self, game_data: GameCreate) -> Game:
         """Create a new game"""
         # Exclure tags du dump car c'est une relation many-to-many
         data = game_data.model_dump(exclude={"tags"})
-        
-        game = Game(**data)
+
+        # Collection initialisée à vide : pas de rechargement nécessaire pour la réponse
+        game = Game(**data, tags=[])
         self.db.add(game)
-        await self.db.flush()  # Flush pour avoir l'ID du jeu
-        
+
         # Gérer les tags séparément (même si liste vide ou None)
         tags_list = game_data.tags if game_data.tags is not None else []
         await self._sync_game_tags(game, tags_list)
-        
-        await self.db.commit()
-        # Recharger avec les tags pour la réponse
-        result = await self.db.execute(
-            select(Game)
-            .options(selectinload(Game.tags))
-            .where(Game.id == game.id)
-        )
-        game = result.scalar_one()
         return game
 
     async def get_game(self, game_id: UUID) -> Game | None:
@@ -70,15 +113,8 @@ class GameRepository:
         dumped_data = game_data.model_dump(exclude_unset=True)
         if "tags" in dumped_data:
             await self._sync_game_tags(game, game_data.tags or [])
-        
-        await self.db.commit()
-        # Recharger avec les tags
-        result = await self.db.execute(
-            select(Game)
-            .options(selectinload(Game.tags))
-            .where(Game.id == game.id)
-        )
-        game = result.scalar_one()
+        else:
+            await self.db.flush()
         return game
 
     async def delete_game(self, game_id: UUID) -> None:
@@ -86,7 +122,7 @@ class GameRepository:
         game = await self.get_game(game_id)
         if game:
             await self.db.delete(game)
-            await self.db.commit()
+            await self.db.flush()
             return True
         return False
 
@@ -99,48 +135,103 @@ class GameRepository:
         )
         return result.scalar_one_or_none()
     
-    async def _sync_game_tags(self, game: Game, tag_names: List[str]) -> None:
-        """Synchronise les tags d'un jeu avec une liste de noms de tags"""
-        # Charger les tags avec selectinload pour s'assurer qu'ils sont accessibles
+    async def stream_games(self, game_id: UUID | None = None, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[dict]:
+        """
+        Stream games ordered by id with a server-side cursor (constant memory).
+        Tags are aggregated in the same query: no other statement runs while the cursor is open.
+        """
+        tags = (
+            select(func.aggregate_strings(Tag.name, TAG_SEPARATOR))
+            .join(GameTag, GameTag.c.tag_id == Tag.id)
+            .where(GameTag.c.game_id == Game.id)
+            .scalar_subquery()
+            .label("tags")
+        )
+        query = select(
+            Game.id, Game.name, Game.description, Game.image_url, Game.min_players, Game.max_players,
+            Game.game_type_id, Game.created_at, Game.updated_at, tags,
+        )
+        if game_id is not None:
+            query = query.where(Game.id == game_id)
+        result = await self.db.stream(query.order_by(Game.id).execution_options(yield_per=batch_size))
+        async for row in result:
+            game = row._asdict()
+            game["tags"] = sorted(game["tags"].split(TAG_SEPARATOR)) if game["tags"] else []
+            yield game
+
+    async def get_existing_ids(self, game_ids) -> set[UUID]:
+        """Return the subset of the given game ids that exist (one query)"""
+        if not game_ids:
+            return set()
+        result = await self.db.execute(select(Game.id).where(Game.id.in_(set(game_ids))))
+        return set(result.scalars().all())
+
+    async def get_ids_by_names(self, names) -> dict[str, UUID]:
+        """Return name -> id of the existing games among the given names (one query)"""
+        if not names:
+            return {}
+        result = await self.db.execute(select(Game.name, Game.id).where(Game.name.in_(set(names))))
+        return dict(result.all())
+
+    async def insert_games(self, rows: List[dict]) -> dict[str, UUID]:
+        """
+        Bulk insert games (multi-row INSERT ... ON CONFLICT (name) DO NOTHING).
+        Returns name -> id of the inserted games; names already taken are skipped.
+        """
+        if not rows:
+            return {}
         result = await self.db.execute(
-            select(Game)
-            .options(selectinload(Game.tags))
-            .where(Game.id == game.id)
+            self._insert(Game.__table__)
+            .on_conflict_do_nothing(index_elements=[Game.name])
+            .returning(Game.id, Game.name),
+            [{"id": uuid.uuid4(), **row} for row in rows],
         )
-        game_with_tags = result.scalar_one()
-        
-        # Vider les tags existants
-        game_with_tags.tags.clear()
-        
-        # Si aucune liste de tags ou liste vide, on laisse les tags vides
-        if not tag_names:
-            await self.db.flush()
-            return
-        
-        # Récupérer ou créer les tags
-        tags_to_add = []
-        for tag_name in tag_names:
-            if not tag_name or not tag_name.strip():
-                continue
-            
-            tag_name = tag_name.strip()
-            
-            # Chercher le tag existant
-            result = await self.db.execute(
-                select(Tag).where(Tag.name == tag_name)
-            )
-            tag = result.scalar_one_or_none()
-            
-            # Créer le tag s'il n'existe pas
-            if not tag:
-                tag = Tag(name=tag_name)
-                self.db.add(tag)
-                await self.db.flush()
-            
-            # Vérifier que le tag n'est pas déjà dans la liste (éviter les doublons)
-            if tag not in tags_to_add:
-                tags_to_add.append(tag)
-        
-        # Ajouter tous les tags en une fois à la relation
-        game_with_tags.tags.extend(tags_to_add)
+        return {name: game_id for game_id, name in result.all()}
+
+    async def resolve_tag_ids(self, tag_names) -> dict[str, UUID]:
+        """Get or create tags in bulk (one INSERT ... ON CONFLICT DO NOTHING, one SELECT)"""
+        names = list(dict.fromkeys(name for name in tag_names if name))
+        if not names:
+            return {}
+        await self.db.execute(
+            self._insert(Tag.__table__).on_conflict_do_nothing(index_elements=[Tag.name]),
+            [{"id": uuid.uuid4(), "name": name} for name in names],
+        )
+        result = await self.db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))
+        return dict(result.all())
+
+    async def add_game_tags(self, pairs: List[tuple[UUID, UUID]]) -> None:
+        """Bulk insert (game_id, tag_id) links"""
+        if pairs:
+            await self.db.execute(insert(GameTag), [{"game_id": game_id, "tag_id": tag_id} for game_id, tag_id in pairs])
+
+    def _insert(self, table):
+        dialect = self.db.get_bind().dialect.name
+        return (postgresql_insert if dialect == "postgresql" else sqlite_insert)(table)
+
+    async def _sync_game_tags(self, game: Game, tag_names: List[str]) -> None:
+        """Synchronise les tags d'un jeu avec une liste de noms de tags"""
+        tags = await self._resolve_tags(tag_names)
+
+        # La collection doit être chargée pour calculer les lignes game_tags à supprimer
+        if "tags" in inspect(game).unloaded:
+            await self.db.refresh(game, attribute_names=["tags"])
+
+        game.tags = tags
         await self.db.flush()
+
+    async def _resolve_tags(self, tag_names: List[str]) -> list[Tag]:
+        """Récupère ou crée les tags en bloc (un seul SELECT), dans l'ordre des noms fournis"""
+        names = list(dict.fromkeys(name.strip() for name in tag_names if name and name.strip()))
+        if not names:
+            return []
+
+        result = await self.db.execute(select(Tag).where(Tag.name.in_(names)))
+        tags_by_name = {tag.name: tag for tag in result.scalars().all()}
+
+        missing = [Tag(name=name) for name in names if name not in tags_by_name]
+        if missing:
+            self.db.add_all(missing)
+            tags_by_name.update((tag.name, tag) for tag in missing)
+
+        return [tags_by_name[name] for name in names]
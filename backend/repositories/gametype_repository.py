@@ -24,6 +24,13 @@ class GameTypeRepository:
         result = await self.db.execute(select(GameType).where(GameType.id == game_type_id))
         return result.scalar_one_or_none()
       
+    async def get_existing_ids(self, game_type_ids) -> set[UUID]:
+        """Return the subset of the given ids that exist (one query)"""
+        if not game_type_ids:
+            return set()
+        result = await self.db.execute(select(GameType.id).where(GameType.id.in_(set(game_type_ids))))
+        return set(result.scalars().all())
+
     async def get_game_type_by_name(self, name: str) -> GameType | None:
         """Get a game type by name"""
         result = await self.db.execute(select(GameType).where(GameType.name == name))
@@ -34,8 +41,6 @@ class GameTypeRepository:
         game_type = GameType(**game_type_data.model_dump())
         self.db.add(game_type)
         await self.db.flush()
-        await self.db.commit()
-        await self.db.refresh(game_type)
         return game_type
 
     async def update_game_type(self, game_type_id: UUID, game_type_data: GameTypeUpdate) -> GameType:
@@ -44,8 +49,7 @@ class GameTypeRepository:
         if game_type:
             for field, value in game_type_data.model_dump(exclude_unset=True).items():
                 setattr(game_type, field, value)
-            await self.db.commit()
-            await self.db.refresh(game_type)
+            await self.db.flush()
             return game_type
         return None
 
@@ -54,6 +58,6 @@ class GameTypeRepository:
         game_type = await self.get_game_type(game_type_id)
         if game_type:
             await self.db.delete(game_type)
-            await self.db.commit()
+            await self.db.flush()
             return True
         return False
\ No newline at end of file
@@ -1,16 +1,32 @@
 import secrets
 
-from uuid import UUID
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import delete, select, update, func, and_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import selectinload, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
 
-from models import Lobby
+from models import ChatMessage, Game, Lobby, LobbyStatus, MissionAssigned, Round, RoundTimer
+from models.lobby import LobbyPhase
 from schemas import LobbyCreate, LobbyUpdate
 from models.player import Player, PlayerStatus
 
 
+# Alphabet sans caractères ambigus à l'oral ou à l'écrit (0/O, 1/I/L, U/V)
+LOBBY_CODE_ALPHABET = "23456789ABCDEFGHJKMNPQRSTWXYZ"
+LOBBY_CODE_LENGTH = 6  # 29^6 ≈ 595M codes
+MAX_CODE_ATTEMPTS = 10
+
+
+class LobbyCodeExhaustedError(RuntimeError):
+    """No free lobby code could be allocated"""
+
+
 class LobbyRepository:
     """Repository for the lobby model"""
     
@@ -18,8 +34,19 @@ class LobbyRepository:
         self.db = db
     
     def _generate_code(self) -> str:
-        """Generate a unique lobby code"""
-        return secrets.token_urlsafe(6).upper()[:8]  # 8 caractères
+        """Generate a random lobby code"""
+        return "".join(secrets.choice(LOBBY_CODE_ALPHABET) for _ in range(LOBBY_CODE_LENGTH))
+
+    async def _recycle_code(self, code: str) -> bool:
+        """Release a code held by an ended lobby so it can be reused"""
+        # Le code libéré est remplacé par une valeur hors alphabet, jamais proposée aux joueurs
+        result = await self.db.execute(
+            update(Lobby)
+            .where(Lobby.code == code, Lobby.status == LobbyStatus.ENDED)
+            .values(code="~" + secrets.token_hex(9))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
     
     async def get_lobby(self, lobby_id: UUID) -> Lobby | None:
         """Get a lobby by ID"""
@@ -72,48 +99,77 @@ class LobbyRepository:
     
     async def create_lobby(self, lobby_data: LobbyCreate, host_id: UUID) -> Lobby:
         """Create a new lobby"""
-        # Generate a unique code
-        code = self._generate_code()
-        while await self.get_lobby_by_code(code):
-            code = self._generate_code()
-        
-        lobby = Lobby(
+        now = datetime.now(timezone.utc)
+        values = {
             **lobby_data.model_dump(),
-            host_id=host_id,
-            code=code,
-        )
+            "id": uuid4(),
+            "host_id": host_id,
+            "status": LobbyStatus.WAITING,
+            "phase": LobbyPhase.NONE,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        # Insertion optimiste : l'index unique sur le code arbitre les collisions (y compris
+        # entre créations concurrentes) en un seul INSERT ... ON CONFLICT DO NOTHING,
+        # sans SELECT préalable ni SAVEPOINT
+        code = self._generate_code()
+        for _ in range(MAX_CODE_ATTEMPTS):
+            if await self.db.scalar(self._insert_lobby({**values, "code": code})) is not None:
+                break
+            if not await self._recycle_code(code):
+                code = self._generate_code()
+        else:
+            raise LobbyCodeExhaustedError("Could not allocate a unique lobby code")
+
+        # Rattache la ligne insérée à la session ; collections vides : pas de rechargement
+        lobby = Lobby(**values, code=code, players=[], rounds=[])
+        make_transient_to_detached(lobby)
         self.db.add(lobby)
-        await self.db.commit()
-        await self.db.refresh(lobby)
+        game = await self.db.get(Game, lobby.game_id, options=[selectinload(Game.tags)])
+        set_committed_value(lobby, "game", game)
         return lobby
+
+    def _insert_lobby(self, values: dict):
+        """Build an INSERT that ignores code conflicts and returns the new id"""
+        dialect = self.db.get_bind().dialect.name
+        insert_fn = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        return (
+            insert_fn(Lobby)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[Lobby.code])
+            .returning(Lobby.id)
+        )
     
     async def update_lobby(self, lobby_id: UUID, lobby_data: LobbyUpdate) -> Lobby:
         """Update a lobby"""
-        lobby = await self.get_lobby(lobby_id)
-        if not lobby:
-            raise ValueError("Lobby not found")
-        
-        for field, value in lobby_data.model_dump(exclude_unset=True).items():
-            setattr(lobby, field, value)
-        
-        await self.db.commit()
-        await self.db.refresh(lobby)
-        
-        # Recharger avec les relations si nécessaire
+        # Relations chargées en une fois, y compris les tags du jeu sérialisés dans la réponse
         result = await self.db.execute(
             select(Lobby)
-            .options(selectinload(Lobby.game), selectinload(Lobby.players))
+            .options(
+                selectinload(Lobby.game).selectinload(Game.tags),
+                selectinload(Lobby.players),
+            )
             .where(Lobby.id == lobby_id)
         )
-        updated_lobby = result.unique().scalar_one()
-        return updated_lobby
+        lobby = result.unique().scalar_one_or_none()
+        if not lobby:
+            raise ValueError("Lobby not found")
+
+        data = lobby_data.model_dump(exclude_unset=True)
+        for field, value in data.items():
+            setattr(lobby, field, value)
+
+        await self.db.flush()
+        if "game_id" in data and (lobby.game is None or lobby.game.id != lobby.game_id):
+            lobby.game = await self.db.get(Game, lobby.game_id, options=[selectinload(Game.tags)])
+        return lobby
 
     async def add_player(self, lobby_id: UUID, user_id: UUID) -> None:
         """Add a player to a lobby"""
         player = Player(lobby_id=lobby_id, user_id=user_id, status=PlayerStatus.WAITING)
         self.db.add(player)
-        await self.db.commit()
-        await self.db.refresh(player)
+        await self.db.flush()
         return player
     
     async def update_current_players(self, lobby_id: UUID) -> None:
@@ -132,14 +188,57 @@ class LobbyRepository:
         lobby = await self.get_lobby(lobby_id)
         if lobby:
             lobby.current_players = count
-            await self.db.commit()
+            await self.db.flush()
     
     async def delete_lobby(self, lobby_id: UUID) -> bool:
         """Delete a lobby"""
         lobby = await self.get_lobby(lobby_id)
         if lobby:
             await self.db.delete(lobby)
-            await self.db.commit()
+            await self.db.flush()
             return True
         return False
 
+    async def get_host_id(self, lobby_id: UUID) -> UUID | None:
+        """Get the host of a lobby that has not ended (single column)"""
+        result = await self.db.execute(
+            select(Lobby.host_id).where(Lobby.id == lobby_id, Lobby.status != LobbyStatus.ENDED)
+        )
+        return result.scalar_one_or_none()
+
+    async def transfer_host(self, lobby_id: UUID, from_host_id: UUID, to_host_id: UUID) -> bool:
+        """Hand the lobby over to another host if ``from_host_id`` still holds it (single UPDATE)"""
+        result = await self.db.execute(
+            update(Lobby)
+            .where(Lobby.id == lobby_id, Lobby.host_id == from_host_id, Lobby.status != LobbyStatus.ENDED)
+            .values(host_id=to_host_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def set_phase(self, lobby_id: UUID, phase: LobbyPhase) -> bool:
+        """Move a lobby that has not ended to ``phase``, return False if nothing changed (single UPDATE)"""
+        result = await self.db.execute(
+            update(Lobby)
+            .where(Lobby.id == lobby_id, Lobby.phase != phase, Lobby.status != LobbyStatus.ENDED)
+            .values(phase=phase)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def delete_lobbies(self, lobby_ids: list[UUID]) -> int:
+        """Delete lobbies and their children with set-based statements, return the number of rows deleted"""
+        player_ids = select(Player.id).where(Player.lobby_id.in_(lobby_ids)).scalar_subquery()
+        statements = [
+            delete(MissionAssigned).where(MissionAssigned.player_id.in_(player_ids)),
+            delete(Player).where(Player.lobby_id.in_(lobby_ids)),
+            delete(Round).where(Round.lobby_id.in_(lobby_ids)),
+            delete(RoundTimer).where(RoundTimer.lobby_id.in_(lobby_ids)),
+            delete(ChatMessage).where(ChatMessage.lobby_id.in_(lobby_ids)),
+            delete(Lobby).where(Lobby.id.in_(lobby_ids)),
+        ]
+        deleted = 0
+        for statement in statements:
+            result = await self.db.execute(statement.execution_options(synchronize_session=False))
+            deleted += result.rowcount
+        return deleted
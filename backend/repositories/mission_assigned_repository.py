@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Mission, MissionAssigned, MissionAssignedStatus, Player
+
+
+class MissionAssignedRepository:
+    """Repository for the mission assignment model"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def resolve_active(
+        self, lobby_id: UUID, results: dict[UUID, MissionAssignedStatus]
+    ) -> list[tuple[UUID, MissionAssignedStatus, int]]:
+        """
+        Move ACTIVE assignments of a lobby to their final status.
+
+        Assignments that are not ACTIVE (already resolved) are left untouched, so
+        resolving twice has no effect. Returns (player_id, status, mission difficulty)
+        for each assignment actually resolved.
+        """
+        now = datetime.now(timezone.utc)
+        lobby_players = select(Player.id).where(Player.lobby_id == lobby_id).scalar_subquery()
+
+        resolved: list[tuple[UUID, MissionAssignedStatus, UUID]] = []
+        for status in (MissionAssignedStatus.COMPLETED, MissionAssignedStatus.FAILED):
+            ids = [assignment_id for assignment_id, result in results.items() if result == status]
+            if not ids:
+                continue
+            result = await self.db.execute(
+                update(MissionAssigned)
+                .where(
+                    MissionAssigned.id.in_(ids),
+                    MissionAssigned.status == MissionAssignedStatus.ACTIVE,
+                    MissionAssigned.player_id.in_(lobby_players),
+                )
+                .values(status=status, completed_at=now)
+                .returning(MissionAssigned.player_id, MissionAssigned.mission_id)
+                .execution_options(synchronize_session=False)
+            )
+            resolved.extend((player_id, status, mission_id) for player_id, mission_id in result.all())
+
+        if not resolved:
+            return []
+        difficulties = dict((await self.db.execute(
+            select(Mission.id, Mission.difficulty).where(Mission.id.in_({m for _, _, m in resolved}))
+        )).all())
+        return [(player_id, status, difficulties[mission_id]) for player_id, status, mission_id in resolved]
+
+    async def cancel_active(self, player_ids: list[UUID]) -> int:
+        """Cancel the ACTIVE assignments of the given players, return the number of rows updated"""
+        if not player_ids:
+            return 0
+        result = await self.db.execute(
+            update(MissionAssigned)
+            .where(MissionAssigned.player_id.in_(player_ids), MissionAssigned.status == MissionAssignedStatus.ACTIVE)
+            .values(status=MissionAssignedStatus.CANCELLED)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def create_assignments(self, pairs: list[tuple[UUID, UUID]]) -> list[MissionAssigned]:
+        """Create ACTIVE assignments from (player_id, mission_id) pairs with a single flush"""
+        assignments = [
+            MissionAssigned(player_id=player_id, mission_id=mission_id, status=MissionAssignedStatus.ACTIVE)
+            for player_id, mission_id in pairs
+        ]
+        self.db.add_all(assignments)
+        await self.db.flush()
+        return assignments
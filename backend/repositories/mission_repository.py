@@ -1,10 +1,19 @@
+import enum
+import uuid
+from typing import AsyncIterator, List, Sequence
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import insert, select, and_
 
 from schemas import MissionCreate, MissionUpdate
 from models import Mission, MissionAssigned, MissionAssignedStatus
+from models.mission import MissionType
+from repositories.search import normalize_tags, search_tokens, tagged_games, text_match, text_rank
+
+
+# Lignes lues par aller-retour lors d'un export en flux
+STREAM_BATCH_SIZE = 1000
 
 
 class MissionRepository:
@@ -25,23 +34,98 @@ class MissionRepository:
         )
         return list(result.scalars().all())
     
+    async def search_missions(
+        self,
+        query: str | None = None,
+        tags: Sequence[str] = (),
+        match_all_tags: bool = True,
+        difficulty_min: int | None = None,
+        difficulty_max: int | None = None,
+        mission_type: MissionType | None = None,
+        game_id: UUID | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[Mission]:
+        """Search missions by text (title, description), game tags, difficulty and type"""
+        dialect = self.db.get_bind().dialect.name
+        statement = select(Mission)
+        tokens = search_tokens(query)
+        if tokens:
+            statement = statement.where(text_match(dialect, Mission.__table__, [Mission.title, Mission.description], tokens))
+        tags = normalize_tags(tags)
+        if tags:
+            statement = statement.where(Mission.game_id.in_(tagged_games(tags, match_all_tags)))
+        if difficulty_min is not None:
+            statement = statement.where(Mission.difficulty >= difficulty_min)
+        if difficulty_max is not None:
+            statement = statement.where(Mission.difficulty <= difficulty_max)
+        if mission_type is not None:
+            statement = statement.where(Mission.type == mission_type)
+        if game_id is not None:
+            statement = statement.where(Mission.game_id == game_id)
+
+        rank = text_rank(dialect, Mission.__table__, tokens) if tokens else None
+        order = [rank.desc()] if rank is not None else []
+        result = await self.db.execute(
+            statement.order_by(*order, Mission.title, Mission.id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def stream_missions(self, game_id: UUID | None = None, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[dict]:
+        """Stream missions ordered by (game_id, id) with a server-side cursor (constant memory)"""
+        query = select(
+            Mission.id, Mission.game_id, Mission.title, Mission.description, Mission.type, Mission.difficulty,
+            Mission.image_url, Mission.is_known_by_player, Mission.is_known_by_others, Mission.created_by,
+        )
+        if game_id is not None:
+            query = query.where(Mission.game_id == game_id)
+        result = await self.db.stream(
+            query.order_by(Mission.game_id, Mission.id).execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield row._asdict()
+
     async def create_mission(self, mission_data: MissionCreate) -> Mission:
         """Create a new mission"""
         mission = Mission(**mission_data.model_dump())
         self.db.add(mission)
-        await self.db.commit()
-        await self.db.refresh(mission)
+        await self.db.flush()
         return mission
     
 
+    async def insert_missions(self, rows: List[dict]) -> int:
+        """
+        Bulk insert missions without loading ORM objects.
+
+        PostgreSQL (asyncpg): ``COPY`` into ``missions``; other dialects: multi-row INSERT.
+        """
+        if not rows:
+            return 0
+        rows = [{"id": uuid.uuid4(), **row} for row in rows]
+        connection = await self.db.connection()
+        if connection.dialect.driver == "asyncpg":
+            columns = list(rows[0])
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                Mission.__tablename__,
+                columns=columns,
+                # Les enums sont stockés par nom dans le type PostgreSQL
+                records=[
+                    tuple(value.name if isinstance(value, enum.Enum) else value for value in row.values())
+                    for row in rows
+                ],
+            )
+        else:
+            await self.db.execute(insert(Mission.__table__), rows)
+        return len(rows)
+
     async def update_mission(self, mission_id: UUID, mission_data: MissionUpdate) -> Mission:
         """Update a mission"""
         mission = await self.get_mission(mission_id)
         if mission:
             for field, value in mission_data.model_dump(exclude_unset=True).items():
                 setattr(mission, field, value)
-            await self.db.commit()
-            await self.db.refresh(mission)
+            await self.db.flush()
             return mission
 
 
@@ -50,7 +134,7 @@ class MissionRepository:
         mission = await self.get_mission(mission_id)
         if mission:
             await self.db.delete(mission)
-            await self.db.commit()
+            await self.db.flush()
             return True
         return False
 
@@ -92,7 +176,6 @@ class MissionRepository:
             status=MissionAssignedStatus.ACTIVE
         )
         self.db.add(mission_assigned)
-        await self.db.commit()
-        await self.db.refresh(mission_assigned)
+        await self.db.flush()
         return mission_assigned
 
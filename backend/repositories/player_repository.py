@@ -1,7 +1,7 @@
 from typing import List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_
 from sqlalchemy.orm import selectinload
 from uuid import UUID
 
@@ -55,6 +55,16 @@ class PlayerRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_active_user_ids(self, lobby_id: UUID) -> set[UUID]:
+        """Get the users with an active player (waiting or playing) in a lobby"""
+        result = await self.db.execute(
+            select(Player.user_id).where(
+                Player.lobby_id == lobby_id,
+                Player.status.in_([PlayerStatus.WAITING, PlayerStatus.PLAYING]),
+            )
+        )
+        return set(result.scalars().all())
+    
     async def create_player(self, player_data: PlayerCreate, user_id: UUID) -> Player:
         """Create a new player"""
         player = Player(
@@ -63,8 +73,7 @@ class PlayerRepository:
             status=PlayerStatus.WAITING
         )
         self.db.add(player)
-        await self.db.commit()
-        await self.db.refresh(player)
+        await self.db.flush()
         return player
     
     async def update_player(self, player_id: UUID, player_data: PlayerUpdate) -> Player:
@@ -76,16 +85,40 @@ class PlayerRepository:
             player.score = player_data.score
         if player_data.status is not None:
             player.status = player_data.status
-        await self.db.commit()
-        await self.db.refresh(player)
+        await self.db.flush()
         return player
     
+    async def increment_scores(self, deltas: dict[UUID, int]) -> dict[UUID, int]:
+        """Atomically add score deltas (``score = score + :delta``), return the new scores"""
+        scores = {}
+        for player_id, delta in deltas.items():
+            result = await self.db.execute(
+                update(Player)
+                .where(Player.id == player_id)
+                .values(score=Player.score + delta)
+                .returning(Player.score)
+                .execution_options(synchronize_session=False)
+            )
+            score = result.scalar_one_or_none()
+            if score is not None:
+                scores[player_id] = score
+        return scores
+
+    async def get_lobby_scores(self, lobby_id: UUID) -> list[tuple[UUID, UUID, int]]:
+        """Get (player_id, user_id, score) for the players of a lobby, in join order"""
+        result = await self.db.execute(
+            select(Player.id, Player.user_id, Player.score)
+            .where(Player.lobby_id == lobby_id, Player.status != PlayerStatus.LEFT)
+            .order_by(Player.joined_at)
+        )
+        return [tuple(row) for row in result.all()]
+
     async def delete_player(self, player_id: UUID) -> bool:
         """Delete a player"""
         player = await self.get_player(player_id)
         if player:
             await self.db.delete(player)
-            await self.db.commit()
+            await self.db.flush()
             return True
         return False
 
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import RoundTimer
+
+
+class RoundTimerRepository:
+    """Repository for persisted round timer deadlines"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def save_timer(
+        self,
+        lobby_id: UUID,
+        deadline_at: Optional[datetime],
+        remaining_seconds: Optional[float] = None,
+    ) -> None:
+        """Insert or replace the timer of a lobby (running: deadline, paused: remaining seconds)"""
+        values = {"lobby_id": lobby_id, "deadline_at": deadline_at, "remaining_seconds": remaining_seconds}
+        dialect = self.db.get_bind().dialect.name
+        insert_fn = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert_fn(RoundTimer).values(**values)
+        await self.db.execute(statement.on_conflict_do_update(
+            index_elements=[RoundTimer.lobby_id],
+            set_={"deadline_at": deadline_at, "remaining_seconds": remaining_seconds},
+        ))
+
+    async def delete_timer(self, lobby_id: UUID) -> None:
+        """Delete the timer of a lobby"""
+        await self.db.execute(delete(RoundTimer).where(RoundTimer.lobby_id == lobby_id))
+
+    async def get_timers(self) -> List[Tuple[UUID, Optional[datetime], Optional[float]]]:
+        """Get every persisted timer as (lobby_id, deadline_at, remaining_seconds)"""
+        result = await self.db.execute(
+            select(RoundTimer.lobby_id, RoundTimer.deadline_at, RoundTimer.remaining_seconds)
+        )
+        return [tuple(row) for row in result.all()]
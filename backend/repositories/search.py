@@ -0,0 +1,55 @@
+import re
+from typing import Sequence
+
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from models import Tag
+from models.game import GameTag
+
+
+SEARCH_CONFIG = "simple"            # configuration text search : pas de racinisation (noms, tags)
+# Lettres et chiffres seulement : ``_`` (joker de LIKE) sépare les mots, comme dans le tsvector
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def search_tokens(query: str | None) -> list[str]:
+    """Split a free-text query into lowercase word tokens (punctuation and ``_`` are ignored)."""
+    return [token.lower() for token in _TOKEN.findall(query or "")]
+
+
+def normalize_tags(tags: Sequence[str]) -> list[str]:
+    """Strip tag filter values (as tag names are stored), dropping blanks and duplicates."""
+    return list(dict.fromkeys(tag.strip() for tag in tags if tag and tag.strip()))
+
+
+def text_match(dialect: str, table, columns: Sequence, tokens: list[str]):
+    """
+    WHERE clause matching every token as a word prefix.
+
+    PostgreSQL uses the generated ``search_vector`` column (GIN index) with a prefix
+    tsquery, plus a trigram-indexed ILIKE on the first column for in-word prefixes;
+    other dialects fall back to ILIKE on each column.
+    """
+    if dialect == "postgresql":
+        vector = literal_column(f"{table.name}.search_vector", type_=TSVECTOR)
+        tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{token}:*" for token in tokens))
+        return or_(vector.op("@@")(tsquery), columns[0].ilike(" ".join(tokens) + "%"))
+    return and_(*(or_(*(column.ilike(f"%{token}%") for column in columns)) for token in tokens))
+
+
+def text_rank(dialect: str, table, tokens: list[str]):
+    """ORDER BY expression for relevance (PostgreSQL only, ``None`` elsewhere)."""
+    if dialect != "postgresql":
+        return None
+    vector = literal_column(f"{table.name}.search_vector", type_=TSVECTOR)
+    return func.ts_rank(vector, func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{token}:*" for token in tokens)))
+
+
+def tagged_games(tags: Sequence[str], match_all: bool = True):
+    """Subquery of game ids carrying all (or any) of the given tag names."""
+    names = normalize_tags(tags)
+    query = select(GameTag.c.game_id).join(Tag, Tag.id == GameTag.c.tag_id).where(Tag.name.in_(names))
+    if match_all:
+        query = query.group_by(GameTag.c.game_id).having(func.count(GameTag.c.tag_id) == len(names))
+    return query
@@ -54,7 +54,6 @@ class TokenRepository:
             revoked.revoked_at = now
             revoked.reason = reason or revoked.reason
 
-        await self.db.commit()
-        await self.db.refresh(revoked)
+        await self.db.flush()
         return revoked
 
@@ -62,8 +62,7 @@ class UserRepository:
             is_superuser=False,
         )
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         return user
 
     async def username_exists(self, username: str) -> bool:
@@ -89,8 +88,7 @@ class UserRepository:
             user.email = user_data.email
         if user_data.is_active is not None:
             user.is_active = user_data.is_active
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         return user
 
     async def delete_user(self, user_id: UUID) -> None:
@@ -99,7 +97,7 @@ class UserRepository:
         if not user:
             raise ValueError("User not found")
         await self.db.delete(user)
-        await self.db.commit()
+        await self.db.flush()
 
     async def set_user_password(self, user_id: UUID, password: str) -> None:
         """Set a user's password"""
@@ -107,18 +105,21 @@ class UserRepository:
         if not user:
             raise ValueError("User not found")
         user.hashed_password = hash_password(password)
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
 
 
-    async def set_user_active(self, user_id: UUID, is_active: bool) -> None:
-        """Set a user's active status"""
-        user = await self.get_user(user_id)
+    async def set_user_active(self, user_id: UUID, is_active: bool) -> User:
+        """Set a user's active status (single UPDATE ... RETURNING)"""
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(is_active=is_active)
+            .returning(User)
+        )
+        user = result.scalar_one_or_none()
         if not user:
             raise ValueError("User not found")
-        user.is_active = is_active
-        await self.db.commit()
-        await self.db.refresh(user)
+        return user
 
     # --- Méthodes PasswordResetToken ---
 
@@ -133,7 +134,7 @@ class UserRepository:
             expires_at=expires_at,
         )
         self.db.add(reset_token)
-        await self.db.commit()
+        await self.db.flush()
         return reset_token
 
     async def get_password_reset_token(self, token: str) -> Optional[PasswordResetToken]:
@@ -146,7 +147,7 @@ class UserRepository:
             .where(PasswordResetToken.id == token_id)
             .values(used=True, expires_at=datetime.now(timezone.utc)) # Marquer comme utilisé
         )
-        await self.db.commit()
+        await self.db.flush()
 
     # --- Méthodes AccountActivationToken ---
 
@@ -161,7 +162,7 @@ class UserRepository:
             expires_at=expires_at,
         )
         self.db.add(account_activation_token)
-        await self.db.commit()
+        await self.db.flush()
         return account_activation_token
 
     async def get_account_activation_token(self, token: str) -> Optional[AccountActivationToken]:
@@ -174,4 +175,4 @@ class UserRepository:
             .where(AccountActivationToken.id == token_id)
             .values(used=True, expires_at=datetime.now(timezone.utc))
         )
-        await self.db.commit()
\ No newline at end of file
+        await self.db.flush()
\ No newline at end of file
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import UserStats
+
+
+# Lignes par INSERT multi-valeurs (reste sous la limite de paramètres des pilotes)
+UPSERT_BATCH_SIZE = 1000
+
+COUNTERS = ("games_played", "games_won", "missions_assigned", "missions_completed", "total_score")
+
+
+class UserStatsRepository:
+    """Repository for the user_stats aggregate table"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_stats(self, user_id: UUID) -> UserStats | None:
+        """Get the stats row of a user (primary key lookup)"""
+        result = await self.db.execute(select(UserStats).where(UserStats.user_id == user_id))
+        return result.scalar_one_or_none()
+
+    async def add_stats(self, rows: List[dict]) -> None:
+        """
+        Add counter deltas to the stats of each user, creating missing rows.
+
+        One ``INSERT ... ON CONFLICT (user_id) DO UPDATE SET col = col + excluded.col``
+        per batch: concurrent game ends on the same user never lose an increment.
+        """
+        if not rows:
+            return
+        now = datetime.now(timezone.utc)
+        dialect = self.db.get_bind().dialect.name
+        insert_fn = postgresql_insert if dialect == "postgresql" else sqlite_insert
+
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            statement = insert_fn(UserStats).values(
+                [{**row, "updated_at": now} for row in rows[start:start + UPSERT_BATCH_SIZE]]
+            )
+            excluded = statement.excluded
+            await self.db.execute(statement.on_conflict_do_update(
+                index_elements=[UserStats.user_id],
+                set_={
+                    **{name: getattr(UserStats, name) + getattr(excluded, name) for name in COUNTERS},
+                    "last_game_at": case(
+                        (UserStats.last_game_at.is_(None), excluded.last_game_at),
+                        (excluded.last_game_at > UserStats.last_game_at, excluded.last_game_at),
+                        else_=UserStats.last_game_at,
+                    ),
+                    "updated_at": now,
+                },
+            ))
+
+    async def delete_all_stats(self) -> int:
+        """Delete every stats row (before a full backfill)"""
+        result = await self.db.execute(delete(UserStats))
+        return result.rowcount
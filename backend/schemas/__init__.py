@@ -18,6 +18,10 @@ from .mission_assigned import MissionAssignedCreate, MissionAssignedResponse, Mi
 from .player import PlayerCreate, PlayerResponse, PlayerUpdate
 from .lobby import LobbyCreate, LobbyResponse, LobbyUpdate
 from .round import RoundCreate, RoundResponse
+from .user_stats import UserStatsResponse
+from .content_import import (
+    CatalogGameRow, CatalogMissionRow, CatalogRow, GameImportRow, ImportReport, ImportRowError, MissionImportRow,
+)
 
 
 LobbyResponse.model_rebuild()
@@ -60,6 +64,16 @@ __all__ = [
     "PlayerUpdate",
     "PlayerWithUser",
 
+    "UserStatsResponse",
+
+    "GameImportRow",
+    "CatalogGameRow",
+    "CatalogMissionRow",
+    "CatalogRow",
+    "MissionImportRow",
+    "ImportReport",
+    "ImportRowError",
+
     "PasswordResetEmailRequest",
     "PasswordResetConfirmRequest",
     "AccountActivationRequest",
@@ -0,0 +1,64 @@
+from typing import Annotated, Any, List, Literal, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag, field_validator
+
+from .game import GameBase
+from .mission import MissionBase
+
+
+class MissionImportRow(MissionBase):
+    """Ligne d'import de mission ; ``game_id`` peut venir du paramètre d'import."""
+    model_config = ConfigDict(extra="ignore")
+
+    difficulty: int = Field(ge=0, le=100)
+    game_id: Optional[UUID] = None
+
+
+class GameImportRow(GameBase):
+    """Ligne d'import de jeu ; en CSV, les tags sont séparés par ``|``."""
+    model_config = ConfigDict(extra="ignore")
+
+    tags: List[str] = []
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def split_tags(cls, v: Any) -> Any:
+        if isinstance(v, str):
+            return [tag.strip() for tag in v.split("|") if tag.strip()]
+        return v
+
+
+class CatalogGameRow(GameImportRow):
+    """Jeu d'un export du catalogue : ``id`` exporté, auquel se réfèrent ses missions."""
+    kind: Literal["game"] = "game"
+    id: Optional[UUID] = None
+
+
+class CatalogMissionRow(MissionImportRow):
+    """Mission d'un export du catalogue (``kind: mission``), rattachée par ``game_id``."""
+    kind: Literal["mission"]
+
+
+def _catalog_kind(value: Any) -> str:
+    kind = value.get("kind", "game") if isinstance(value, dict) else getattr(value, "kind", "game")
+    return kind if kind in ("game", "mission") else "game"
+
+
+# Ligne d'import de jeux : sans ``kind``, un jeu (NDJSON ou CSV classique)
+CatalogRow = Annotated[
+    Union[Annotated[CatalogGameRow, Tag("game")], Annotated[CatalogMissionRow, Tag("mission")]],
+    Discriminator(_catalog_kind),
+]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []        # premières erreurs seulement (``failed`` les compte toutes)
@@ -10,6 +10,8 @@ class MissionBase(BaseModel):
     type: MissionType = MissionType.MISSION
     difficulty: int  # 0-100
     image_url: Optional[str] = None
+    is_known_by_player: bool = True
+    is_known_by_others: bool = False
 
 
 class MissionCreate(MissionBase):
@@ -23,6 +25,8 @@ class MissionUpdate(BaseModel):
     type: Optional[MissionType] = None
     difficulty: Optional[int] = None
     image_url: Optional[str] = None
+    is_known_by_player: Optional[bool] = None
+    is_known_by_others: Optional[bool] = None
 
 
 class MissionResponse(MissionBase):
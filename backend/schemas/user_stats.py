@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class UserStatsResponse(BaseModel):
+    user_id: UUID
+    games_played: int = 0
+    games_won: int = 0
+    missions_assigned: int = 0
+    missions_completed: int = 0
+    total_score: int = 0
+    win_rate: float = 0.0
+    average_score: float = 0.0
+    last_game_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
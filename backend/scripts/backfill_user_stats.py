@@ -0,0 +1,47 @@
+"""
+Reconstruit la table ``user_stats`` à partir des parties archivées.
+
+À lancer une fois après l'ajout de la table (ou pour corriger une dérive) : les lobbies
+terminés pas encore archivés le sont d'abord, puis les archives sont lues par pages et
+agrégées page par page, en une seule transaction.
+
+Usage:
+    python -m scripts.backfill_user_stats
+    python -m scripts.backfill_user_stats --chunk-size 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from db.database import async_session_maker, close_db
+from db.unit_of_work import UnitOfWork
+from services.stats_service import BACKFILL_CHUNK_SIZE, UserStatsService
+
+
+async def backfill(chunk_size: int) -> None:
+    start = time.perf_counter()
+    try:
+        async with async_session_maker() as session, UnitOfWork(session):
+            games = await UserStatsService(session).backfill(chunk_size)
+    finally:
+        await close_db()
+    print(f"✅ user_stats reconstruite depuis {games} parties en {time.perf_counter() - start:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE,
+                        help="Parties agrégées par paquet (défaut : %(default)s)")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
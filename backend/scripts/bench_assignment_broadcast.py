@@ -0,0 +1,159 @@
+"""
+Benchmark de la diffusion de l'attribution des missions.
+
+Compare, pour un lobby de ``--players`` joueurs (50 par défaut) et quelques spectateurs :
+
+- la diffusion naïve : une vue complète construite et sérialisée par socket ;
+- ``ConnexionManager.broadcast_views`` : un payload public sérialisé une fois par room,
+  plus de petits patchs secrets (``assignment_views``).
+
+Le serveur Socket.IO factice sérialise chaque émission une fois en JSON, comme
+python-socketio (un paquet encodé par appel à ``emit``, quel que soit le nombre de
+destinataires de la room), et compte les octets encodés et envoyés.
+
+Usage:
+    python -m scripts.bench_assignment_broadcast
+    python -m scripts.bench_assignment_broadcast --players 200 --iterations 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from websocket.connexion_manager import ConnexionManager, WebSocketUser, spectator_room
+from websocket.visibility import assignment_views, full_view
+
+
+LOBBY = "bench-lobby"
+
+
+class EncodingSioServer:
+    """Serveur Socket.IO factice : encode chaque émission une fois, compte octets et destinataires."""
+
+    def __init__(self) -> None:
+        self.rooms: dict[str, set[str]] = defaultdict(set)
+        self.reset()
+
+    def reset(self) -> None:
+        self.encodes = self.encoded_bytes = self.sent_bytes = 0
+
+    async def emit(self, event, data, room=None, to=None, skip_sid=None, **kwargs):
+        packet = json.dumps([event, data])
+        self.encodes += 1
+        self.encoded_bytes += len(packet)
+        target = to or room
+        skipped = set(skip_sid or ())
+        recipients = [sid for sid in self.rooms.get(target, {target}) if sid not in skipped]
+        self.sent_bytes += len(packet) * len(recipients)
+
+    async def enter_room(self, sid, room):
+        self.rooms[room].add(sid)
+
+    async def leave_room(self, sid, room):
+        self.rooms[room].discard(sid)
+
+    async def save_session(self, sid, session):
+        pass
+
+
+def build_assignment(players: int, rng: random.Random) -> dict:
+    """Missions d'une attribution : 40 % publiques, 30 % privées, 20 % connues des autres, 10 % secrètes."""
+    flags = [(True, True)] * 4 + [(True, False)] * 3 + [(False, True)] * 2 + [(False, False)]
+    missions = {}
+    for index in range(players):
+        known_by_player, known_by_others = rng.choice(flags)
+        missions[f"player-{index:04d}"] = {
+            "user_id": f"user-{index:04d}",
+            "mission_id": f"assigned-{index:04d}",
+            "mission": {
+                "id": f"mission-{index:04d}",
+                "title": f"Mission {index}",
+                "description": "Faire dire « banane » à un autre joueur sans qu'il s'en rende compte. " * 3,
+                "is_known_by_player": known_by_player,
+                "is_known_by_others": known_by_others,
+            },
+        }
+    return missions
+
+
+async def naive(manager: ConnexionManager, missions: dict, user_ids: list[str]) -> None:
+    views = assignment_views(LOBBY, missions)
+    for user_id in user_ids:
+        view = full_view(views, user_id, user_ids)
+        for sid in manager.sids_for_user(user_id):
+            await manager.send_to(sid, "missions_assigned", view)
+    await manager.sio_server.emit("missions_assigned", views.public, room=spectator_room(LOBBY))
+
+
+async def with_views(manager: ConnexionManager, missions: dict, user_ids: list[str]) -> None:
+    await manager.broadcast_views("missions_assigned", assignment_views(LOBBY, missions), LOBBY)
+
+
+async def measure(strategy, manager, sio, missions, user_ids, iterations: int) -> dict:
+    await strategy(manager, missions, user_ids)     # échauffement
+    sio.reset()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await strategy(manager, missions, user_ids)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "p50": timings[len(timings) // 2],
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "encodes": sio.encodes / iterations,
+        "encoded_bytes": sio.encoded_bytes / iterations,
+        "sent_bytes": sio.sent_bytes / iterations,
+    }
+
+
+async def run(args) -> None:
+    rng = random.Random(args.seed)
+    sio = EncodingSioServer()
+    manager = ConnexionManager(sio)
+    user_ids = [f"user-{index:04d}" for index in range(args.players)]
+    for index, user_id in enumerate(user_ids):
+        await manager.register_connection(f"sid-{index}", WebSocketUser(id=user_id, username=f"user{index}"))
+        await manager.join_lobby(f"sid-{index}", LOBBY)
+    for index in range(args.spectators):
+        sid = f"sid-watcher-{index}"
+        await manager.register_connection(sid, WebSocketUser(id=f"watcher-{index}", username=f"watcher{index}"))
+        await manager.watch_lobby(sid, LOBBY)
+    missions = build_assignment(args.players, rng)
+
+    print(f"🎭 Attribution des missions : {args.players} joueurs, {args.spectators} spectateurs, "
+          f"{args.iterations} diffusions")
+    results = {
+        "vue par socket": await measure(naive, manager, sio, missions, user_ids, args.iterations),
+        "public + patchs": await measure(with_views, manager, sio, missions, user_ids, args.iterations),
+    }
+    for name, result in results.items():
+        print(f"   {name:<16}: p50 {result['p50'] * 1000:.3f} ms, p99 {result['p99'] * 1000:.3f} ms, "
+              f"{result['encodes']:.0f} encodages, {result['encoded_bytes'] / 1024:.1f} Kio encodés, "
+              f"{result['sent_bytes'] / 1024:.1f} Kio envoyés")
+    naive_result, views_result = results.values()
+    print(f"   gain            : x{naive_result['p50'] / views_result['p50']:.1f} en temps, "
+          f"x{naive_result['encoded_bytes'] / views_result['encoded_bytes']:.1f} en octets encodés")
+    manager.host_migration.cancel_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=50, help="Joueurs dans le lobby")
+    parser.add_argument("--spectators", type=int, default=5, help="Spectateurs du lobby")
+    parser.add_argument("--iterations", type=int, default=1_000, help="Diffusions mesurées")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du tirage des visibilités")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark de l'allocation des codes de lobby sur une table volumineuse.
+
+Remplit la table ``lobbies`` (1M lignes par défaut, dont une part de lobbies terminés),
+puis mesure le débit de création de lobbies, une transaction par création comme une
+requête HTTP. L'ancien allocateur (SELECT de vérification avant chaque INSERT) est
+mesuré en comparaison de l'INSERT ... ON CONFLICT DO NOTHING.
+
+Usage:
+    python -m scripts.bench_lobby_codes
+    python -m scripts.bench_lobby_codes --lobbies 100000 --creates 500
+    python -m scripts.bench_lobby_codes --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+import secrets
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from db.database import Base
+from db.unit_of_work import UnitOfWork
+from models import *  # Importer tous les modèles pour que Base.metadata les connaisse
+from models.lobby import LobbyPhase
+from repositories.lobby_repository import LOBBY_CODE_ALPHABET, LOBBY_CODE_LENGTH, LobbyRepository
+from schemas import LobbyCreate
+
+
+CHUNK_SIZE = 50_000
+
+
+class LegacyLobbyRepository(LobbyRepository):
+    """Ancien allocateur : tirage puis SELECT (avec jointures) jusqu'à trouver un code libre."""
+
+    async def create_lobby(self, lobby_data: LobbyCreate, host_id: uuid.UUID) -> Lobby:
+        code = self._generate_code()
+        while await self.get_lobby_by_code(code):
+            code = self._generate_code()
+        lobby = Lobby(**lobby_data.model_dump(), host_id=host_id, code=code, players=[], rounds=[])
+        self.db.add(lobby)
+        await self.db.flush()
+        lobby.game = await self.db.get(Game, lobby.game_id, options=[selectinload(Game.tags)])
+        return lobby
+
+
+async def populate(session_maker, lobbies: int, ended_ratio: float) -> tuple[uuid.UUID, uuid.UUID]:
+    """Insère un utilisateur, un jeu et ``lobbies`` lobbies en lots."""
+    now = datetime.now(timezone.utc)
+    host_id, game_type_id, game_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    async with session_maker() as session, UnitOfWork(session):
+        await session.execute(insert(User).values(
+            id=host_id, email="bench@example.com", username="bench", hashed_password="x",
+            is_active=True, created_at=now, updated_at=now,
+        ))
+        await session.execute(insert(GameType).values(id=game_type_id, name="Mission", description="Bench"))
+        await session.execute(insert(Game).values(
+            id=game_id, name="Bench", description="Bench", game_type_id=game_type_id, created_at=now, updated_at=now,
+        ))
+
+    codes: set[str] = set()
+    while len(codes) < lobbies:
+        codes.add("".join(random.choices(LOBBY_CODE_ALPHABET, k=LOBBY_CODE_LENGTH)))
+
+    codes_list = list(codes)
+    for start in range(0, lobbies, CHUNK_SIZE):
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "name": f"Lobby {start + i}",
+                "code": code,
+                "game_id": game_id,
+                "host_id": host_id,
+                "status": LobbyStatus.ENDED if random.random() < ended_ratio else LobbyStatus.WAITING,
+                "phase": LobbyPhase.NONE,
+                "min_players": 2,
+                "max_players": 10,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, code in enumerate(codes_list[start:start + CHUNK_SIZE])
+        ]
+        async with session_maker() as session, UnitOfWork(session):
+            await session.execute(insert(Lobby.__table__), rows)
+        print(f"   {min(start + CHUNK_SIZE, lobbies):>9} / {lobbies} lobbies")
+    return host_id, game_id
+
+
+async def measure(engine, session_maker, repository_class, creates: int, host_id, game_id) -> tuple[float, float]:
+    """Retourne le nombre de créations de lobby par seconde et de requêtes SQL par création."""
+    statements = 0
+
+    def count_statement(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    started = time.perf_counter()
+    try:
+        for i in range(creates):
+            async with session_maker() as session, UnitOfWork(session):
+                await repository_class(session).create_lobby(
+                    LobbyCreate(name=f"Bench {i}", game_id=game_id), host_id
+                )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+    return creates / (time.perf_counter() - started), statements / creates
+
+
+async def run(args) -> None:
+    database_url = args.database_url
+    path = None
+    if database_url is None:
+        path = Path(tempfile.gettempdir()) / f"bench_lobby_codes_{secrets.token_hex(4)}.db"
+        database_url = f"sqlite+aiosqlite:///{path}"
+
+    engine = create_async_engine(database_url, echo=False)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        print(f"📦 Insertion de {args.lobbies} lobbies ({args.ended_ratio:.0%} terminés)...")
+        host_id, game_id = await populate(session_maker, args.lobbies, args.ended_ratio)
+
+        print(f"\n⏱️  {args.creates} créations de lobby par allocateur...")
+        legacy, legacy_statements = await measure(
+            engine, session_maker, LegacyLobbyRepository, args.creates, host_id, game_id
+        )
+        optimistic, optimistic_statements = await measure(
+            engine, session_maker, LobbyRepository, args.creates, host_id, game_id
+        )
+
+        print(f"   SELECT puis INSERT  : {legacy:>8.1f} lobbies/s, {legacy_statements:.2f} requêtes/création")
+        print(
+            f"   INSERT optimiste    : {optimistic:>8.1f} lobbies/s, {optimistic_statements:.2f} requêtes/création "
+            f"({optimistic / legacy:.2f}x)"
+        )
+    finally:
+        if path is None:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lobbies", type=int, default=1_000_000, help="Lobbies existants avant la mesure")
+    parser.add_argument("--creates", type=int, default=2_000, help="Créations de lobby mesurées par allocateur")
+    parser.add_argument("--ended-ratio", type=float, default=0.3, help="Part des lobbies existants terminés")
+    parser.add_argument("--database-url", default=None, help="URL SQLAlchemy async (SQLite temporaire par défaut)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
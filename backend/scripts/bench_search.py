@@ -0,0 +1,163 @@
+"""
+Benchmark de la recherche de missions sur un catalogue volumineux.
+
+Remplit la base (100k missions réparties sur 1 000 jeux tagués par défaut), puis mesure
+la latence de ``MissionRepository.search_missions`` pour plusieurs requêtes types, comparée
+au téléchargement de tout le catalogue filtré côté client (ce que faisaient les clients
+avec ``get_missions_by_game``). Sur PostgreSQL, la recherche utilise la colonne
+``search_vector`` (index GIN) et l'index trigramme ; sur SQLite, le repli ILIKE.
+
+Usage:
+    python -m scripts.bench_search
+    python -m scripts.bench_search --missions 20000 --repeat 5
+    python -m scripts.bench_search --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.database import Base
+from db.unit_of_work import UnitOfWork
+from models import *  # Importer tous les modèles pour que Base.metadata les connaisse
+from models.game import GameTag
+from models.mission import MissionType
+from repositories.mission_repository import MissionRepository
+
+
+CHUNK_SIZE = 10_000
+VERBS = ["cacher", "échanger", "chanter", "voler", "imiter", "dessiner", "porter", "compter", "siffler", "placer"]
+OBJECTS = ["verre", "fourchette", "chapeau", "livre", "téléphone", "clé", "chaussette", "bougie", "carte", "cuillère"]
+PLACES = ["cuisine", "salon", "bureau", "jardin", "garage", "balcon", "couloir", "cave", "grenier", "terrasse"]
+TAGS = ["soirée", "bluff", "bureau", "famille", "enfants", "rapide", "long", "extérieur", "calme", "équipe"]
+
+QUERIES = {
+    "texte (1 mot)": {"query": "chapeau"},
+    "texte (préfixe, 2 mots)": {"query": "chant cuis"},
+    "tags (tous)": {"tags": ["soirée", "bluff"]},
+    "tags (au moins un) + difficulté": {"tags": ["famille", "enfants"], "match_all_tags": False,
+                                        "difficulty_min": 40, "difficulty_max": 60},
+    "texte + tags + type": {"query": "voler", "tags": ["équipe"], "mission_type": MissionType.ROLE},
+}
+
+
+async def populate(session_maker, games: int, missions: int, rng: random.Random) -> None:
+    """Insère les tags, ``games`` jeux (2 à 4 tags chacun) et ``missions`` missions en lots."""
+    now = datetime.now(timezone.utc)
+    game_type_id = uuid.uuid4()
+    tag_ids = {name: uuid.uuid4() for name in TAGS}
+    game_ids = [uuid.uuid4() for _ in range(games)]
+    async with session_maker() as session, UnitOfWork(session):
+        await session.execute(insert(GameType).values(id=game_type_id, name="Mission", description="Bench"))
+        await session.execute(insert(Tag), [{"id": tag_id, "name": name} for name, tag_id in tag_ids.items()])
+        await session.execute(insert(Game.__table__), [
+            {"id": game_id, "name": f"Jeu {index}", "description": f"Jeu de bench {index}",
+             "game_type_id": game_type_id, "min_players": 2, "max_players": 10, "created_at": now, "updated_at": now}
+            for index, game_id in enumerate(game_ids)
+        ])
+        await session.execute(insert(GameTag), [
+            {"game_id": game_id, "tag_id": tag_ids[name]}
+            for game_id in game_ids
+            for name in rng.sample(TAGS, rng.randint(2, 4))
+        ])
+
+    for start in range(0, missions, CHUNK_SIZE):
+        rows = []
+        for _ in range(start, min(start + CHUNK_SIZE, missions)):
+            verb, obj, place = rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(PLACES)
+            rows.append({
+                "id": uuid.uuid4(),
+                "game_id": rng.choice(game_ids),
+                "title": f"{verb.capitalize()} un {obj}",
+                "description": f"{verb.capitalize()} un {obj} dans le {place} sans se faire remarquer",
+                "type": rng.choice([MissionType.MISSION, MissionType.MISSION, MissionType.ROLE]),
+                "difficulty": rng.randint(0, 100),
+                "is_known_by_player": True,
+                "is_known_by_others": False,
+            })
+        async with session_maker() as session, UnitOfWork(session):
+            await session.execute(insert(Mission.__table__), rows)
+        print(f"   {min(start + CHUNK_SIZE, missions):>9} / {missions} missions")
+
+
+async def timed(repeat: int, call) -> tuple[float, int]:
+    """Latence médiane de ``call`` (en secondes) et nombre de résultats."""
+    timings, count = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = await call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), count
+
+
+async def run(args) -> None:
+    database_url = args.database_url
+    path = None
+    if database_url is None:
+        path = Path(tempfile.gettempdir()) / f"bench_search_{secrets.token_hex(4)}.db"
+        database_url = f"sqlite+aiosqlite:///{path}"
+
+    engine = create_async_engine(database_url, echo=False)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        print(f"📦 Insertion de {args.games} jeux et {args.missions} missions...")
+        await populate(session_maker, args.games, args.missions, random.Random(args.seed))
+        if engine.dialect.name == "postgresql":
+            async with engine.begin() as conn:
+                await conn.exec_driver_sql("ANALYZE missions")
+                await conn.exec_driver_sql("ANALYZE game_tags")
+
+        async def download_catalog() -> int:
+            async with session_maker() as session:
+                return len((await session.execute(select(Mission))).scalars().all())
+
+        print(f"\n⏱️  Latence médiane sur {args.repeat} exécutions ({engine.dialect.name}, {args.limit} résultats max)")
+        baseline, total = await timed(args.repeat, download_catalog)
+        print(f"   {'catalogue complet (client)':<34}: {baseline * 1000:>8.1f} ms ({total} missions)")
+        for name, filters in QUERIES.items():
+            async def search() -> int:
+                async with session_maker() as session:
+                    return len(await MissionRepository(session).search_missions(**filters, limit=args.limit))
+            latency, count = await timed(args.repeat, search)
+            print(f"   {name:<34}: {latency * 1000:>8.1f} ms ({count} résultats, {baseline / latency:.0f}x)")
+    finally:
+        if path is None:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--missions", type=int, default=100_000, help="Missions dans le catalogue")
+    parser.add_argument("--games", type=int, default=1_000, help="Jeux auxquels rattacher les missions")
+    parser.add_argument("--repeat", type=int, default=10, help="Exécutions par requête")
+    parser.add_argument("--limit", type=int, default=50, help="Résultats par page")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur de catalogue")
+    parser.add_argument("--database-url", default=None, help="URL SQLAlchemy async (SQLite temporaire par défaut)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Importe des missions ou des jeux depuis un fichier NDJSON ou CSV.
+
+Le fichier est lu en flux par blocs et inséré par paquets (``--chunk-size`` lignes), en
+une seule transaction : la mémoire reste constante quelle que soit la taille du fichier.
+Les lignes invalides sont listées à la fin sans interrompre l'import.
+
+Format : une mission (ou un jeu) par ligne ; en CSV, la première ligne est l'en-tête.
+- missions : title, description, difficulty (0-100), type, image_url, game_id,
+  is_known_by_player, is_known_by_others
+- jeux : name, description, game_type_id, image_url, min_players, max_players, tags
+  (liste en NDJSON, séparés par ``|`` en CSV)
+
+Usage:
+    python -m scripts.import_content missions pack.ndjson --game-id <uuid>
+    python -m scripts.import_content missions pack.csv
+    python -m scripts.import_content games jeux.ndjson --chunk-size 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from db.database import async_session_maker, close_db
+from db.unit_of_work import UnitOfWork
+from services.content_import_service import IMPORT_CHUNK_SIZE, ContentImportService
+from utils.streaming import CHUNK_SIZE, iter_lines, parse_records
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    """Lit le fichier par blocs de ``CHUNK_SIZE`` octets, hors de la boucle d'événements."""
+    with path.open("rb") as file:
+        while block := await asyncio.to_thread(file.read, CHUNK_SIZE):
+            yield block
+
+
+async def run(args) -> None:
+    path = Path(args.file)
+    format = args.format or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+    records = parse_records(iter_lines(read_file(path)), format)
+
+    start = time.perf_counter()
+    try:
+        async with async_session_maker() as session, UnitOfWork(session):
+            service = ContentImportService(session, chunk_size=args.chunk_size)
+            if args.kind == "missions":
+                report = await service.import_missions(records, game_id=args.game_id)
+            else:
+                report = await service.import_games(records)
+    finally:
+        await close_db()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {report.imported} {args.kind} importés sur {report.processed} lignes en {elapsed:.1f}s "
+          f"({report.imported / elapsed:,.0f}/s)")
+    if report.failed:
+        print(f"⚠️  {report.failed} lignes en erreur :")
+        for error in report.errors:
+            print(f"   ligne {error.line} : {error.error}")
+        if report.failed > len(report.errors):
+            print(f"   ... et {report.failed - len(report.errors)} autres")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=["missions", "games"], help="Contenu à importer")
+    parser.add_argument("file", help="Fichier NDJSON ou CSV")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None,
+                        help="Format du fichier (déduit de l'extension par défaut)")
+    parser.add_argument("--game-id", type=uuid.UUID, default=None,
+                        help="Jeu des missions qui ne précisent pas de game_id")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE,
+                        help="Lignes validées et insérées par paquet (défaut : %(default)s)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Test de charge du chat des lobbies.
+
+Simule ``--lobbies`` lobbies (1 000 par défaut) de ``--users`` utilisateurs chacun, qui
+envoient au total ``--rate`` messages par seconde et par lobby (100 par défaut), soit
+100 000 messages/s. Le chemin complet d'un message est mesuré en processus (limite de
+débit, tampon circulaire, construction du message, diffusion) avec un serveur Socket.IO
+factice qui compte les émissions sans réseau. ``--persist`` active l'écriture par lots
+dans ``chat_messages`` (SQLite temporaire par défaut).
+
+Usage:
+    python -m scripts.load_chat
+    python -m scripts.load_chat --lobbies 100 --duration 5
+    python -m scripts.load_chat --persist
+    python -m scripts.load_chat --persist --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.database import Base
+from db.unit_of_work import UnitOfWork
+from models import *  # Importer tous les modèles pour que Base.metadata les connaisse
+from models.lobby import LobbyPhase
+from websocket.chat import ChatPersister, LobbyChat
+from websocket.connexion_manager import ConnexionManager, WebSocketUser
+
+
+TICK = 0.01          # le générateur envoie les messages dus toutes les 10 ms
+
+
+class NullSioServer:
+    """Serveur Socket.IO factice : compte les émissions, sans réseau."""
+
+    def __init__(self) -> None:
+        self.emitted = 0
+
+    async def emit(self, event, data, room=None, to=None, **kwargs):
+        self.emitted += 1
+
+    async def enter_room(self, sid, room):
+        pass
+
+    async def leave_room(self, sid, room):
+        pass
+
+    async def save_session(self, sid, session):
+        pass
+
+
+async def populate(session_maker, lobbies: list[str], users: list[WebSocketUser]) -> None:
+    """Crée les utilisateurs et lobbies référencés par ``chat_messages``."""
+    now = datetime.now(timezone.utc)
+    game_type_id, game_id = uuid.uuid4(), uuid.uuid4()
+    async with session_maker() as session, UnitOfWork(session):
+        await session.execute(insert(User.__table__), [
+            {"id": uuid.UUID(user.id), "email": f"{user.username}@example.com", "username": user.username,
+             "hashed_password": "x", "is_active": True, "created_at": now, "updated_at": now}
+            for user in users
+        ])
+        await session.execute(insert(GameType).values(id=game_type_id, name="Mission", description="Load"))
+        await session.execute(insert(Game).values(
+            id=game_id, name="Load", description="Load", game_type_id=game_type_id, created_at=now, updated_at=now,
+        ))
+        await session.execute(insert(Lobby.__table__), [
+            {"id": uuid.UUID(lobby_id), "name": f"Lobby {index}", "code": f"L{index:05d}", "game_id": game_id,
+             "host_id": uuid.UUID(users[0].id), "status": LobbyStatus.RUNNING, "phase": LobbyPhase.ROUND,
+             "min_players": 2, "max_players": 10, "created_at": now, "updated_at": now}
+            for index, lobby_id in enumerate(lobbies)
+        ])
+
+
+async def load(chat: LobbyChat, senders: list[tuple[str, str]], rate: float, duration: float) -> dict:
+    """Envoie ``rate`` messages/s au total (répartis entre les lobbies) pendant ``duration`` secondes."""
+    sent = rejected = 0
+    tick_costs: list[float] = []
+    start = time.perf_counter()
+    cursor = 0
+
+    while (elapsed := time.perf_counter() - start) < duration:
+        # Messages dus depuis le début, tous lobbies confondus (rattrapage si retard)
+        due = int(elapsed * rate)
+        tick_start = time.perf_counter()
+        while sent + rejected < due:
+            sid, lobby_id = senders[cursor]
+            cursor = (cursor + 1) % len(senders)
+            if await chat.post(sid, lobby_id, "gg") is None:
+                rejected += 1
+            else:
+                sent += 1
+        tick_costs.append(time.perf_counter() - tick_start)
+        await asyncio.sleep(max(0.0, TICK - (time.perf_counter() - tick_start)))
+
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed": elapsed,
+        "sent": sent,
+        "rejected": rejected,
+        "tick_p50": statistics.median(tick_costs),
+        "tick_p99": statistics.quantiles(tick_costs, n=100)[98] if len(tick_costs) >= 100 else max(tick_costs),
+    }
+
+
+async def run(args) -> None:
+    users_per_lobby = args.users
+    lobby_ids = [str(uuid.uuid4()) for _ in range(args.lobbies)]
+    users = [
+        WebSocketUser(id=str(uuid.uuid4()), username=f"user{index}")
+        for index in range(args.lobbies * users_per_lobby)
+    ]
+
+    sio = NullSioServer()
+    manager = ConnexionManager(sio)
+    # Ordre d'envoi : un message par lobby à tour de rôle, en alternant les utilisateurs du lobby
+    senders = []
+    for index, user in enumerate(users):
+        sid = f"sid-{index}"
+        await manager.register_connection(sid, user)
+        await manager.join_lobby(sid, lobby_ids[index // users_per_lobby])
+    for turn in range(users_per_lobby):
+        senders.extend(
+            (f"sid-{lobby * users_per_lobby + turn}", lobby_id) for lobby, lobby_id in enumerate(lobby_ids)
+        )
+
+    engine = path = persister = None
+    if args.persist:
+        database_url = args.database_url
+        if database_url is None:
+            path = Path(tempfile.gettempdir()) / f"load_chat_{secrets.token_hex(4)}.db"
+            database_url = f"sqlite+aiosqlite:///{path}"
+        engine = create_async_engine(database_url, echo=False)
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        await populate(session_maker, lobby_ids, users)
+        persister = ChatPersister(session_maker, max_pending=args.rate * args.lobbies * 10)
+        persister.start()
+
+    # Débit par utilisateur juste suffisant pour le débit visé par lobby
+    per_user_rate = args.rate / users_per_lobby
+    chat = LobbyChat(manager, rate=per_user_rate, burst=max(1, int(per_user_rate)), persister=persister)
+
+    target = args.rate * args.lobbies
+    print(f"💬 {args.lobbies} lobbies × {args.rate:g} messages/s ({target:,.0f} messages/s) pendant {args.duration:g}s...")
+    try:
+        result = await load(chat, senders, target, args.duration)
+        if persister is not None:
+            flush_start = time.perf_counter()
+            await persister.stop()
+            flush_time = time.perf_counter() - flush_start
+            async with session_maker() as session:
+                persisted = await session.scalar(select(func.count()).select_from(ChatMessage))
+    finally:
+        if engine is not None:
+            if path is None:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.drop_all)
+            await engine.dispose()
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    achieved = result["sent"] / result["elapsed"]
+    print(f"   messages diffusés   : {result['sent']:>10,} ({achieved:,.0f}/s, {achieved / target:.0%} de la cible)")
+    print(f"   refusés (débit)     : {result['rejected']:>10,}")
+    print(f"   émissions           : {sio.emitted:>10,}")
+    print(f"   coût par tick       : p50 {result['tick_p50'] * 1000:.1f} ms, p99 {result['tick_p99'] * 1000:.1f} ms "
+          f"(tick de {TICK * 1000:.0f} ms)")
+    print(f"   historique mémoire  : {sum(len(chat.history(lobby_id)) for lobby_id in lobby_ids):>10,} messages")
+    if persister is not None:
+        print(f"   persistés           : {persisted:>10,} (vidage final {flush_time:.1f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lobbies", type=int, default=1_000, help="Lobbies simulés")
+    parser.add_argument("--users", type=int, default=10, help="Utilisateurs par lobby")
+    parser.add_argument("--rate", type=float, default=100.0, help="Messages par seconde et par lobby")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de la mesure en secondes")
+    parser.add_argument("--persist", action="store_true", help="Écrire les messages dans chat_messages")
+    parser.add_argument("--database-url", default=None, help="URL SQLAlchemy async (SQLite temporaire par défaut)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Test de charge du serveur de production : débit HTTP de 1 à 8 workers.
+
+Pour chaque nombre de workers (``--workers``), démarre ``python -m server`` sur un port
+libre (SQLite temporaire, migrée avant le lancement, un utilisateur actif), attend qu'il
+réponde, se connecte, puis charge ``--path`` (authentifié) pendant ``--duration``
+secondes depuis ``--clients`` processus clients (``--concurrency`` requêtes en vol
+chacun), et l'arrête (SIGTERM, arrêt gracieux).
+Le rapport donne le débit, la latence p50/p99 et l'accélération par rapport au premier
+palier.
+
+Les clients tournent sur la même machine que le serveur : le passage à l'échelle est
+borné par le nombre de cœurs (``os.cpu_count()``), partagés entre workers et clients.
+
+Usage:
+    python -m scripts.load_server
+    python -m scripts.load_server --workers 1 2 4 8 --duration 10 --clients 4
+    python -m scripts.load_server --path / --json load_server.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.migrations import ensure_schema
+from models import User
+from utils.password_hashing import hash_password
+
+
+USERNAME = "load"
+PASSWORD = "password"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def prepare_database(database_url: str) -> None:
+    """Schéma créé avant le lancement (les workers ne font que vérifier la version), utilisateur actif."""
+    engine = create_async_engine(database_url)
+    try:
+        await ensure_schema(engine)
+        async with engine.begin() as connection:
+            await connection.execute(insert(User).values(
+                username=USERNAME, email=f"{USERNAME}@example.com", hashed_password=hash_password(PASSWORD), is_active=True,
+            ))
+    finally:
+        await engine.dispose()
+
+
+def start_server(workers: int, port: int, env: dict, log) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "server", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--transport", "websocket"],
+        cwd=backend_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"server not ready after {timeout:.0f}s")
+
+
+def login(base_url: str) -> dict:
+    response = httpx.post(f"{base_url}/auth/jwt/login", data={"username": USERNAME, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def stop_server(process: subprocess.Popen, timeout: float) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def _load(url: str, headers: dict, concurrency: int, warmup: float, duration: float) -> tuple[int, int, list[float]]:
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=10.0) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def worker() -> None:
+            nonlocal errors
+            while (now := time.perf_counter()) < stop_at:
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if now >= measure_from:
+                    if ok:
+                        latencies.append(time.perf_counter() - now)
+                    else:
+                        errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(latencies), errors, latencies
+
+
+def client_process(args: tuple[str, dict, int, float, float]) -> tuple[int, int, list[float]]:
+    return asyncio.run(_load(*args))
+
+
+def measure(workers: int, args, env: dict, log) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(workers, port, env, log)
+    try:
+        wait_ready(f"{base_url}/", process)
+        headers = login(base_url)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(
+                client_process, [(f"{base_url}{args.path}", headers, args.concurrency, args.warmup, args.duration)] * args.clients,
+            )
+    finally:
+        stop_server(process, timeout=15.0)
+
+    requests = sum(count for count, _, _ in results)
+    latencies = sorted(latency for _, _, sample in results for latency in sample)
+    return {
+        "workers": workers,
+        "requests": requests,
+        "errors": sum(errors for _, errors, _ in results),
+        "rps": round(requests / args.duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else None,
+    }
+
+
+def run(args) -> list[dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{Path(tmp) / 'load_server.db'}"
+        asyncio.run(prepare_database(database_url))
+        env = {**os.environ, "DATABASE_URL": database_url, "LOG_LEVEL": "WARNING", "DB_AUTO_MIGRATE": "false"}
+
+        print(f"🖥️  {os.cpu_count()} CPU · {args.clients} processus clients × {args.concurrency} requêtes en vol · "
+              f"GET {args.path} · {args.duration:.0f}s par palier")
+        print(f"{'workers':>8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'erreurs':>8} {'accél.':>7}")
+        rows = []
+        with open(Path(tmp) / "server.log", "wb") as log:
+            for workers in args.workers:
+                row = measure(workers, args, env, log)
+                row["speedup"] = round(row["rps"] / rows[0]["rps"], 2) if rows and rows[0]["rps"] else 1.0
+                rows.append(row)
+                print(f"{row['workers']:>8} {row['rps']:>10.0f} {row['p50_ms'] or 0:>9.2f} {row['p99_ms'] or 0:>9.2f} "
+                      f"{row['errors']:>8} {row['speedup']:>6.2f}x")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Paliers (défaut : %(default)s)")
+    parser.add_argument("--path", default="/api/games", help="Route chargée (défaut : %(default)s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Secondes mesurées par palier (défaut : %(default)s)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Secondes de chauffe non mesurées (défaut : %(default)s)")
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1, help="Processus clients (défaut : nombre de CPU)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requêtes en vol par client (défaut : %(default)s)")
+    parser.add_argument("--json", default=None, help="Écrire le rapport dans ce fichier JSON")
+    args = parser.parse_args()
+    rows = run(args)
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2) + "\n")
+        print(f"💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
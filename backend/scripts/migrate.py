@@ -0,0 +1,59 @@
+"""
+Applique les migrations du schéma (ou affiche leur état).
+
+À lancer comme étape de déploiement, avant les workers, quand ``DB_AUTO_MIGRATE=false`` :
+les workers se contentent alors de vérifier la version au démarrage. Sans risque en
+parallèle : les migrations tournent sous un verrou consultatif PostgreSQL.
+
+Usage:
+    python -m scripts.migrate
+    python -m scripts.migrate --status
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from db.database import close_db, get_engine
+from db.migrations import LATEST_VERSION, MIGRATIONS, current_version, migrate
+
+
+async def run(args) -> None:
+    engine = get_engine()
+    try:
+        async with engine.connect() as connection:
+            version = await current_version(connection)
+        pending = [migration for migration in MIGRATIONS if migration.version > version]
+
+        print(f"📋 Schéma en version {version} (code : {LATEST_VERSION})")
+        if args.status:
+            for migration in pending:
+                print(f"   ⏳ {migration.version:04d} {migration.description}")
+            return
+        if not pending:
+            print("✅ Rien à migrer")
+            return
+
+        start = time.perf_counter()
+        applied = await migrate(engine)
+        for migration in applied:
+            print(f"   ✅ {migration.version:04d} {migration.description}")
+        print(f"✅ {len(applied)} migration(s) appliquée(s) en {time.perf_counter() - start:.2f}s")
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="Afficher la version et les migrations en attente")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Profil du démarrage à froid : temps d'import de l'application, module par module.
+
+Mesure ``import main`` dans des processus neufs (``--runs``) : médiane du temps d'import
+réel (horloge, sans instrumentation), puis détail ``python -X importtime`` des modules
+les plus coûteux : temps cumulé (module et ses dépendances) et temps propre agrégé par
+paquet de premier niveau. ``-X importtime`` ralentit l'import : le détail sert à classer
+les modules, le temps réel à comparer avant/après.
+
+Usage:
+    python -m scripts.profile_startup
+    python -m scripts.profile_startup --runs 10 --top 30
+    python -m scripts.profile_startup --module websocket.socket_server --json startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Lignes ``-X importtime`` : (module, profondeur, temps propre µs, temps cumulé µs)."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        [sys.executable, *args], cwd=backend_dir, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        sys.exit(f"❌ {' '.join(args)} a échoué :\n{result.stderr[-2000:]}")
+    return result
+
+
+def import_seconds(module: str) -> float:
+    """Temps réel de ``import module`` dans un processus neuf (démarrage de Python exclu)."""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return float(_python("-c", code).stdout.strip().splitlines()[-1])
+
+
+def profile_once(module: str) -> list[tuple[str, int, int, int]]:
+    return parse_importtime(_python("-X", "importtime", "-c", f"import {module}").stderr)
+
+
+def run(args) -> dict:
+    totals = [import_seconds(args.module) * 1000 for _ in range(args.runs)]
+    runs = [profile_once(args.module) for _ in range(args.runs)]
+
+    # Médiane par module sur les exécutions, pour lisser le bruit
+    cumulative: dict[str, list[int]] = defaultdict(list)
+    by_package: dict[str, list[float]] = defaultdict(lambda: [0.0] * len(runs))
+    for index, entries in enumerate(runs):
+        for module, _, self_us, cumulative_us in entries:
+            cumulative[module].append(cumulative_us)
+            by_package[module.split(".")[0]][index] += self_us / 1000
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "total_ms": round(statistics.median(totals), 1),
+        "modules": len(runs[0]),
+        "top_cumulative_ms": {
+            module: round(statistics.median(values) / 1000, 1)
+            for module, values in sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))[:args.top]
+        },
+        "top_packages_ms": {
+            package: round(statistics.median(values), 1)
+            for package, values in sorted(by_package.items(), key=lambda item: -statistics.median(item[1]))[:args.top]
+        },
+    }
+
+    print(f"⏱️  import {args.module} : {report['total_ms']:.0f} ms (médiane de {args.runs}), {report['modules']} modules")
+    print(f"\n📦 Temps cumulé (module + dépendances), {args.top} premiers")
+    for module, ms in report["top_cumulative_ms"].items():
+        print(f"   {ms:>8.1f} ms  {module}")
+    print("\n📦 Temps propre par paquet")
+    for package, ms in report["top_packages_ms"].items():
+        print(f"   {ms:>8.1f} ms  {package}")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module à importer (défaut : %(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="Processus mesurés (défaut : %(default)s)")
+    parser.add_argument("--top", type=int, default=20, help="Lignes par tableau (défaut : %(default)s)")
+    parser.add_argument("--json", default=None, help="Écrire le rapport dans ce fichier JSON")
+    args = parser.parse_args()
+    report = run(args)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\n💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
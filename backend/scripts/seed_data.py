@@ -0,0 +1,453 @@
+"""
+Génère un jeu de données synthétique et déterministe pour les benchmarks.
+
+Utilisateurs, types de jeux, tags, jeux, missions, lobbies, joueurs, manches et missions
+assignées, avec des cardinalités configurables. La popularité des utilisateurs, des jeux
+et des tags suit une loi de Zipf (``--skew``, 0 = uniforme) : quelques jeux concentrent
+la plupart des lobbies, quelques utilisateurs la plupart des parties.
+
+Même graine et mêmes options = mêmes lignes, identifiants compris : un identifiant est
+dérivé du type de ligne et de son rang (``seed_id``), ce qui évite aussi de garder les
+identifiants en mémoire. Chaque table a son propre générateur aléatoire : changer le
+nombre de lobbies ne change pas les utilisateurs.
+
+Les lignes sont générées en flux et insérées par paquets de ``--chunk-size`` (``COPY``
+avec asyncpg, INSERT multi-lignes sinon), un paquet par transaction.
+
+Usage:
+    python -m scripts.seed_data --reset
+    python -m scripts.seed_data --reset --users 1000000 --lobbies 250000 --assignments-per-player 5
+    python -m scripts.seed_data --reset --database-url sqlite+aiosqlite:///seed.db --users 1000 --lobbies 500
+"""
+
+import argparse
+import asyncio
+import enum
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Ajouter le répertoire parent au path pour les imports
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.database import Base
+from db.unit_of_work import UnitOfWork
+from models import *  # Importer tous les modèles pour que Base.metadata les connaisse
+from models.game import GameTag
+from models.lobby import LobbyPhase
+from models.mission import MissionType
+from repositories.lobby_repository import LOBBY_CODE_ALPHABET, LOBBY_CODE_LENGTH
+
+
+CHUNK_SIZE = 10_000
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 365 * 24 * 3600
+
+# Hash argon2 de "password", calculé une fois : hacher un million de mots de passe
+# prendrait des heures, et un sel aléatoire casserait le déterminisme.
+PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$2DC5NfrKI8oUILryPFe/Cg$9Sf5nT1pQ4Thi4yeHnNHvPiq/etX37dUnshSYVPyLw0"
+
+GAME_TYPES = [
+    ("Missions secrètes", "Chaque joueur reçoit des missions à accomplir discrètement"),
+    ("Rôles cachés", "Chaque joueur incarne un rôle que les autres doivent deviner"),
+    ("Hybride", "Missions et rôles mélangés"),
+]
+VERBS = ["Cacher", "Échanger", "Chanter", "Voler", "Imiter", "Dessiner", "Porter", "Compter", "Siffler", "Placer"]
+OBJECTS = ["un verre", "une fourchette", "un chapeau", "un livre", "un téléphone", "une clé", "une bougie", "une carte"]
+
+Row = Tuple
+Chunk = Tuple[Table, Sequence[str], List[Row]]
+
+
+class Kind(enum.IntEnum):
+    USER = 1
+    GAME_TYPE = 2
+    TAG = 3
+    GAME = 4
+    MISSION = 5
+    LOBBY = 6
+    PLAYER = 7
+    ROUND = 8
+    ASSIGNMENT = 9
+
+
+_ID_PREFIX = 0x5EED << 112
+
+
+def seed_id(kind: Kind, index: int) -> uuid.UUID:
+    """Identifiant stable de la ``index``-ième ligne de type ``kind`` (préfixe ``5eed``)."""
+    return uuid.UUID(int=_ID_PREFIX | kind << 64 | index)
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    users: int = 10_000
+    tags: int = 50
+    games: int = 500
+    missions: int = 50_000
+    lobbies: int = 20_000
+    min_players: int = 4
+    max_players: int = 10
+    rounds_per_lobby: int = 3
+    assignments_per_player: int = 3
+    skew: float = 1.1
+    seed: int = 42
+
+    def rng(self, table: str) -> random.Random:
+        # Une graine chaîne est hachée (SHA-512) : stable d'une exécution à l'autre
+        return random.Random(f"{self.seed}:{table}")
+
+
+class Skewed:
+    """Tire des rangs 0..n-1 selon une loi de Zipf d'exposant ``skew`` (uniforme si 0)."""
+
+    def __init__(self, n: int, skew: float, rng: random.Random):
+        self.n = n
+        self.rng = rng
+        self.population = range(n)
+        self.cum_weights = list(accumulate((rank + 1) ** -skew for rank in range(n))) if skew else None
+
+    def one(self) -> int:
+        if self.cum_weights is None:
+            return self.rng.randrange(self.n)
+        return self.rng.choices(self.population, cum_weights=self.cum_weights)[0]
+
+    def distinct(self, k: int) -> List[int]:
+        """``k`` rangs distincts (au plus ``n``)."""
+        k = min(k, self.n)
+        picked: dict[int, None] = {}
+        while len(picked) < k:
+            picked[self.one()] = None
+        return list(picked)
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+
+def _lobby_code(index: int) -> str:
+    """Code d'invitation unique : le rang écrit dans l'alphabet des codes."""
+    base = len(LOBBY_CODE_ALPHABET)
+    digits = []
+    for _ in range(LOBBY_CODE_LENGTH):
+        index, digit = divmod(index, base)
+        digits.append(LOBBY_CODE_ALPHABET[digit])
+    return "".join(reversed(digits))
+
+
+def _missions_of_game(config: SeedConfig, game: int) -> int:
+    """Les missions sont réparties en tourniquet : la mission ``j`` appartient au jeu ``j % games``."""
+    return max(0, (config.missions - game + config.games - 1) // config.games)
+
+
+USER_COLUMNS = ("id", "email", "username", "hashed_password", "is_active", "is_superuser", "created_at", "updated_at")
+
+
+def user_rows(config: SeedConfig) -> Iterator[Row]:
+    rng = config.rng("users")
+    for index in range(config.users):
+        created_at = _timestamp(rng)
+        yield (
+            seed_id(Kind.USER, index), f"user{index}@seed.test", f"user{index}", PASSWORD_HASH,
+            rng.random() > 0.02, False, created_at, created_at,
+        )
+
+
+GAME_TYPE_COLUMNS = ("id", "name", "description")
+TAG_COLUMNS = ("id", "name")
+GAME_COLUMNS = (
+    "id", "name", "description", "image_url", "min_players", "max_players", "created_at", "updated_at", "game_type_id",
+)
+GAME_TAG_COLUMNS = ("game_id", "tag_id")
+
+
+def game_type_rows(config: SeedConfig) -> Iterator[Row]:
+    for index, (name, description) in enumerate(GAME_TYPES):
+        yield seed_id(Kind.GAME_TYPE, index), name, description
+
+
+def tag_rows(config: SeedConfig) -> Iterator[Row]:
+    for index in range(config.tags):
+        yield seed_id(Kind.TAG, index), f"tag-{index:04d}"
+
+
+def game_rows(config: SeedConfig) -> Iterator[Tuple[Row, List[Row]]]:
+    """Chaque jeu et ses lignes ``game_tags`` (1 à 4 tags, les plus populaires plus souvent)."""
+    rng = config.rng("games")
+    tags = Skewed(config.tags, config.skew, rng)
+    for index in range(config.games):
+        game_id = seed_id(Kind.GAME, index)
+        created_at = _timestamp(rng)
+        min_players = rng.randint(2, 4)
+        game = (
+            game_id, f"Jeu {index}", f"Jeu de bench n°{index}", None, min_players, rng.randint(min_players + 2, 12),
+            created_at, created_at, seed_id(Kind.GAME_TYPE, index % len(GAME_TYPES)),
+        )
+        yield game, [(game_id, seed_id(Kind.TAG, tag)) for tag in tags.distinct(rng.randint(1, 4))]
+
+
+MISSION_COLUMNS = (
+    "id", "game_id", "title", "created_by", "type", "description", "image_url", "difficulty",
+    "is_known_by_player", "is_known_by_others",
+)
+
+
+def mission_rows(config: SeedConfig) -> Iterator[Row]:
+    rng = config.rng("missions")
+    types = [MissionType.MISSION] * 7 + [MissionType.ROLE] * 2 + [MissionType.HYBRID]
+    for index in range(config.missions):
+        mission_type = rng.choice(types)
+        title = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+        yield (
+            seed_id(Kind.MISSION, index), seed_id(Kind.GAME, index % config.games), title, None, mission_type,
+            f"{title} sans se faire remarquer (n°{index})", None, rng.randint(0, 100),
+            mission_type != MissionType.ROLE or rng.random() > 0.5, mission_type == MissionType.ROLE,
+        )
+
+
+LOBBY_COLUMNS = (
+    "id", "name", "code", "game_id", "host_id", "status", "phase", "min_players", "max_players",
+    "created_at", "updated_at",
+)
+PLAYER_COLUMNS = ("id", "lobby_id", "user_id", "score", "status", "joined_at", "left_at")
+ROUND_COLUMNS = ("id", "lobby_id", "round_number", "status", "started_at", "ended_at")
+ASSIGNMENT_COLUMNS = ("id", "player_id", "mission_id", "status", "assigned_at", "completed_at")
+
+LOBBY_STATUSES = [LobbyStatus.ENDED] * 14 + [LobbyStatus.WAITING] * 3 + [LobbyStatus.RUNNING] * 2 + [LobbyStatus.PAUSED]
+
+
+def lobby_rows(config: SeedConfig) -> Iterator[Tuple[Table, Row]]:
+    """
+    Lobbies et leurs joueurs, manches et missions assignées, dans l'ordre des clés étrangères.
+
+    70 % des lobbies sont terminés (manches finies, missions réussies ou ratées), les
+    autres en attente (ni manche ni mission) ou en cours (dernière manche et missions actives).
+    """
+    rng = config.rng("lobbies")
+    users = Skewed(config.users, config.skew, rng)
+    games = Skewed(config.games, config.skew, rng)
+    player_index = round_index = assignment_index = 0
+    for index in range(config.lobbies):
+        lobby_id = seed_id(Kind.LOBBY, index)
+        game = games.one()
+        status = rng.choice(LOBBY_STATUSES)
+        players = users.distinct(rng.randint(config.min_players, config.max_players))
+        created_at = _timestamp(rng)
+        phase = LobbyPhase.NONE if status in (LobbyStatus.WAITING, LobbyStatus.ENDED) else LobbyPhase.ROUND
+        yield Lobby.__table__, (
+            lobby_id, f"Lobby {index}", _lobby_code(index), seed_id(Kind.GAME, game), seed_id(Kind.USER, players[0]),
+            status, phase, config.min_players, config.max_players, created_at, created_at,
+        )
+
+        rounds = 0 if status == LobbyStatus.WAITING else config.rounds_per_lobby
+        if status in (LobbyStatus.RUNNING, LobbyStatus.PAUSED):
+            rounds = rng.randint(1, config.rounds_per_lobby)
+        for number in range(1, rounds + 1):
+            started_at = created_at + timedelta(minutes=10 * number)
+            finished = status == LobbyStatus.ENDED or number < rounds
+            yield Round.__table__, (
+                seed_id(Kind.ROUND, round_index), lobby_id, number,
+                RoundStatus.FINISHED if finished else RoundStatus.RUNNING,
+                started_at, started_at + timedelta(minutes=10) if finished else None,
+            )
+            round_index += 1
+
+        missions = _missions_of_game(config, game)
+        for user in players:
+            player_id = seed_id(Kind.PLAYER, player_index)
+            player_index += 1
+            if status == LobbyStatus.ENDED:
+                player_status, score = PlayerStatus.COMPLETED, rng.randint(0, 100)
+            elif status == LobbyStatus.WAITING:
+                player_status, score = PlayerStatus.WAITING, 0
+            else:
+                player_status, score = PlayerStatus.PLAYING, rng.randint(0, 50)
+            yield Player.__table__, (player_id, lobby_id, seed_id(Kind.USER, user), score, player_status, created_at, None)
+
+            if status == LobbyStatus.WAITING or not missions:
+                continue
+            for _ in range(config.assignments_per_player):
+                mission = game + config.games * rng.randrange(missions)
+                assigned_at = created_at + timedelta(minutes=rng.randrange(10 * rounds + 1))
+                if status == LobbyStatus.ENDED:
+                    assignment_status = MissionAssignedStatus.COMPLETED if rng.random() < 0.6 else MissionAssignedStatus.FAILED
+                    completed_at = assigned_at + timedelta(minutes=rng.randint(1, 10))
+                else:
+                    assignment_status, completed_at = MissionAssignedStatus.ACTIVE, None
+                yield MissionAssigned.__table__, (
+                    seed_id(Kind.ASSIGNMENT, assignment_index), player_id, seed_id(Kind.MISSION, mission),
+                    assignment_status, assigned_at, completed_at,
+                )
+                assignment_index += 1
+
+
+LOBBY_TABLES = {
+    Lobby.__table__: LOBBY_COLUMNS,
+    Round.__table__: ROUND_COLUMNS,
+    Player.__table__: PLAYER_COLUMNS,
+    MissionAssigned.__table__: ASSIGNMENT_COLUMNS,
+}
+
+
+class BulkWriter:
+    """Insère des paquets de lignes, un paquet par transaction : ``COPY`` (asyncpg) ou INSERT multi-lignes."""
+
+    def __init__(self, session_maker: async_sessionmaker, chunk_size: int = CHUNK_SIZE):
+        self.session_maker = session_maker
+        self.chunk_size = chunk_size
+        self.counts: dict[str, int] = {}
+
+    async def write(self, table: Table, columns: Sequence[str], rows: Iterable[Row]) -> None:
+        chunk: List[Row] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                await self.flush([(table, columns, chunk)])
+                chunk = []
+        await self.flush([(table, columns, chunk)])
+
+    async def flush(self, chunks: Sequence[Chunk]) -> None:
+        """Insère plusieurs paquets dans la même transaction, dans l'ordre donné (parents d'abord)."""
+        async with self.session_maker() as session, UnitOfWork(session):
+            connection = await session.connection()
+            for table, columns, rows in chunks:
+                if not rows:
+                    continue
+                if connection.dialect.driver == "asyncpg":
+                    raw = await connection.get_raw_connection()
+                    await raw.driver_connection.copy_records_to_table(
+                        table.name,
+                        columns=list(columns),
+                        # Les enums sont stockés par nom dans le type PostgreSQL
+                        records=[
+                            tuple(value.name if isinstance(value, enum.Enum) else value for value in row)
+                            for row in rows
+                        ],
+                    )
+                else:
+                    await session.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+                self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+
+async def seed(session_maker: async_sessionmaker, config: SeedConfig, chunk_size: int = CHUNK_SIZE,
+               progress: bool = False) -> dict[str, int]:
+    """Insère tout le jeu de données ; renvoie le nombre de lignes par table."""
+    writer = BulkWriter(session_maker, chunk_size)
+
+    def report(table: str) -> None:
+        if progress:
+            print(f"   {table:<18} {writer.counts.get(table, 0):>12,}")
+
+    await writer.write(User.__table__, USER_COLUMNS, user_rows(config))
+    report("users")
+    await writer.write(GameType.__table__, GAME_TYPE_COLUMNS, game_type_rows(config))
+    await writer.write(Tag.__table__, TAG_COLUMNS, tag_rows(config))
+
+    games: List[Row] = []
+    game_tags: List[Row] = []
+    for game, tags in game_rows(config):
+        games.append(game)
+        game_tags.extend(tags)
+        if len(games) >= chunk_size:
+            await writer.flush([(Game.__table__, GAME_COLUMNS, games), (GameTag, GAME_TAG_COLUMNS, game_tags)])
+            games, game_tags = [], []
+    await writer.flush([(Game.__table__, GAME_COLUMNS, games), (GameTag, GAME_TAG_COLUMNS, game_tags)])
+    report("games")
+
+    await writer.write(Mission.__table__, MISSION_COLUMNS, mission_rows(config))
+    report("missions")
+
+    # Les tampons sont vidés dans l'ordre des clés étrangères : un lobby ou un joueur est
+    # toujours écrit avant (ou avec) les lignes qui le référencent.
+    buffers: dict[Table, List[Row]] = {table: [] for table in LOBBY_TABLES}
+    pending = 0
+    for table, row in lobby_rows(config):
+        buffers[table].append(row)
+        pending += 1
+        if pending >= chunk_size:
+            await writer.flush([(table, LOBBY_TABLES[table], rows) for table, rows in buffers.items()])
+            buffers = {table: [] for table in LOBBY_TABLES}
+            pending = 0
+            if progress:
+                print(f"   {'lobbies':<18} {writer.counts['lobbies']:>12,} / {config.lobbies:,}", end="\r")
+    await writer.flush([(table, LOBBY_TABLES[table], rows) for table, rows in buffers.items()])
+    report("lobbies")
+    return writer.counts
+
+
+async def run(args) -> None:
+    database_url = args.database_url
+    if database_url is None:
+        from core.config import settings
+        database_url = settings.get_database_url()
+
+    config = SeedConfig(
+        users=args.users, tags=args.tags, games=args.games, missions=args.missions, lobbies=args.lobbies,
+        min_players=args.min_players, max_players=args.max_players, rounds_per_lobby=args.rounds_per_lobby,
+        assignments_per_player=args.assignments_per_player, skew=args.skew, seed=args.seed,
+    )
+    engine = create_async_engine(database_url, echo=False)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        if args.reset:
+            print("🔄 Recréation des tables...")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+
+        print(f"🌱 Génération (graine {config.seed}, skew {config.skew}, {engine.dialect.name})...")
+        start = time.perf_counter()
+        counts = await seed(session_maker, config, args.chunk_size, progress=True)
+        elapsed = time.perf_counter() - start
+
+        if engine.dialect.name == "postgresql":
+            print("📊 ANALYZE...")
+            async with engine.connect() as conn:
+                await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.exec_driver_sql("ANALYZE")
+
+        total = sum(counts.values())
+        print(f"\n✅ {total:,} lignes en {elapsed:.1f}s ({total / elapsed:,.0f} lignes/s)")
+        for table, count in counts.items():
+            print(f"   {table:<18} {count:>12,}")
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=defaults.users, help="Utilisateurs (défaut : %(default)s)")
+    parser.add_argument("--tags", type=int, default=defaults.tags, help="Tags (défaut : %(default)s)")
+    parser.add_argument("--games", type=int, default=defaults.games, help="Jeux (défaut : %(default)s)")
+    parser.add_argument("--missions", type=int, default=defaults.missions,
+                        help="Missions, réparties sur tous les jeux (défaut : %(default)s)")
+    parser.add_argument("--lobbies", type=int, default=defaults.lobbies, help="Lobbies (défaut : %(default)s)")
+    parser.add_argument("--min-players", type=int, default=defaults.min_players, help="Joueurs par lobby, minimum")
+    parser.add_argument("--max-players", type=int, default=defaults.max_players, help="Joueurs par lobby, maximum")
+    parser.add_argument("--rounds-per-lobby", type=int, default=defaults.rounds_per_lobby,
+                        help="Manches d'un lobby terminé (défaut : %(default)s)")
+    parser.add_argument("--assignments-per-player", type=int, default=defaults.assignments_per_player,
+                        help="Missions assignées par joueur d'une partie lancée (défaut : %(default)s)")
+    parser.add_argument("--skew", type=float, default=defaults.skew,
+                        help="Exposant de Zipf de la popularité des utilisateurs, jeux et tags ; 0 = uniforme")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Graine (défaut : %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="Lignes insérées par transaction (défaut : %(default)s)")
+    parser.add_argument("--reset", action="store_true", help="Supprime et recrée les tables avant de générer")
+    parser.add_argument("--database-url", default=None, help="URL SQLAlchemy async (base de .env par défaut)")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
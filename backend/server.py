@@ -0,0 +1,108 @@
+"""
+Lanceur de production : uvicorn multi-workers (uvloop, httptools), arrêt gracieux.
+
+``main.py`` reste le lanceur de développement (un processus, rechargement). Ici, chaque
+worker est un processus qui importe ``main:app`` ; le noyau répartit les connexions entre
+eux, sans affinité. Pour Socket.IO, cela impose :
+
+- ``--transport websocket`` (pas de long-polling : une connexion reste sur son worker),
+  ou ``--sticky`` derrière un répartiteur à sessions collantes ;
+- ``--message-queue redis://…`` pour qu'un événement émis vers un lobby atteigne les
+  sockets des autres workers.
+
+Usage:
+    python -m server
+    python -m server --workers 4 --transport websocket --message-queue redis://localhost:6379/0
+    python -m server --workers 4 --sticky --port 8001
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+import uvicorn
+
+from core.config import settings
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def check_socketio(workers: int, transports: list[str], message_queue: str | None, sticky: bool) -> tuple[list[str], list[str]]:
+    """(erreurs, avertissements) de la configuration Socket.IO pour ``workers`` processus."""
+    errors, warnings = [], []
+    if workers <= 1:
+        return errors, warnings
+    if "polling" in transports and not sticky:
+        errors.append(
+            "Socket.IO long-polling needs sticky sessions with several workers: "
+            "use --transport websocket, or --sticky behind a sticky load balancer"
+        )
+    if not message_queue:
+        warnings.append(
+            "No --message-queue: Socket.IO events only reach clients connected to the same worker"
+        )
+    return errors, warnings
+
+
+def build_config(args) -> dict:
+    """Paramètres ``uvicorn.run`` du serveur de production."""
+    return {
+        "app": "main:app",
+        "host": args.host,
+        "port": args.port,
+        "workers": args.workers,
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+        "lifespan": "on",
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.timeout_keep_alive,
+        "timeout_graceful_shutdown": args.timeout_graceful_shutdown,
+        "proxy_headers": True,
+        "forwarded_allow_ips": args.forwarded_allow_ips,
+        "access_log": args.access_log,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, default=settings.API_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS,
+                        help="Processus uvicorn (défaut : SERVER_WORKERS = %(default)s)")
+    parser.add_argument("--transport", choices=["websocket", "polling,websocket"], default=settings.SOCKETIO_TRANSPORTS,
+                        help="Transports Socket.IO acceptés (défaut : SOCKETIO_TRANSPORTS = %(default)s)")
+    parser.add_argument("--sticky", action="store_true",
+                        help="Derrière un répartiteur à sessions collantes : long-polling autorisé avec plusieurs workers")
+    parser.add_argument("--message-queue", default=settings.SOCKETIO_MESSAGE_QUEUE,
+                        help="File partagée entre workers, ex: redis://localhost:6379/0 (défaut : SOCKETIO_MESSAGE_QUEUE)")
+    parser.add_argument("--timeout-keep-alive", type=int, default=settings.SERVER_TIMEOUT_KEEP_ALIVE)
+    parser.add_argument("--timeout-graceful-shutdown", type=int, default=settings.SERVER_TIMEOUT_GRACEFUL_SHUTDOWN)
+    parser.add_argument("--backlog", type=int, default=2048, help="File d'attente des connexions TCP")
+    parser.add_argument("--forwarded-allow-ips", default="127.0.0.1",
+                        help="Proxys dont les en-têtes X-Forwarded-* sont pris en compte")
+    parser.add_argument("--access-log", action="store_true", help="Journal d'accès uvicorn (désactivé par défaut)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    transports = [transport.strip() for transport in args.transport.split(",")]
+    errors, warnings = check_socketio(args.workers, transports, args.message_queue, args.sticky)
+    for warning in warnings:
+        print(f"⚠️  {warning}", file=sys.stderr)
+    if errors:
+        sys.exit("❌ " + "\n❌ ".join(errors))
+
+    # Les workers relisent la configuration dans leur environnement (processus neufs)
+    os.environ["SOCKETIO_TRANSPORTS"] = args.transport
+    if args.message_queue:
+        os.environ["SOCKETIO_MESSAGE_QUEUE"] = args.message_queue
+
+    uvicorn.run(**build_config(args))
+
+
+if __name__ == "__main__":
+    main()
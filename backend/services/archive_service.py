@@ -0,0 +1,293 @@
+"""
+Service d'archivage des parties terminées
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import exists, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import GameArchive, Lobby, LobbyStatus, MissionAssigned, MissionAssignedStatus, Player, PlayerStatus, Round
+from repositories.user_stats_repository import UserStatsRepository
+from utils.normalize_datetime import normalize_datetime
+
+
+# Version du format de ``game_archive.payload``
+PAYLOAD_VERSION = 1
+EXPORT_BATCH_SIZE = 500
+# Lobbies archivés par lot par ``archive_pending``
+ARCHIVE_BATCH_SIZE = 500
+
+
+class ArchivedPlayer:
+    """Joueur d'une partie archivée (disposition fixe, sérialisée en tableau positionnel)"""
+
+    __slots__ = ("user_id", "score", "status", "missions")
+
+    def __init__(self, user_id: str, score: int, status: str, missions: List[List[str]]):
+        self.user_id = user_id
+        self.score = score
+        self.status = status
+        self.missions = missions  # [[mission_id, status], ...]
+
+    def pack(self) -> list:
+        return [self.user_id, self.score, self.status, self.missions]
+
+    @classmethod
+    def unpack(cls, data: list) -> "ArchivedPlayer":
+        return cls(*data)
+
+    @property
+    def missions_completed(self) -> int:
+        return sum(1 for _, status in self.missions if status == MissionAssignedStatus.COMPLETED.value)
+
+    def to_dict(self) -> dict:
+        return {
+            "user_id": self.user_id,
+            "score": self.score,
+            "status": self.status,
+            "missions": [{"mission_id": mission_id, "status": status} for mission_id, status in self.missions],
+        }
+
+
+class ArchivedGame:
+    """
+    Partie archivée : une ligne ``game_archive``.
+
+    Les colonnes filtrables (jeu, dates, compteurs) sont des colonnes SQL ; les joueurs et
+    leurs missions sont empaquetés en tableaux positionnels dans ``payload``, sans répéter
+    les noms de clés pour chaque joueur.
+    """
+
+    __slots__ = ("id", "game_id", "host_id", "lobby_name", "created_at", "ended_at", "round_count", "players")
+
+    CSV_HEADER = (
+        "archive_id", "game_id", "lobby_name", "ended_at", "round_count",
+        "user_id", "score", "status", "missions_completed", "missions_assigned",
+    )
+
+    def __init__(
+        self,
+        id: UUID,
+        game_id: UUID,
+        host_id: UUID,
+        lobby_name: str,
+        created_at: datetime,
+        ended_at: datetime,
+        round_count: int,
+        players: List[ArchivedPlayer],
+    ):
+        self.id = id
+        self.game_id = game_id
+        self.host_id = host_id
+        self.lobby_name = lobby_name
+        self.created_at = created_at
+        self.ended_at = ended_at
+        self.round_count = round_count
+        self.players = players
+
+    def to_row(self) -> dict:
+        """Valeurs d'insertion dans ``game_archive``"""
+        return {
+            "id": self.id,
+            "game_id": self.game_id,
+            "host_id": self.host_id,
+            "lobby_name": self.lobby_name,
+            "player_count": len(self.players),
+            "round_count": self.round_count,
+            "created_at": self.created_at,
+            "ended_at": self.ended_at,
+            "payload": {"v": PAYLOAD_VERSION, "players": [player.pack() for player in self.players]},
+        }
+
+    @classmethod
+    def from_row(cls, row) -> "ArchivedGame":
+        return cls(
+            id=row.id,
+            game_id=row.game_id,
+            host_id=row.host_id,
+            lobby_name=row.lobby_name,
+            created_at=row.created_at,
+            ended_at=row.ended_at,
+            round_count=row.round_count,
+            players=[ArchivedPlayer.unpack(data) for data in row.payload["players"]],
+        )
+
+    @property
+    def winners(self) -> List[ArchivedPlayer]:
+        """Joueurs restants ayant le meilleur score (non nul) ; ex aequo tous gagnants"""
+        remaining = [player for player in self.players if player.status != PlayerStatus.LEFT.value]
+        best = max((player.score for player in remaining), default=0)
+        return [player for player in remaining if best > 0 and player.score == best]
+
+    def to_dict(self) -> dict:
+        """Représentation NDJSON (une partie par ligne)"""
+        return {
+            "id": str(self.id),
+            "game_id": str(self.game_id),
+            "host_id": str(self.host_id),
+            "lobby_name": self.lobby_name,
+            "created_at": normalize_datetime(self.created_at).isoformat(),
+            "ended_at": normalize_datetime(self.ended_at).isoformat(),
+            "round_count": self.round_count,
+            "players": [player.to_dict() for player in self.players],
+        }
+
+    def csv_rows(self) -> List[tuple]:
+        """Représentation CSV : une ligne par joueur"""
+        return [
+            (
+                self.id, self.game_id, self.lobby_name, normalize_datetime(self.ended_at).isoformat(), self.round_count,
+                player.user_id, player.score, player.status, player.missions_completed, len(player.missions),
+            )
+            for player in self.players
+        ]
+
+
+_ARCHIVE_COLUMNS = (
+    GameArchive.id, GameArchive.game_id, GameArchive.host_id, GameArchive.lobby_name,
+    GameArchive.created_at, GameArchive.ended_at, GameArchive.round_count, GameArchive.payload,
+)
+
+
+def user_stats_rows(archives: Iterable[ArchivedGame]) -> List[dict]:
+    """Agrège des parties archivées en incréments ``user_stats`` (une ligne par utilisateur)"""
+    stats: Dict[str, dict] = {}
+    for archive in archives:
+        winners = {player.user_id for player in archive.winners}
+        for player in archive.players:
+            row = stats.get(player.user_id)
+            if row is None:
+                row = stats[player.user_id] = {
+                    "user_id": UUID(player.user_id), "games_played": 0, "games_won": 0,
+                    "missions_assigned": 0, "missions_completed": 0, "total_score": 0,
+                    "last_game_at": archive.ended_at,
+                }
+            row["games_played"] += 1
+            row["games_won"] += player.user_id in winners
+            row["missions_assigned"] += len(player.missions)
+            row["missions_completed"] += player.missions_completed
+            row["total_score"] += player.score
+            row["last_game_at"] = max(row["last_game_at"], archive.ended_at)
+    return list(stats.values())
+
+
+class ArchiveService:
+    """Compacte les lobbies terminés en une ligne ``game_archive`` chacun"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def archive_lobbies(self, lobby_ids: List[UUID]) -> int:
+        """
+        Archive les lobbies donnés (ceux déjà archivés sont ignorés).
+
+        Quatre requêtes ensemblistes quel que soit le nombre de lobbies, plus la mise à
+        jour incrémentale de ``user_stats`` ; retourne le nombre d'archives créées.
+        """
+        lobbies = (await self.db.execute(
+            select(Lobby.id, Lobby.game_id, Lobby.host_id, Lobby.name, Lobby.created_at, Lobby.updated_at)
+            .where(Lobby.id.in_(lobby_ids), ~exists().where(GameArchive.id == Lobby.id))
+        )).all()
+        if not lobbies:
+            return 0
+        ids = [lobby.id for lobby in lobbies]
+
+        players = (await self.db.execute(
+            select(Player.id, Player.lobby_id, Player.user_id, Player.score, Player.status)
+            .where(Player.lobby_id.in_(ids))
+            .order_by(Player.lobby_id, Player.score.desc())
+        )).all()
+
+        missions_by_player: Dict[UUID, list] = defaultdict(list)
+        for player_id, mission_id, status in (await self.db.execute(
+            select(MissionAssigned.player_id, MissionAssigned.mission_id, MissionAssigned.status)
+            .join(Player, Player.id == MissionAssigned.player_id)
+            .where(Player.lobby_id.in_(ids))
+        )).all():
+            missions_by_player[player_id].append([str(mission_id), status.value])
+
+        round_counts = dict((await self.db.execute(
+            select(Round.lobby_id, func.count(Round.id))
+            .where(Round.lobby_id.in_(ids))
+            .group_by(Round.lobby_id)
+        )).all())
+
+        players_by_lobby: Dict[UUID, List[ArchivedPlayer]] = defaultdict(list)
+        for player in players:
+            players_by_lobby[player.lobby_id].append(ArchivedPlayer(
+                str(player.user_id), player.score, player.status.value, missions_by_player.get(player.id, [])
+            ))
+
+        archives = [
+            ArchivedGame(
+                id=lobby.id,
+                game_id=lobby.game_id,
+                host_id=lobby.host_id,
+                lobby_name=lobby.name,
+                created_at=lobby.created_at,
+                ended_at=lobby.updated_at,
+                round_count=round_counts.get(lobby.id, 0),
+                players=players_by_lobby[lobby.id],
+            )
+            for lobby in lobbies
+        ]
+        await self.db.execute(insert(GameArchive), [archive.to_row() for archive in archives])
+        # Une partie n'est archivée qu'une fois : les statistiques ne sont jamais comptées deux fois
+        await UserStatsRepository(self.db).add_stats(user_stats_rows(archives))
+        return len(archives)
+
+    async def archive_pending(self, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        """
+        Archive, par lots de ``batch_size``, les lobbies ``ENDED`` qui ne le sont pas encore
+        (terminés hors ``PUT /api/lobbies/{id}`` et pas encore vus par le janitor) ; retourne
+        le nombre d'archives créées.
+        """
+        archived = 0
+        while True:
+            lobby_ids = list(await self.db.scalars(
+                select(Lobby.id)
+                .where(Lobby.status == LobbyStatus.ENDED, ~exists().where(GameArchive.id == Lobby.id))
+                .limit(batch_size)
+            ))
+            if not lobby_ids:
+                return archived
+            archived += await self.archive_lobbies(lobby_ids)
+
+    async def archive_page(
+        self, after: Optional[Tuple[datetime, UUID]] = None, limit: int = EXPORT_BATCH_SIZE,
+    ) -> List[ArchivedGame]:
+        """
+        Page d'archives triées par ``(ended_at, id)``, après la clé ``after`` (pagination par
+        clé) : chaque page est lue entièrement, aucun curseur ne reste ouvert entre deux pages.
+        """
+        query = select(*_ARCHIVE_COLUMNS).order_by(GameArchive.ended_at, GameArchive.id).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(GameArchive.ended_at, GameArchive.id) > tuple_(*after))
+        return [ArchivedGame.from_row(row) for row in (await self.db.execute(query)).all()]
+
+    async def stream_archives(
+        self,
+        game_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> AsyncIterator[ArchivedGame]:
+        """
+        Parcourt les archives par ordre de fin de partie avec un curseur côté serveur :
+        la mémoire reste constante quel que soit le nombre d'archives.
+        """
+        query = select(*_ARCHIVE_COLUMNS)
+        if game_id is not None:
+            query = query.where(GameArchive.game_id == game_id)
+        if since is not None:
+            query = query.where(GameArchive.ended_at >= since)
+        if until is not None:
+            query = query.where(GameArchive.ended_at < until)
+
+        result = await self.db.stream(
+            query.order_by(GameArchive.ended_at).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for row in result:
+            yield ArchivedGame.from_row(row)
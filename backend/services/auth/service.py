@@ -69,9 +69,9 @@ class AuthenticationService:
         parsed = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
         await self.user_repository.set_user_password(parsed, new_password)
 
-    async def set_user_active(self, user_id: uuid.UUID | str, is_active: bool) -> None:
+    async def set_user_active(self, user_id: uuid.UUID | str, is_active: bool) -> Optional[User]:
         parsed = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
-        await self.user_repository.set_user_active(parsed, is_active)
+        return await self.user_repository.set_user_active(parsed, is_active)
 
     def create_token_pair(self, user_id: uuid.UUID) -> tuple[str, str]:
         access = self.jwt_repository.create_access_token(user_id)
@@ -0,0 +1,37 @@
+"""
+Export en flux du catalogue (jeux, tags et missions)
+"""
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from repositories.game_repository import GameRepository
+from repositories.mission_repository import MissionRepository
+
+
+class CatalogExportService:
+    """
+    Export du catalogue pour les sauvegardes et les transferts entre environnements.
+
+    Les jeux (``{"kind": "game", ...}``, tags compris) précèdent les missions
+    (``{"kind": "mission", ...}``, triées par jeu) : un import peut rejouer le fichier
+    dans l'ordre. Deux requêtes lues l'une après l'autre par un curseur côté serveur ;
+    un seul curseur ouvert à la fois sur la connexion, et une mémoire constante quelle
+    que soit la taille du catalogue.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.game_repo = GameRepository(db)
+        self.mission_repo = MissionRepository(db)
+
+    async def game_exists(self, game_id: UUID) -> bool:
+        return bool(await self.game_repo.get_existing_ids({game_id}))
+
+    async def stream_catalog(self, game_id: Optional[UUID] = None) -> AsyncIterator[dict]:
+        """Parcourt un jeu (ou tout le catalogue) puis ses missions."""
+        async for game in self.game_repo.stream_games(game_id):
+            yield {"kind": "game", **game}
+        async for mission in self.mission_repo.stream_missions(game_id):
+            yield {"kind": "mission", **mission}
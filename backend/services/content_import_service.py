@@ -0,0 +1,189 @@
+"""
+Import en masse de missions et de jeux depuis un flux NDJSON ou CSV
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from repositories.game_repository import GameRepository
+from repositories.gametype_repository import GameTypeRepository
+from repositories.mission_repository import MissionRepository
+from schemas import CatalogMissionRow, CatalogRow, GameImportRow, ImportReport, ImportRowError, MissionImportRow
+
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+Record = Tuple[int, Any]                 # (numéro de ligne, objet lu ou exception de lecture)
+
+
+class ContentImportService:
+    """
+    Import de missions et de jeux en flux (dont l'export NDJSON du catalogue).
+
+    Les lignes sont lues une à une (``utils.streaming.parse_ndjson`` / ``parse_csv``),
+    validées par paquets de ``chunk_size`` avec un ``TypeAdapter`` et insérées par paquet
+    (INSERT multi-lignes, ``COPY`` sur PostgreSQL pour les missions) : la mémoire dépend
+    de ``chunk_size``, pas de la taille du fichier. Une ligne invalide est ajoutée au
+    rapport (numéro de ligne et erreur) sans interrompre l'import ; le commit revient à
+    l'appelant.
+    """
+
+    def __init__(self, db: AsyncSession, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.game_repo = GameRepository(db)
+        self.game_type_repo = GameTypeRepository(db)
+        self.mission_repo = MissionRepository(db)
+
+    async def import_missions(
+        self,
+        records: AsyncIterable[Record],
+        game_id: Optional[UUID] = None,
+        created_by: Optional[UUID] = None,
+    ) -> ImportReport:
+        """Importe des missions ; ``game_id`` s'applique aux lignes qui n'en précisent pas."""
+
+        async def insert_chunk(report: ImportReport, rows: List[Tuple[int, MissionImportRow]]) -> int:
+            return await self._insert_missions(report, rows, game_id, created_by)
+
+        return await self._import(records, TypeAdapter(List[MissionImportRow]), insert_chunk)
+
+    async def import_games(self, records: AsyncIterable[Record], created_by: Optional[UUID] = None) -> ImportReport:
+        """
+        Importe des jeux et leurs tags (résolus en bloc) ; un nom déjà pris est une erreur de ligne.
+
+        Accepte aussi un export du catalogue (``CatalogExportService``) : les lignes
+        ``kind: mission`` qui suivent les jeux sont importées comme missions, leur
+        ``game_id`` exporté étant remplacé par l'id du jeu importé (ou du jeu existant de
+        même nom).
+        """
+        game_ids: Dict[UUID, UUID] = {}         # id exporté -> id en base
+
+        async def insert_chunk(report: ImportReport, rows: List[Tuple[int, GameImportRow]]) -> int:
+            games = [(line, row) for line, row in rows if not isinstance(row, CatalogMissionRow)]
+            missions = [(line, row) for line, row in rows if isinstance(row, CatalogMissionRow)]
+            imported = await self._insert_games(report, games, game_ids) if games else 0
+            if missions:
+                for _, row in missions:
+                    row.game_id = game_ids.get(row.game_id, row.game_id)
+                imported += await self._insert_missions(report, missions, None, created_by)
+            return imported
+
+        return await self._import(records, TypeAdapter(List[CatalogRow]), insert_chunk)
+
+    async def _insert_missions(
+        self,
+        report: ImportReport,
+        rows: List[Tuple[int, MissionImportRow]],
+        game_id: Optional[UUID],
+        created_by: Optional[UUID],
+    ) -> int:
+        for line, row in rows:
+            row.game_id = row.game_id or game_id
+        existing = await self.game_repo.get_existing_ids({row.game_id for _, row in rows if row.game_id})
+        values = []
+        for line, row in rows:
+            if row.game_id is None:
+                _fail(report, line, "game_id is required")
+            elif row.game_id not in existing:
+                _fail(report, line, f"Game {row.game_id} not found")
+            else:
+                values.append({**row.model_dump(exclude={"kind"}), "created_by": created_by})
+        return await self.mission_repo.insert_missions(values)
+
+    async def _insert_games(
+        self,
+        report: ImportReport,
+        rows: List[Tuple[int, GameImportRow]],
+        game_ids: Dict[UUID, UUID],
+    ) -> int:
+        """Insère un paquet de jeux ; ``game_ids`` reçoit id exporté -> id en base (lignes d'export)."""
+        game_types = await self.game_type_repo.get_existing_ids({row.game_type_id for _, row in rows})
+        now = datetime.now(timezone.utc)
+        valid = []
+        for line, row in rows:
+            if row.game_type_id in game_types:
+                valid.append((line, row))
+            else:
+                _fail(report, line, f"Game type {row.game_type_id} not found")
+
+        inserted = await self.game_repo.insert_games([
+            {**row.model_dump(exclude={"tags", "kind", "id"}), "created_at": now, "updated_at": now}
+            for _, row in valid
+        ])
+        tag_ids = await self.game_repo.resolve_tag_ids(
+            tag for _, row in valid if row.name in inserted for tag in row.tags
+        )
+        # Nom déjà pris : les missions exportées sont rattachées au jeu existant
+        existing = await self.game_repo.get_ids_by_names(
+            {row.name for _, row in valid if row.name not in inserted and getattr(row, "id", None)}
+        )
+        pairs = set()
+        seen = set()
+        for line, row in valid:
+            exported_id = getattr(row, "id", None)
+            if row.name not in inserted or row.name in seen:
+                if exported_id and row.name in existing:
+                    game_ids[exported_id] = existing[row.name]
+                _fail(report, line, f"Game name '{row.name}' already exists")
+                continue
+            seen.add(row.name)
+            if exported_id:
+                game_ids[exported_id] = inserted[row.name]
+            pairs.update((inserted[row.name], tag_ids[tag]) for tag in row.tags)
+        await self.game_repo.add_game_tags(list(pairs))
+        return len(seen)
+
+    async def _import(
+        self,
+        records: AsyncIterable[Record],
+        adapter: TypeAdapter,
+        insert_chunk: Callable[[ImportReport, list], Awaitable[int]],
+    ) -> ImportReport:
+        report = ImportReport()
+        chunk: List[Record] = []
+        async for line, data in records:
+            report.processed += 1
+            if isinstance(data, Exception):
+                _fail(report, line, str(data))
+                continue
+            chunk.append((line, data))
+            if len(chunk) >= self.chunk_size:
+                report.imported += await insert_chunk(report, _validate(report, adapter, chunk))
+                chunk = []
+        if chunk:
+            report.imported += await insert_chunk(report, _validate(report, adapter, chunk))
+
+        logger.info("content import done", extra={
+            "processed": report.processed, "imported": report.imported, "failed": report.failed,
+        })
+        return report
+
+
+def _validate(report: ImportReport, adapter: TypeAdapter, chunk: List[Record]) -> list:
+    """Valide un paquet en un appel ; les lignes en erreur sont retirées et ajoutées au rapport."""
+    try:
+        return list(zip((line for line, _ in chunk), adapter.validate_python([data for _, data in chunk])))
+    except ValidationError as exc:
+        invalid: dict[int, str] = {}
+        for error in exc.errors():
+            index, *field = error["loc"]
+            location = ".".join(str(part) for part in field)
+            invalid.setdefault(index, f"{location}: {error['msg']}" if location else error["msg"])
+    for index, message in invalid.items():
+        _fail(report, chunk[index][0], message)
+    valid = [record for index, record in enumerate(chunk) if index not in invalid]
+    return list(zip((line for line, _ in valid), adapter.validate_python([data for _, data in valid])))
+
+
+def _fail(report: ImportReport, line: int, message: str) -> None:
+    report.failed += 1
+    if len(report.errors) < MAX_REPORTED_ERRORS:
+        report.errors.append(ImportRowError(line=line, error=message))
@@ -229,7 +229,7 @@ class GameService:
         
         # Mettre à jour le statut du lobby
         from schemas.lobby import LobbyUpdate
-        lobby_update = LobbyUpdate(status=LobbyStatus.FINISHED)
+        lobby_update = LobbyUpdate(status=LobbyStatus.ENDED)
         await self.lobby_repo.update_lobby(lobby_id, lobby_update)
         
         # Mettre à jour les statuts des joueurs
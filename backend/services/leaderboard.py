@@ -0,0 +1,124 @@
+"""
+Classements en mémoire des lobbies, mis à jour incrémentalement
+"""
+from bisect import bisect_left, insort
+from itertools import count
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class RankChange(NamedTuple):
+    player_id: str
+    user_id: str
+    score: int
+    rank: int                        # 1 = premier
+    previous_rank: Optional[int]
+
+
+class Leaderboard:
+    """
+    Classement d'un lobby, trié par score décroissant (à égalité : ordre d'arrivée).
+
+    Les clés ``(-score, arrivée, player_id)`` sont maintenues triées : une mise à jour
+    de score ne déplace qu'une clé (recherche dichotomique) et seuls les joueurs situés
+    entre l'ancienne et la nouvelle position changent de rang.
+    """
+
+    def __init__(self, players: Iterable[Tuple[str, str, int]] = ()) -> None:
+        self._sequence = count()
+        self._keys: List[Tuple[int, int, str]] = []
+        self._entries: Dict[str, Tuple[int, int, str]] = {}     # player_id -> (score, arrivée, user_id)
+        for player_id, user_id, score in players:
+            self.add_player(player_id, user_id, score)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._entries
+
+    def _key(self, player_id: str) -> Tuple[int, int, str]:
+        score, sequence, _ = self._entries[player_id]
+        return (-score, sequence, player_id)
+
+    def add_player(self, player_id: str, user_id: str, score: int = 0) -> None:
+        if player_id in self._entries:
+            return
+        self._entries[player_id] = (score, next(self._sequence), user_id)
+        insort(self._keys, self._key(player_id))
+
+    def remove_player(self, player_id: str) -> None:
+        if player_id not in self._entries:
+            return
+        del self._keys[bisect_left(self._keys, self._key(player_id))]
+        del self._entries[player_id]
+
+    def rank_of(self, player_id: str) -> int:
+        return bisect_left(self._keys, self._key(player_id)) + 1
+
+    def score_of(self, player_id: str) -> int:
+        return self._entries[player_id][0]
+
+    def standings(self, limit: Optional[int] = None) -> List[RankChange]:
+        """Classement complet (ou les ``limit`` premiers)."""
+        keys = self._keys if limit is None else self._keys[:limit]
+        return [self._change(key[2], rank, rank) for rank, key in enumerate(keys, 1)]
+
+    def update_scores(self, scores: Dict[str, int]) -> List[RankChange]:
+        """
+        Applique de nouveaux scores et retourne uniquement les joueurs dont le rang ou
+        le score a changé, triés par nouveau rang.
+        """
+        before: Dict[str, Tuple[int, int]] = {}    # player_id -> (rang, score) avant la mise à jour
+
+        for player_id, score in scores.items():
+            if player_id not in self._entries or self.score_of(player_id) == score:
+                continue
+            old_position = bisect_left(self._keys, self._key(player_id))
+            before.setdefault(player_id, (old_position + 1, self.score_of(player_id)))
+            del self._keys[old_position]
+
+            _, sequence, user_id = self._entries[player_id]
+            self._entries[player_id] = (score, sequence, user_id)
+            new_position = bisect_left(self._keys, self._key(player_id))
+            self._keys.insert(new_position, self._key(player_id))
+
+            # Joueurs décalés d'un rang par ce déplacement (index = rang actuel - 1)
+            if new_position < old_position:
+                shifted = [(index, index) for index in range(new_position + 1, old_position + 1)]
+            else:
+                shifted = [(index, index + 2) for index in range(old_position, new_position)]
+            for index, previous_rank in shifted:
+                shifted_id = self._keys[index][2]
+                before.setdefault(shifted_id, (previous_rank, self.score_of(shifted_id)))
+
+        changes = []
+        for player_id, (previous_rank, previous_score) in before.items():
+            rank = self.rank_of(player_id)
+            if rank != previous_rank or self.score_of(player_id) != previous_score:
+                changes.append(self._change(player_id, rank, previous_rank))
+        return sorted(changes, key=lambda change: change.rank)
+
+    def _change(self, player_id: str, rank: int, previous_rank: Optional[int]) -> RankChange:
+        score, _, user_id = self._entries[player_id]
+        return RankChange(player_id, user_id, score, rank, previous_rank)
+
+
+class LeaderboardRegistry:
+    """Classements des lobbies en cours, chargés à la première mise à jour."""
+
+    def __init__(self) -> None:
+        self._boards: Dict[str, Leaderboard] = {}
+
+    def get(self, lobby_id: str) -> Optional[Leaderboard]:
+        return self._boards.get(lobby_id)
+
+    def load(self, lobby_id: str, players: Iterable[Tuple[str, str, int]]) -> Leaderboard:
+        board = Leaderboard(players)
+        self._boards[lobby_id] = board
+        return board
+
+    def drop(self, lobby_id: str) -> None:
+        self._boards.pop(lobby_id, None)
+
+
+leaderboards = LeaderboardRegistry()
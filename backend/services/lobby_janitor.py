@@ -0,0 +1,134 @@
+"""
+Nettoyage périodique des lobbies abandonnés et terminés
+"""
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, exists, select
+
+from core.config import settings
+from core.metrics import metrics
+from db.database import async_session_maker
+from db.unit_of_work import UnitOfWork
+from models import Lobby, LobbyStatus, Player, PlayerStatus
+from repositories.lobby_repository import LobbyRepository
+from services.archive_service import ArchiveService
+from services.leaderboard import leaderboards
+
+
+logger = logging.getLogger(__name__)
+
+rows_reclaimed_total = metrics.counter("lobby_janitor_rows_reclaimed_total", "Lignes supprimées par le janitor depuis le démarrage")
+rows_reclaimed_last_run = metrics.gauge("lobby_janitor_rows_reclaimed_last_run", "Lignes supprimées lors de la dernière passe")
+lobbies_expired_total = metrics.counter("lobby_janitor_lobbies_expired_total", "Lobbies WAITING abandonnés supprimés")
+lobbies_archived_total = metrics.counter("lobby_janitor_lobbies_archived_total", "Lobbies ENDED archivés puis supprimés")
+
+
+class LobbyJanitor:
+    """
+    Tâche périodique (démarrée dans ``main.lifespan``) qui :
+
+    - supprime les lobbies ``WAITING`` sans joueur actif depuis ``idle_ttl`` secondes ;
+    - archive dans ``game_archive`` puis supprime les lobbies ``ENDED`` depuis ``ended_retention`` secondes.
+
+    Les suppressions se font par lots de ``batch_size`` lobbies, une transaction courte par lot,
+    pour ne jamais garder de verrous longtemps. Après chaque lot validé, ``on_deleted`` reçoit
+    les identifiants supprimés (état en mémoire à libérer : historique du chat...).
+    """
+
+    def __init__(
+        self,
+        session_maker=None,
+        interval: float | None = None,
+        idle_ttl: float | None = None,
+        ended_retention: float | None = None,
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+        on_deleted: Optional[Callable[[list[UUID]], None]] = None,
+    ) -> None:
+        self.session_maker = session_maker or async_session_maker
+        self.interval = interval if interval is not None else settings.LOBBY_JANITOR_INTERVAL
+        self.idle_ttl = idle_ttl if idle_ttl is not None else settings.LOBBY_IDLE_TTL
+        self.ended_retention = ended_retention if ended_retention is not None else settings.LOBBY_ENDED_RETENTION
+        self.batch_size = batch_size if batch_size is not None else settings.LOBBY_JANITOR_BATCH_SIZE
+        self.max_batches = max_batches if max_batches is not None else settings.LOBBY_JANITOR_MAX_BATCHES
+        self.on_deleted = on_deleted
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("lobby janitor pass failed")
+
+    async def run_once(self) -> int:
+        """Effectue une passe et retourne le nombre de lignes supprimées."""
+        now = datetime.now(timezone.utc)
+
+        has_active_player = exists().where(
+            Player.lobby_id == Lobby.id,
+            Player.status.in_([PlayerStatus.WAITING, PlayerStatus.PLAYING]),
+        )
+        idle = and_(
+            Lobby.status == LobbyStatus.WAITING,
+            Lobby.updated_at < now - timedelta(seconds=self.idle_ttl),
+            ~has_active_player,
+        )
+        ended = and_(
+            Lobby.status == LobbyStatus.ENDED,
+            Lobby.updated_at < now - timedelta(seconds=self.ended_retention),
+        )
+
+        expired, expired_rows = await self._sweep(idle, archive=False)
+        archived, archived_rows = await self._sweep(ended, archive=True)
+        reclaimed = expired_rows + archived_rows
+
+        lobbies_expired_total.inc(expired)
+        lobbies_archived_total.inc(archived)
+        rows_reclaimed_total.inc(reclaimed)
+        rows_reclaimed_last_run.set(reclaimed)
+        if reclaimed:
+            logger.info(
+                "lobby janitor pass",
+                extra={"lobbies_expired": expired, "lobbies_archived": archived, "rows_reclaimed": reclaimed},
+            )
+        return reclaimed
+
+    async def _sweep(self, condition, archive: bool) -> tuple[int, int]:
+        """Supprime par lots les lobbies qui vérifient ``condition`` ; retourne (lobbies, lignes)."""
+        lobbies = rows = 0
+        for _ in range(self.max_batches):
+            async with self.session_maker() as session, UnitOfWork(session):
+                lobby_ids = list(await session.scalars(
+                    select(Lobby.id).where(condition).order_by(Lobby.updated_at).limit(self.batch_size)
+                ))
+                if not lobby_ids:
+                    break
+                if archive:
+                    await ArchiveService(session).archive_lobbies(lobby_ids)
+                rows += await LobbyRepository(session).delete_lobbies(lobby_ids)
+            for lobby_id in lobby_ids:
+                leaderboards.drop(str(lobby_id))
+            if self.on_deleted is not None:
+                self.on_deleted(lobby_ids)
+            lobbies += len(lobby_ids)
+            if len(lobby_ids) < self.batch_size:
+                break
+        return lobbies, rows
@@ -0,0 +1,72 @@
+"""
+Service d'attribution des missions d'un lobby
+"""
+import random
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Lobby, LobbyStatus, Player, PlayerStatus
+from repositories.mission_assigned_repository import MissionAssignedRepository
+from repositories.mission_repository import MissionRepository
+
+
+class MissionAssignmentService:
+    """
+    Tire une mission par joueur actif du lobby parmi les missions du jeu, sans doublon tant
+    qu'il y en a assez. Les missions encore actives d'une attribution précédente sont annulées.
+
+    Le résultat a la forme attendue par ``websocket.visibility.assignment_views``.
+    """
+
+    def __init__(self, db: AsyncSession, rng: Optional[random.Random] = None):
+        self.db = db
+        self.rng = rng or random.Random()
+        self.mission_repo = MissionRepository(db)
+        self.assignment_repo = MissionAssignedRepository(db)
+
+    async def assign_missions(self, lobby_id: UUID) -> Dict[UUID, dict]:
+        """
+        Attribue les missions du lobby ; retourne player_id -> ``{"user_id", "mission_id",
+        "mission": {...}}`` (vide si le lobby est terminé, sans joueur actif ou sans mission).
+        """
+        game_id = (await self.db.execute(
+            select(Lobby.game_id).where(Lobby.id == lobby_id, Lobby.status != LobbyStatus.ENDED)
+        )).scalar_one_or_none()
+        if game_id is None:
+            return {}
+        players = (await self.db.execute(
+            select(Player.id, Player.user_id).where(
+                Player.lobby_id == lobby_id,
+                Player.status.in_([PlayerStatus.WAITING, PlayerStatus.PLAYING]),
+            )
+        )).all()
+        missions = await self.mission_repo.get_missions_by_game(game_id)
+        if not players or not missions:
+            return {}
+
+        if len(missions) >= len(players):
+            drawn = self.rng.sample(missions, len(players))
+        else:
+            drawn = [self.rng.choice(missions) for _ in players]
+
+        await self.assignment_repo.cancel_active([player_id for player_id, _ in players])
+        await self.assignment_repo.create_assignments(
+            [(player_id, mission.id) for (player_id, _), mission in zip(players, drawn)]
+        )
+        return {
+            player_id: {
+                "user_id": user_id,
+                "mission_id": mission.id,
+                "mission": {
+                    "id": mission.id,
+                    "title": mission.title,
+                    "description": mission.description,
+                    "is_known_by_player": mission.is_known_by_player,
+                    "is_known_by_others": mission.is_known_by_others,
+                },
+            }
+            for (player_id, user_id), mission in zip(players, drawn)
+        }
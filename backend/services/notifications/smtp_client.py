@@ -5,8 +5,6 @@ import logging
 from email.message import EmailMessage
 from typing import Optional
 
-import aiosmtplib
-
 from core.config import settings
 
 
@@ -53,6 +51,9 @@ class SMTPClient:
         if html_content:
             message.add_alternative(html_content, subtype="html")
 
+        # Import différé : l'envoi d'emails est rare, aiosmtplib ne pèse pas sur le démarrage
+        import aiosmtplib
+
         client = aiosmtplib.SMTP(
             hostname=self.host,
             port=self.port,
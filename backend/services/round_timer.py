@@ -0,0 +1,254 @@
+"""
+Timers de fin de manche sur une roue temporelle hachée (hashed timing wheel)
+"""
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+from uuid import UUID
+
+from core.config import settings
+from core.metrics import metrics
+from db.database import async_session_maker
+from db.unit_of_work import UnitOfWork
+from models.lobby import LobbyPhase
+from repositories.lobby_repository import LobbyRepository
+from repositories.round_timer_repository import RoundTimerRepository
+from utils.normalize_datetime import normalize_datetime
+
+
+logger = logging.getLogger(__name__)
+
+timers_pending = metrics.gauge("round_timers_pending", "Timers de manche armés (hors pause)")
+timers_fired_total = metrics.counter("round_timers_fired_total", "Timers de manche arrivés à échéance")
+
+
+class TimingWheel:
+    """
+    Roue de ``size`` cases parcourue d'une case par tick.
+
+    Un timer de ``ticks`` ticks est rangé dans la case ``(curseur + ticks) % size`` avec le
+    nombre de tours complets restant avant échéance : armer et annuler sont en O(1), et
+    chaque tick n'examine que les timers de la case courante.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(size)]   # clé -> tours restants
+        self._slot_of: Dict[Hashable, int] = {}
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: Hashable, ticks: int) -> None:
+        """Arme (ou réarme) ``key`` pour expirer dans ``ticks`` ticks (au moins 1)."""
+        self.cancel(key)
+        ticks = max(1, ticks)
+        slot = (self._cursor + ticks) % self.size
+        self._slots[slot][key] = (ticks - 1) // self.size
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self) -> List[Hashable]:
+        """Avance d'un tick et retourne les clés arrivées à échéance."""
+        self._cursor = (self._cursor + 1) % self.size
+        slot = self._slots[self._cursor]
+        expired = [key for key, rounds in slot.items() if rounds == 0]
+        for key in expired:
+            del slot[key]
+            del self._slot_of[key]
+        for key in slot:
+            slot[key] -= 1
+        return expired
+
+
+class RoundTimerService:
+    """
+    Timers de fin de manche de tous les lobbies, pilotés par une seule tâche asyncio.
+
+    - ``schedule`` / ``cancel`` : arme ou annule le timer d'un lobby ;
+    - ``pause`` / ``resume`` : le temps restant est conservé pendant la pause ;
+    - les échéances sont persistées dans ``round_timers`` et rechargées au démarrage ;
+    - à l'échéance, ``on_expire(lobby_id)`` est appelé (par défaut
+      ``transition_to_validation`` : phase de validation, annoncée par ``broadcast``).
+    """
+
+    def __init__(
+        self,
+        on_expire: Optional[Callable[[UUID], Awaitable[None]]] = None,
+        session_maker=None,
+        tick: float | None = None,
+        wheel_size: int | None = None,
+        broadcast: Optional[Callable[[str, dict, str], Awaitable[None]]] = None,
+    ) -> None:
+        self.on_expire = on_expire or self.transition_to_validation
+        # Diffusion vers un lobby (``ConnexionManager.broadcast_public``), branchée au démarrage
+        self.broadcast = broadcast
+        self.session_maker = session_maker or async_session_maker
+        self.tick = tick if tick is not None else settings.ROUND_TIMER_TICK
+        self.wheel = TimingWheel(wheel_size if wheel_size is not None else settings.ROUND_TIMER_WHEEL_SIZE)
+        self._deadlines: Dict[UUID, float] = {}     # lobby_id -> échéance (horloge monotone)
+        self._paused: Dict[UUID, float] = {}        # lobby_id -> secondes restantes
+        self._cursor_time = time.monotonic()         # instant du dernier tick
+        self._task: asyncio.Task | None = None
+        self._firing: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        # Les échéances restent persistées : elles seront rechargées au prochain démarrage.
+        # Un timer en cours de déclenchement (ligne déjà supprimée) va jusqu'au bout.
+        await asyncio.gather(*self._firing, return_exceptions=True)
+
+    async def transition_to_validation(self, lobby_id: UUID) -> bool:
+        """Action par défaut à l'échéance : le lobby passe en phase de validation, annoncée aux joueurs."""
+        async with self.session_maker() as session, UnitOfWork(session):
+            changed = await LobbyRepository(session).set_phase(lobby_id, LobbyPhase.VALIDATION)
+        if changed and self.broadcast is not None:
+            await self.broadcast(
+                "phase_changed", {"lobby_id": str(lobby_id), "phase": LobbyPhase.VALIDATION.value}, str(lobby_id),
+            )
+        return changed
+
+    def remaining(self, lobby_id) -> Optional[float]:
+        """Secondes restantes avant l'échéance (figées si en pause), ``None`` sans timer."""
+        lobby_id = _as_uuid(lobby_id)
+        if lobby_id in self._paused:
+            return self._paused[lobby_id]
+        if lobby_id in self._deadlines:
+            return max(0.0, self._deadlines[lobby_id] - time.monotonic())
+        return None
+
+    def is_paused(self, lobby_id) -> bool:
+        return _as_uuid(lobby_id) in self._paused
+
+    async def schedule(self, lobby_id, seconds: float) -> None:
+        """Arme (ou réarme) le timer d'un lobby pour dans ``seconds`` secondes."""
+        lobby_id = _as_uuid(lobby_id)
+        self._paused.pop(lobby_id, None)
+        self._arm(lobby_id, seconds)
+        await self._persist(lobby_id, datetime.now(timezone.utc) + timedelta(seconds=seconds))
+
+    async def pause(self, lobby_id) -> Optional[float]:
+        """Met le timer en pause et retourne le temps restant (``None`` sans timer armé)."""
+        lobby_id = _as_uuid(lobby_id)
+        if lobby_id not in self._deadlines:
+            return None
+        remaining = max(0.0, self._deadlines.pop(lobby_id) - time.monotonic())
+        self.wheel.cancel(lobby_id)
+        self._paused[lobby_id] = remaining
+        timers_pending.set(len(self.wheel))
+        await self._persist(lobby_id, None, remaining)
+        return remaining
+
+    async def resume(self, lobby_id) -> Optional[float]:
+        """Reprend un timer en pause avec son temps restant (``None`` s'il n'est pas en pause)."""
+        lobby_id = _as_uuid(lobby_id)
+        if lobby_id not in self._paused:
+            return None
+        remaining = self._paused[lobby_id]
+        await self.schedule(lobby_id, remaining)
+        return remaining
+
+    async def cancel(self, lobby_id) -> bool:
+        """Annule le timer d'un lobby ; retourne ``False`` s'il n'y en avait pas."""
+        lobby_id = _as_uuid(lobby_id)
+        existed = self._disarm(lobby_id) | (self._paused.pop(lobby_id, None) is not None)
+        if existed:
+            await self._delete(lobby_id)
+        return existed
+
+    async def restore(self) -> int:
+        """Recharge les timers persistés (redémarrage) ; les échéances dépassées expirent au tick suivant."""
+        async with self.session_maker() as session:
+            timers = await RoundTimerRepository(session).get_timers()
+
+        now = datetime.now(timezone.utc)
+        for lobby_id, deadline_at, remaining_seconds in timers:
+            if deadline_at is None:
+                self._paused[lobby_id] = remaining_seconds or 0.0
+            else:
+                self._arm(lobby_id, (normalize_datetime(deadline_at) - now).total_seconds())
+        return len(timers)
+
+    def advance(self) -> List[UUID]:
+        """Avance la roue d'un tick et déclenche les timers échus (appelé par la tâche pilote)."""
+        self._cursor_time += self.tick
+        expired = self.wheel.advance()
+        for lobby_id in expired:
+            self._deadlines.pop(lobby_id, None)
+            task = asyncio.create_task(self._fire(lobby_id))
+            self._firing.add(task)
+            task.add_done_callback(self._firing.discard)
+        if expired:
+            timers_pending.set(len(self.wheel))
+            timers_fired_total.inc(len(expired))
+        return expired
+
+    async def _run(self) -> None:
+        self._cursor_time = time.monotonic()
+        try:
+            await self.restore()
+        except Exception:
+            logger.exception("round timers restore failed")
+
+        while True:
+            await asyncio.sleep(max(0.0, self._cursor_time + self.tick - time.monotonic()))
+            # Rattrapage des ticks manqués si la boucle a pris du retard
+            while self._cursor_time + self.tick <= time.monotonic():
+                self.advance()
+
+    async def _fire(self, lobby_id: UUID) -> None:
+        try:
+            await self._delete(lobby_id)
+            await self.on_expire(lobby_id)
+        except Exception:
+            logger.exception("round timer callback failed", extra={"lobby_id": str(lobby_id)})
+
+    def _arm(self, lobby_id: UUID, seconds: float) -> None:
+        deadline = time.monotonic() + max(0.0, seconds)
+        # Arrondi au tick supérieur : un timer n'expire jamais en avance
+        self.wheel.schedule(lobby_id, math.ceil((deadline - self._cursor_time) / self.tick))
+        self._deadlines[lobby_id] = deadline
+        timers_pending.set(len(self.wheel))
+
+    def _disarm(self, lobby_id: UUID) -> bool:
+        self._deadlines.pop(lobby_id, None)
+        cancelled = self.wheel.cancel(lobby_id)
+        timers_pending.set(len(self.wheel))
+        return cancelled
+
+    async def _persist(self, lobby_id: UUID, deadline_at: Optional[datetime], remaining: Optional[float] = None) -> None:
+        async with self.session_maker() as session, UnitOfWork(session):
+            await RoundTimerRepository(session).save_timer(lobby_id, deadline_at, remaining)
+
+    async def _delete(self, lobby_id: UUID) -> None:
+        async with self.session_maker() as session, UnitOfWork(session):
+            await RoundTimerRepository(session).delete_timer(lobby_id)
+
+
+def _as_uuid(lobby_id) -> UUID:
+    return lobby_id if isinstance(lobby_id, UUID) else UUID(str(lobby_id))
+
+
+round_timer = RoundTimerService()
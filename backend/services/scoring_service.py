@@ -0,0 +1,92 @@
+"""
+Service de scoring : validation des missions et classement des lobbies
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Lobby, MissionAssignedStatus
+from models.lobby import LobbyPhase
+from repositories.mission_assigned_repository import MissionAssignedRepository
+from repositories.player_repository import PlayerRepository
+from services.leaderboard import LeaderboardRegistry, RankChange, leaderboards
+
+
+def mission_points(difficulty: int) -> int:
+    """Points gagnés pour une mission réussie : 1 à 5 selon la difficulté (0-100)."""
+    return 1 + min(max(difficulty, 0), 100) // 25
+
+
+class ScoringService:
+    """
+    Applique les résultats de la phase de validation :
+
+    - les missions ACTIVE passent à COMPLETED / FAILED (une seule fois) ;
+    - les scores sont incrémentés atomiquement en base (``score = score + :delta``) ;
+    - le classement en mémoire du lobby est mis à jour et seuls les changements sont retournés ;
+      si la transaction est annulée, il est oublié (rechargé depuis la base à la validation suivante).
+    """
+
+    def __init__(self, db: AsyncSession, registry: LeaderboardRegistry = leaderboards):
+        self.db = db
+        self.registry = registry
+        self.player_repo = PlayerRepository(db)
+        self.assignment_repo = MissionAssignedRepository(db)
+
+    async def validate_missions(
+        self,
+        lobby_id: UUID,
+        results: Dict[UUID, MissionAssignedStatus],
+        validated_by: Optional[UUID] = None,
+    ) -> List[RankChange]:
+        """
+        Valide les missions d'un lobby en phase de validation.
+
+        ``validated_by`` : si fourni, doit être l'hôte du lobby.
+        """
+        lobby = (await self.db.execute(
+            select(Lobby.host_id, Lobby.phase).where(Lobby.id == lobby_id)
+        )).one_or_none()
+        if lobby is None:
+            raise ValueError("Lobby not found")
+        if validated_by is not None and lobby.host_id != validated_by:
+            raise PermissionError("Only the host can validate missions")
+        if lobby.phase != LobbyPhase.VALIDATION:
+            raise ValueError(f"Cannot validate missions in phase: {lobby.phase.value}")
+
+        resolved = await self.assignment_repo.resolve_active(lobby_id, results)
+
+        deltas: Dict[UUID, int] = defaultdict(int)
+        for player_id, status, difficulty in resolved:
+            if status == MissionAssignedStatus.COMPLETED:
+                deltas[player_id] += mission_points(difficulty)
+        if not deltas:
+            return []
+
+        # Classement chargé avant l'incrément pour connaître les rangs précédents
+        board = await self._leaderboard(lobby_id, [str(player_id) for player_id in deltas])
+        scores = await self.player_repo.increment_scores(deltas)
+        self._drop_on_rollback(lobby_id)
+        return board.update_scores({str(player_id): score for player_id, score in scores.items()})
+
+    async def _leaderboard(self, lobby_id: UUID, player_ids: List[str]):
+        board = self.registry.get(str(lobby_id))
+        if board is None or any(player_id not in board for player_id in player_ids):
+            # Premier chargement, ou joueur arrivé depuis : une requête, puis le classement
+            # est maintenu en mémoire
+            board = self.registry.load(str(lobby_id), [
+                (str(player_id), str(user_id), score)
+                for player_id, user_id, score in await self.player_repo.get_lobby_scores(lobby_id)
+            ])
+        return board
+
+    def _drop_on_rollback(self, lobby_id: UUID) -> None:
+        """Le classement vient d'être modifié avant le commit : oublié si la transaction est annulée."""
+        event.listen(
+            self.db.sync_session, "after_soft_rollback",
+            lambda session, previous_transaction: self.registry.drop(str(lobby_id)),
+            once=True,
+        )
@@ -0,0 +1,58 @@
+"""
+Service des statistiques globales des joueurs (toutes parties confondues)
+"""
+import logging
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import UserStats
+from repositories.user_stats_repository import UserStatsRepository
+from services.archive_service import ArchiveService, user_stats_rows
+
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+class UserStatsService:
+    """
+    Lecture et reconstruction de ``user_stats``.
+
+    La table est maintenue incrémentalement à l'archivage de chaque partie
+    (``ArchiveService.archive_lobbies``) : une fiche profil lit une seule ligne,
+    quel que soit l'historique du joueur.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.stats_repo = UserStatsRepository(db)
+
+    async def get_stats(self, user_id: UUID) -> UserStats | None:
+        return await self.stats_repo.get_stats(user_id)
+
+    async def backfill(self, chunk_size: int = BACKFILL_CHUNK_SIZE) -> int:
+        """
+        Reconstruit ``user_stats`` depuis ``game_archive``.
+
+        Les lobbies terminés pas encore archivés le sont d'abord, pour qu'aucune partie ne
+        soit oubliée. Les archives sont ensuite lues par pages de ``chunk_size`` parties
+        (pagination par clé ``(ended_at, id)``) et chaque page est agrégée puis écrite : aucun
+        curseur n'est ouvert pendant les écritures et la mémoire ne dépend pas de la taille de
+        l'historique. Retourne le nombre de parties traitées ; le commit revient à l'appelant.
+        """
+        archive_service = ArchiveService(self.db)
+        pending = await archive_service.archive_pending()
+        # Les archives créées ci-dessus ont déjà incrémenté user_stats : tout est rejoué ci-dessous
+        await self.stats_repo.delete_all_stats()
+
+        processed = 0
+        after = None
+        while page := await archive_service.archive_page(after, limit=chunk_size):
+            await self.stats_repo.add_stats(user_stats_rows(page))
+            processed += len(page)
+            after = (page[-1].ended_at, page[-1].id)
+
+        logger.info("user_stats backfill done", extra={"games": processed, "archived": pending})
+        return processed
@@ -0,0 +1,89 @@
+"""
+Tests pour l'archivage des parties et l'export /api/archives/export.
+
+shortcut : uv run pytest tests/api/test_archives.py -v
+"""
+import csv
+import io
+import json
+
+import pytest
+
+from models import Game, GameArchive, GameType, Lobby, LobbyStatus, Mission, MissionAssigned, MissionAssignedStatus, Player, PlayerStatus
+from services.archive_service import ArchivedGame, ArchiveService
+from tests.api.helpers import create_user_and_get_token, get_auth_headers
+
+
+@pytest.fixture
+async def archived_game(client, auth_service, db_session):
+    """Une partie terminée à deux joueurs, archivée ; retourne (archive_id, headers)."""
+    user, token = await create_user_and_get_token(client, auth_service)
+    other, _ = await create_user_and_get_token(client, auth_service, "other", "other@test.com")
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add(game_type)
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    mission = Mission(game_id=game.id, title="Mission", description="Test", difficulty=10)
+    lobby = Lobby(name="Lobby", code="ARCHIV", game_id=game.id, host_id=user.id, status=LobbyStatus.ENDED)
+    db_session.add_all([mission, lobby])
+    await db_session.flush()
+    winner = Player(lobby_id=lobby.id, user_id=user.id, score=5, status=PlayerStatus.COMPLETED)
+    loser = Player(lobby_id=lobby.id, user_id=other.id, score=2, status=PlayerStatus.COMPLETED)
+    db_session.add_all([winner, loser])
+    await db_session.flush()
+    db_session.add(MissionAssigned(player_id=winner.id, mission_id=mission.id, status=MissionAssignedStatus.COMPLETED))
+    await db_session.flush()
+
+    assert await ArchiveService(db_session).archive_lobbies([lobby.id]) == 1
+    # Un second archivage est ignoré
+    assert await ArchiveService(db_session).archive_lobbies([lobby.id]) == 0
+    await db_session.commit()
+    return lobby.id, get_auth_headers(token), user
+
+
+@pytest.mark.asyncio
+async def test_archive_record_round_trip(db_session, archived_game):
+    """Le payload positionnel se relit à l'identique."""
+    archive_id, _, _ = archived_game
+    row = await db_session.get(GameArchive, archive_id)
+
+    archive = ArchivedGame.from_row(row)
+
+    assert not hasattr(archive, "__dict__")
+    assert row.player_count == 2
+    assert archive.to_row()["payload"] == row.payload
+    assert archive.players[0].missions_completed == 1
+
+
+@pytest.mark.asyncio
+async def test_export_archives_ndjson(client, archived_game):
+    """L'export NDJSON contient une partie par ligne, joueurs triés par score."""
+    archive_id, headers, user = archived_game
+
+    response = await client.get("/api/archives/export", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    data = json.loads(lines[0])
+    assert data["id"] == str(archive_id)
+    assert [p["score"] for p in data["players"]] == [5, 2]
+    assert data["players"][0]["user_id"] == str(user.id)
+    assert data["players"][0]["missions"][0]["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_export_archives_csv(client, archived_game):
+    """L'export CSV contient une ligne par joueur."""
+    _, headers, _ = archived_game
+
+    response = await client.get("/api/archives/export?format=csv", headers=headers)
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2
+    assert rows[0]["missions_completed"] == "1"
+    assert rows[1]["missions_assigned"] == "0"
@@ -0,0 +1,97 @@
+"""
+Tests pour l'export du catalogue /api/games/{id}/export et /api/games/export.
+
+shortcut : uv run pytest tests/api/test_catalog_export.py -v
+"""
+import gzip
+import json
+import uuid
+
+import pytest
+
+from models import Mission
+from repositories.game_repository import GameRepository
+from schemas import GameCreate
+from tests.api.helpers import create_user_and_get_token, get_auth_headers
+
+
+@pytest.fixture
+async def catalog(client, auth_service, db_session, initialized_game_types):
+    """Trois jeux ; le deuxième n'a pas de mission."""
+    _, token = await create_user_and_get_token(client, auth_service)
+    _, game_types = initialized_game_types
+    game_repo = GameRepository(db_session)
+    games = [
+        await game_repo.create_game(GameCreate(
+            name=f"Jeu {index}", description="Test", game_type_id=game_types[0].id, tags=["soirée", f"tag{index}"],
+        ))
+        for index in range(3)
+    ]
+    db_session.add_all([
+        Mission(game_id=game.id, title=f"{game.name} / mission {index}", description="Test", difficulty=10 * index)
+        for game in (games[0], games[2])
+        for index in range(3)
+    ])
+    await db_session.commit()
+    return games, get_auth_headers(token)
+
+
+def _records(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_export_game_ndjson(client, catalog):
+    """Le jeu (avec ses tags) puis ses missions, une ligne chacun."""
+    games, headers = catalog
+
+    response = await client.get(f"/api/games/{games[0].id}/export", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = _records(response.text)
+    assert [record["kind"] for record in records] == ["game", "mission", "mission", "mission"]
+    assert records[0]["name"] == "Jeu 0"
+    assert records[0]["tags"] == ["soirée", "tag0"]
+    assert {record["game_id"] for record in records[1:]} == {str(games[0].id)}
+    assert records[1]["type"] == "mission"
+
+
+@pytest.mark.asyncio
+async def test_export_game_gzip(client, catalog):
+    """``gzip=true`` : même contenu, compressé au fil de l'eau."""
+    games, headers = catalog
+
+    plain = await client.get(f"/api/games/{games[2].id}/export", headers=headers)
+    compressed = await client.get(f"/api/games/{games[2].id}/export", params={"gzip": True}, headers=headers)
+
+    assert compressed.headers["content-type"] == "application/gzip"
+    assert compressed.headers["content-disposition"].endswith('.ndjson.gz"')
+    assert gzip.decompress(compressed.content).decode() == plain.text
+
+
+@pytest.mark.asyncio
+async def test_export_catalog_lists_games_before_missions(client, catalog):
+    """Export complet : tous les jeux (sans mission compris), puis les missions regroupées par jeu."""
+    games, headers = catalog
+
+    response = await client.get("/api/games/export", headers=headers)
+
+    records = _records(response.text)
+    assert [record["kind"] for record in records] == ["game"] * 3 + ["mission"] * 6
+    assert {record["id"] for record in records[:3]} == {str(game.id) for game in games}
+    tags = {record["name"]: record["tags"] for record in records[:3]}
+    assert tags["Jeu 1"] == ["soirée", "tag1"]
+    game_ids = [record["game_id"] for record in records[3:]]
+    assert game_ids == sorted(game_ids)
+    assert set(game_ids) == {str(games[0].id), str(games[2].id)}
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_game(client, catalog):
+    """Jeu inexistant : 404 avant le début du flux."""
+    _, headers = catalog
+
+    response = await client.get(f"/api/games/{uuid.uuid4()}/export", headers=headers)
+
+    assert response.status_code == 404
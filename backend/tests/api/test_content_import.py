@@ -0,0 +1,173 @@
+"""
+Tests pour l'import en masse /api/missions/import et /api/games/import (dont l'export du catalogue).
+
+shortcut : uv run pytest tests/api/test_content_import.py -v
+"""
+import json
+import uuid
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from models import Game, Mission, Tag
+from models.game import GameTag
+from models.mission import MissionType
+from repositories.game_repository import GameRepository
+from schemas import GameCreate
+from services.content_import_service import ContentImportService
+from utils.streaming import parse_ndjson
+from tests.api.helpers import create_user_and_get_token, get_auth_headers
+
+
+@pytest.fixture
+async def game_and_headers(client, auth_service, db_session, initialized_game_types):
+    _, token = await create_user_and_get_token(client, auth_service)
+    _, game_types = initialized_game_types
+    game = await GameRepository(db_session).create_game(GameCreate(
+        name="Pack", description="Test", game_type_id=game_types[0].id, tags=["soirée"],
+    ))
+    await db_session.commit()
+    return game, game_types, get_auth_headers(token)
+
+
+async def _count(db_session, model):
+    return await db_session.scalar(select(func.count()).select_from(model))
+
+
+def _ndjson(*items) -> bytes:
+    return "".join((item if isinstance(item, str) else json.dumps(item)) + "\n" for item in items).encode()
+
+
+@pytest.mark.asyncio
+async def test_import_missions_ndjson_reports_invalid_lines(client, db_session, game_and_headers):
+    """Les lignes valides sont importées ; chaque ligne invalide est listée avec son numéro."""
+    game, _, headers = game_and_headers
+    body = _ndjson(
+        {"title": "Chanter", "description": "Test", "difficulty": 30},
+        "{pas du json",
+        {"title": "Trop dure", "description": "Test", "difficulty": 150},
+        {"title": "Autre jeu", "description": "Test", "difficulty": 10, "game_id": str(uuid.uuid4())},
+        {"title": "Rôle", "description": "Test", "difficulty": 80, "type": "role", "is_known_by_others": True},
+    )
+
+    response = await client.post(
+        "/api/missions/import", params={"game_id": str(game.id)}, content=body, headers=headers,
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["processed"], report["imported"], report["failed"]) == (5, 2, 3)
+    assert [error["line"] for error in report["errors"]] == [2, 3, 4]
+    assert report["errors"][1]["error"].startswith("difficulty:")
+    missions = (await db_session.execute(select(Mission).where(Mission.game_id == game.id))).scalars().all()
+    assert sorted((m.title, m.type, m.is_known_by_others) for m in missions) == [
+        ("Chanter", MissionType.MISSION, False),
+        ("Rôle", MissionType.ROLE, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_missions_csv(client, db_session, game_and_headers):
+    """CSV avec en-tête : champs vides = valeurs par défaut, guillemets multi-lignes acceptés."""
+    game, _, headers = game_and_headers
+    body = (
+        "title,description,difficulty,type,is_known_by_player,game_id\r\n"
+        f'Cacher,"Sous la table,\nsans bruit",40,,false,{game.id}\r\n'
+        f"Voler,Un verre,abc,mission,,{game.id}\r\n"
+    ).encode()
+
+    response = await client.post("/api/missions/import", params={"format": "csv"}, content=body, headers=headers)
+
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (1, 1)
+    assert report["errors"][0]["line"] == 4
+    mission = (await db_session.execute(select(Mission).where(Mission.title == "Cacher"))).scalar_one()
+    assert mission.description == "Sous la table,\nsans bruit"
+    assert mission.is_known_by_player is False
+
+
+@pytest.mark.asyncio
+async def test_import_games_resolves_tags_in_bulk(client, db_session, game_and_headers):
+    """Les tags existants sont réutilisés, les nouveaux créés ; noms déjà pris et types inconnus sont rejetés."""
+    _, game_types, headers = game_and_headers
+    game_type_id = str(game_types[0].id)
+    body = _ndjson(
+        {"name": "Espions", "description": "Test", "game_type_id": game_type_id, "tags": ["soirée", "bluff"]},
+        {"name": "Pack", "description": "Déjà pris", "game_type_id": game_type_id},
+        {"name": "Inconnu", "description": "Test", "game_type_id": str(uuid.uuid4())},
+        {"name": "Bureau", "description": "Test", "game_type_id": game_type_id, "tags": ["bluff"]},
+    )
+
+    response = await client.post("/api/games/import", content=body, headers=headers)
+
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (2, 2)
+    assert {error["line"] for error in report["errors"]} == {2, 3}
+    assert await _count(db_session, Tag) == 2
+    response = await client.get("/api/games/search", params={"tags": ["bluff"]}, headers=headers)
+    assert [game["name"] for game in response.json()] == ["Bureau", "Espions"]
+
+
+@pytest.mark.asyncio
+async def test_import_processes_the_stream_in_chunks(db_session, game_and_headers):
+    """Le flux est validé et inséré par paquets : numéros de ligne corrects d'un paquet à l'autre."""
+    game, _, _ = game_and_headers
+    lines = [
+        json.dumps({"title": f"Mission {index}", "description": "Test", "difficulty": 200 if index % 4 == 3 else 10})
+        for index in range(10)
+    ]
+
+    async def stream():
+        for line in lines:
+            yield line
+
+    report = await ContentImportService(db_session, chunk_size=3).import_missions(
+        parse_ndjson(stream()), game_id=game.id,
+    )
+
+    assert (report.imported, report.failed) == (8, 2)
+    assert [error.line for error in report.errors] == [4, 8]
+    assert await _count(db_session, Mission) == 8
+
+
+def _comparable(records: list[dict]) -> list[dict]:
+    """Enregistrements d'export sans les identifiants ni les dates, propres à chaque base."""
+    volatile = {"id", "game_id", "created_at", "updated_at", "created_by"}
+    return sorted(
+        ({key: value for key, value in record.items() if key not in volatile} for record in records),
+        key=lambda record: (record["kind"], record.get("name") or record.get("title")),
+    )
+
+
+@pytest.mark.asyncio
+async def test_catalog_export_can_be_imported_back(client, db_session, game_and_headers):
+    """Un export du catalogue se réimporte tel quel : jeux, tags et missions rattachées aux nouveaux jeux."""
+    game, _, headers = game_and_headers
+    db_session.add_all([
+        Mission(game_id=game.id, title=f"Mission {index}", description="Test", difficulty=10 * index,
+                is_known_by_others=index == 1)
+        for index in range(3)
+    ])
+    await db_session.commit()
+    exported = await client.get("/api/games/export", headers=headers)
+    records = [json.loads(line) for line in exported.text.splitlines()]
+
+    # Autre environnement : le catalogue n'existe pas encore
+    await db_session.execute(delete(Mission))
+    await db_session.execute(delete(GameTag))
+    await db_session.execute(delete(Game))
+    await db_session.commit()
+
+    response = await client.post("/api/games/import", content=exported.content, headers=headers)
+
+    assert response.json() == {"processed": 4, "imported": 4, "failed": 0, "errors": []}
+    new_game_id = await db_session.scalar(select(Game.id))
+    assert new_game_id != game.id
+    assert set(await db_session.scalars(select(Mission.game_id))) == {new_game_id}
+    reexported = await client.get("/api/games/export", headers=headers)
+    assert _comparable([json.loads(line) for line in reexported.text.splitlines()]) == _comparable(records)
+
+    # Réimport dans la même base : jeux déjà présents (erreurs), missions rattachées au jeu existant
+    report = (await client.post("/api/games/import", content=exported.content, headers=headers)).json()
+    assert (report["imported"], report["failed"]) == (3, 1)
+    assert await _count(db_session, Mission) == 6
@@ -8,8 +8,9 @@ from uuid import uuid4
 
 
 from schemas import GameCreate, LobbyCreate
-from models import LobbyStatus
+from models import GameArchive, LobbyStatus, UserStats
 from repositories import GameRepository, LobbyRepository
+from services.leaderboard import leaderboards
 from tests.api.helpers import create_user_and_get_token, get_auth_headers
 
 
@@ -286,3 +287,87 @@ async def test_delete_lobby_not_host(client, auth_service, db_session, initializ
     )
     assert response.status_code == 403
     assert "host" in response.json()["detail"].lower()
+
+
+async def _create_game_and_host(client, auth_service, db_session, initialized_game_types):
+    user, _ = await create_user_and_get_token(client, auth_service)
+    _, game_types = initialized_game_types
+    game = await GameRepository(db_session).create_game(GameCreate(
+        name="Test Game",
+        description="Test",
+        game_type_id=game_types[0].id,
+    ))
+    return game, user
+
+
+@pytest.mark.asyncio
+async def test_lobby_code_uses_friendly_alphabet(client, auth_service, db_session, initialized_game_types):
+    """Le code d'invitation utilise l'alphabet sans caractères ambigus."""
+    from repositories.lobby_repository import LOBBY_CODE_ALPHABET, LOBBY_CODE_LENGTH
+
+    game, user = await _create_game_and_host(client, auth_service, db_session, initialized_game_types)
+    lobby = await LobbyRepository(db_session).create_lobby(LobbyCreate(name="Lobby", game_id=game.id), user.id)
+
+    assert len(lobby.code) == LOBBY_CODE_LENGTH
+    assert set(lobby.code) <= set(LOBBY_CODE_ALPHABET)
+
+
+@pytest.mark.asyncio
+async def test_lobby_code_collision_retries(client, auth_service, db_session, initialized_game_types, monkeypatch):
+    """Une collision sur le code déclenche un nouveau tirage sans perdre la transaction."""
+    game, user = await _create_game_and_host(client, auth_service, db_session, initialized_game_types)
+    lobby_repo = LobbyRepository(db_session)
+    codes = iter(["AAAAAA", "AAAAAA", "BBBBBB"])
+    monkeypatch.setattr(lobby_repo, "_generate_code", lambda: next(codes))
+
+    first = await lobby_repo.create_lobby(LobbyCreate(name="Lobby 1", game_id=game.id), user.id)
+    second = await lobby_repo.create_lobby(LobbyCreate(name="Lobby 2", game_id=game.id), user.id)
+
+    assert first.code == "AAAAAA"
+    assert second.code == "BBBBBB"
+    assert (await lobby_repo.get_lobby_by_code("AAAAAA")).id == first.id
+
+
+@pytest.mark.asyncio
+async def test_lobby_code_recycled_from_ended_lobby(client, auth_service, db_session, initialized_game_types, monkeypatch):
+    """Le code d'un lobby terminé est réattribué au lieu d'être tiré à nouveau."""
+    game, user = await _create_game_and_host(client, auth_service, db_session, initialized_game_types)
+    lobby_repo = LobbyRepository(db_session)
+    monkeypatch.setattr(lobby_repo, "_generate_code", lambda: "AAAAAA")
+
+    ended = await lobby_repo.create_lobby(LobbyCreate(name="Ended", game_id=game.id), user.id)
+    ended.status = LobbyStatus.ENDED
+    await db_session.flush()
+
+    lobby = await lobby_repo.create_lobby(LobbyCreate(name="New", game_id=game.id), user.id)
+
+    assert lobby.code == "AAAAAA"
+    await db_session.refresh(ended)
+    assert ended.code.startswith("~")
+
+
+@pytest.mark.asyncio
+async def test_ending_lobby_archives_the_game(client, auth_service, db_session, initialized_game_types):
+    """Passer un lobby en ENDED l'archive aussitôt (statistiques à jour) et libère son classement."""
+    user, token = await create_user_and_get_token(client, auth_service)
+    _, game_types = initialized_game_types
+    game = await GameRepository(db_session).create_game(GameCreate(
+        name="Test Game", description="Test", game_type_id=game_types[0].id, min_players=2, max_players=10,
+    ))
+    lobby_repo = LobbyRepository(db_session)
+    lobby = await lobby_repo.create_lobby(LobbyCreate(name="Test Lobby", game_id=game.id), user.id)
+    await lobby_repo.add_player(lobby.id, user.id)
+    await db_session.commit()
+    leaderboards.load(str(lobby.id), [])
+
+    for _ in range(2):
+        response = await client.put(
+            f"/api/lobbies/{lobby.id}", json={"status": "ended"}, headers=get_auth_headers(token),
+        )
+        assert response.status_code == 200
+
+    archive = await db_session.get(GameArchive, lobby.id)
+    assert archive.player_count == 1
+    stats = await db_session.get(UserStats, user.id)
+    assert stats.games_played == 1
+    assert leaderboards.get(str(lobby.id)) is None
@@ -0,0 +1,72 @@
+"""
+Budgets de requêtes SQL par endpoint (garde-fou contre les N+1).
+
+Les budgets sont vérifiés avec plusieurs joueurs / tags : une requête par ligne
+ferait exploser le compteur.
+
+shortcut : uv run pytest tests/api/test_query_budgets.py -v
+"""
+import pytest
+
+from schemas import GameCreate, LobbyCreate
+from repositories import GameRepository, LobbyRepository
+from tests.factories import auth_headers, create_players, create_users
+
+
+@pytest.fixture
+async def populated_lobby(client, auth_service, db_session, initialized_game_types):
+    """Un lobby avec un jeu tagué et cinq joueurs."""
+    host, *users = await create_users(db_session, 6)
+    _, game_types = initialized_game_types
+
+    game = await GameRepository(db_session).create_game(GameCreate(
+        name="Budget Game",
+        description="Test",
+        game_type_id=game_types[0].id,
+        tags=["coop", "party", "bluff"],
+    ))
+    lobby = await LobbyRepository(db_session).create_lobby(
+        LobbyCreate(name="Budget Lobby", game_id=game.id), host.id
+    )
+    await create_players(db_session, lobby.id, users)
+    await db_session.commit()
+    return game, lobby, auth_headers(auth_service, host)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, budget",
+    [
+        ("/api/games", 3),
+        ("/api/games/{game_id}", 3),
+        ("/api/lobbies", 2),
+        ("/api/lobbies/{lobby_id}", 4),
+        ("/api/lobbies/code/{code}", 4),
+        ("/api/players/lobby/{lobby_id}", 5),
+        ("/api/missions/game/{game_id}", 2),
+    ],
+)
+async def test_read_endpoints_query_budget(client, populated_lobby, assert_max_queries, path, budget):
+    """Les endpoints de lecture restent sous leur budget de requêtes."""
+    game, lobby, headers = populated_lobby
+    url = path.format(game_id=game.id, lobby_id=lobby.id, code=lobby.code)
+
+    with assert_max_queries(budget):
+        response = await client.get(url, headers=headers)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_query_budget_exceeded_lists_statements(client, populated_lobby, assert_max_queries):
+    """Un dépassement de budget échoue en listant les requêtes exécutées."""
+    _, lobby, headers = populated_lobby
+
+    with pytest.raises(AssertionError) as exc_info:
+        with assert_max_queries(1):
+            await client.get(f"/api/players/lobby/{lobby.id}", headers=headers)
+
+    message = str(exc_info.value)
+    assert "GET /api/players/lobby/" in message
+    assert "expected at most 1 queries" in message
+    assert "FROM players" in message
@@ -0,0 +1,107 @@
+"""
+Tests pour la recherche /api/games/search et /api/missions/search.
+
+shortcut : uv run pytest tests/api/test_search.py -v
+"""
+import pytest
+
+from models import Mission
+from models.mission import MissionType
+from repositories.game_repository import GameRepository
+from repositories.search import search_tokens
+from schemas import GameCreate
+from tests.api.helpers import create_user_and_get_token, get_auth_headers
+
+
+@pytest.fixture
+async def catalog(client, auth_service, db_session, initialized_game_types):
+    """Trois jeux tagués et leurs missions."""
+    _, token = await create_user_and_get_token(client, auth_service)
+    _, game_types = initialized_game_types
+    game_repo = GameRepository(db_session)
+    games = {}
+    for name, description, tags in [
+        ("Soirée Espions", "Missions secrètes entre amis", ["soirée", "bluff"]),
+        ("Bureau Infiltré", "Infiltration au bureau", ["bureau", "bluff"]),
+        ("Pique-nique", "Jeu calme en plein air", ["soirée"]),
+    ]:
+        games[name] = await game_repo.create_game(GameCreate(
+            name=name, description=description, game_type_id=game_types[0].id, tags=tags,
+        ))
+    db_session.add_all([
+        Mission(game_id=games["Soirée Espions"].id, title="Faire chanter l'hôte", description="Sans qu'il le remarque", difficulty=70),
+        Mission(game_id=games["Soirée Espions"].id, title="Échanger deux verres", description="Discrètement", difficulty=20),
+        Mission(game_id=games["Bureau Infiltré"].id, title="Chanter au téléphone", description="Pendant un appel", difficulty=90, type=MissionType.ROLE),
+        Mission(game_id=games["Pique-nique"].id, title="Cacher une fourchette", description="Dans le panier", difficulty=10),
+    ])
+    await db_session.commit()
+    return get_auth_headers(token), games
+
+
+@pytest.mark.asyncio
+async def test_search_missions_by_text_difficulty_and_type(client, catalog):
+    """Les mots sont cherchés en préfixe dans le titre et la description ; filtres combinés."""
+    headers, _ = catalog
+
+    response = await client.get("/api/missions/search", params={"q": "chant"}, headers=headers)
+    assert response.status_code == 200
+    assert sorted(mission["title"] for mission in response.json()) == ["Chanter au téléphone", "Faire chanter l'hôte"]
+
+    response = await client.get(
+        "/api/missions/search", params={"q": "chant", "difficulty_max": 80, "type": "mission"}, headers=headers,
+    )
+    assert [mission["title"] for mission in response.json()] == ["Faire chanter l'hôte"]
+
+    response = await client.get("/api/missions/search", params={"difficulty_min": 101}, headers=headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_missions_by_game_tags(client, catalog):
+    """Filtre sur les tags du jeu : tous (all, par défaut) ou au moins un (any)."""
+    headers, _ = catalog
+
+    response = await client.get("/api/missions/search", params={"tags": ["soirée", "bluff"]}, headers=headers)
+    assert sorted(mission["title"] for mission in response.json()) == ["Faire chanter l'hôte", "Échanger deux verres"]
+
+    response = await client.get(
+        "/api/missions/search", params={"tags": ["bureau", "soirée"], "tag_match": "any"}, headers=headers,
+    )
+    assert len(response.json()) == 4
+
+
+@pytest.mark.asyncio
+async def test_search_games(client, catalog):
+    """Recherche de jeux par texte, tags et difficulté de leurs missions."""
+    headers, _ = catalog
+
+    response = await client.get("/api/games/search", params={"q": "infil"}, headers=headers)
+    assert response.status_code == 200
+    assert [game["name"] for game in response.json()] == ["Bureau Infiltré"]
+
+    response = await client.get("/api/games/search", params={"tags": ["soirée"]}, headers=headers)
+    assert [game["name"] for game in response.json()] == ["Pique-nique", "Soirée Espions"]
+    assert sorted(response.json()[1]["tags"]) == ["bluff", "soirée"]
+
+    response = await client.get(
+        "/api/games/search", params={"tags": ["soirée"], "difficulty_min": 50}, headers=headers,
+    )
+    assert [game["name"] for game in response.json()] == ["Soirée Espions"]
+
+
+def test_search_tokens_drop_like_wildcards():
+    """``_``, ``%`` et ``\\`` ne passent jamais dans les motifs ILIKE : ce sont des séparateurs."""
+    assert search_tokens("50%_off a_b \\\\x Éte") == ["50", "off", "a", "b", "x", "éte"]
+
+
+@pytest.mark.asyncio
+async def test_search_tag_filters_are_normalized(client, catalog):
+    """Les valeurs de tags sont nettoyées comme les noms stockés ; une valeur vide est ignorée."""
+    headers, _ = catalog
+
+    response = await client.get("/api/games/search", params={"tags": [" soirée ", "", "soirée"]}, headers=headers)
+    assert [game["name"] for game in response.json()] == ["Pique-nique", "Soirée Espions"]
+
+    unfiltered = await client.get("/api/missions/search", headers=headers)
+    response = await client.get("/api/missions/search", params={"tags": ["  "]}, headers=headers)
+    assert response.json() == unfiltered.json()
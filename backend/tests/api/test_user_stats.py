@@ -0,0 +1,150 @@
+"""
+Tests pour les statistiques globales /api/users/{id}/stats.
+
+shortcut : uv run pytest tests/api/test_user_stats.py -v
+"""
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+
+from models import Game, GameArchive, GameType, Lobby, LobbyStatus, Mission, MissionAssigned, MissionAssignedStatus, Player, PlayerStatus, UserStats
+from services.archive_service import ArchiveService
+from services.stats_service import UserStatsService
+from tests.api.helpers import create_user_and_get_token, get_auth_headers
+
+
+async def _ended_lobby(db_session, game, mission, code, scores):
+    """Lobby terminé ; ``scores`` : [(user, score, missions complétées)]"""
+    lobby = Lobby(name=code, code=code, game_id=game.id, host_id=scores[0][0].id, status=LobbyStatus.ENDED)
+    db_session.add(lobby)
+    await db_session.flush()
+    for user, score, completed in scores:
+        player = Player(lobby_id=lobby.id, user_id=user.id, score=score, status=PlayerStatus.COMPLETED)
+        db_session.add(player)
+        await db_session.flush()
+        db_session.add(MissionAssigned(
+            player_id=player.id,
+            mission_id=mission.id,
+            status=MissionAssignedStatus.COMPLETED if completed else MissionAssignedStatus.FAILED,
+        ))
+    await db_session.flush()
+    return lobby
+
+
+async def _stats_by_user(db_session):
+    result = await db_session.execute(select(
+        UserStats.user_id, UserStats.games_played, UserStats.games_won,
+        UserStats.missions_completed, UserStats.total_score,
+    ))
+    return {user_id: tuple(counters) for user_id, *counters in result.all()}
+
+
+@pytest.fixture
+async def two_games(client, auth_service, db_session):
+    """Deux parties terminées et archivées : user gagne la première, other la seconde."""
+    user, token = await create_user_and_get_token(client, auth_service)
+    other, _ = await create_user_and_get_token(client, auth_service, "other", "other@test.com")
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add(game_type)
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    mission = Mission(game_id=game.id, title="Mission", description="Test", difficulty=10)
+    db_session.add(mission)
+    await db_session.flush()
+
+    first = await _ended_lobby(db_session, game, mission, "FIRST1", [(user, 6, True), (other, 2, False)])
+    second = await _ended_lobby(db_session, game, mission, "SECOND", [(user, 1, False), (other, 4, True)])
+    archive_service = ArchiveService(db_session)
+    await archive_service.archive_lobbies([first.id])
+    await archive_service.archive_lobbies([second.id])
+    # Déjà archivées : les statistiques ne sont pas comptées deux fois
+    await archive_service.archive_lobbies([first.id, second.id])
+    await db_session.commit()
+    return user, other, get_auth_headers(token)
+
+
+@pytest.mark.asyncio
+async def test_user_stats_updated_when_games_are_archived(client, two_games):
+    """Chaque partie archivée incrémente la ligne user_stats de ses joueurs."""
+    user, _, headers = two_games
+
+    response = await client.get(f"/api/users/{user.id}/stats", headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["games_played"] == 2
+    assert data["games_won"] == 1
+    assert data["win_rate"] == 0.5
+    assert data["missions_assigned"] == 2
+    assert data["missions_completed"] == 1
+    assert data["total_score"] == 7
+    assert data["average_score"] == 3.5
+    assert data["last_game_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_user_stats_endpoint_reads_one_row(client, two_games, assert_max_queries):
+    """La fiche profil lit une seule ligne, quel que soit l'historique (+ authentification)."""
+    _, other, headers = two_games
+
+    with assert_max_queries(2):
+        response = await client.get(f"/api/users/{other.id}/stats", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["games_won"] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_stats_without_games_or_unknown_user(client, auth_service):
+    """Utilisateur sans partie : statistiques à zéro ; utilisateur inconnu : 404."""
+    user, token = await create_user_and_get_token(client, auth_service)
+    headers = get_auth_headers(token)
+
+    response = await client.get(f"/api/users/{user.id}/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["games_played"] == 0
+    assert response.json()["win_rate"] == 0.0
+
+    response = await client.get(f"/api/users/{uuid.uuid4()}/stats", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_backfill_rebuilds_user_stats_from_archives(db_session, two_games):
+    """Le backfill reconstruit les mêmes agrégats, par paquets."""
+    user, other, _ = two_games
+    expected = await _stats_by_user(db_session)
+    # Dérive corrigée par le backfill
+    await db_session.execute(update(UserStats).where(UserStats.user_id == user.id).values(total_score=999))
+    await db_session.commit()
+
+    games = await UserStatsService(db_session).backfill(chunk_size=1)
+    await db_session.commit()
+
+    assert games == 2
+    rebuilt = await _stats_by_user(db_session)
+    assert rebuilt == expected
+    assert set(rebuilt) == {user.id, other.id}
+
+
+@pytest.mark.asyncio
+async def test_backfill_archives_ended_lobbies_first(db_session, two_games):
+    """Un lobby terminé mais pas encore archivé est archivé puis compté par le backfill."""
+    user, other, _ = two_games
+    game = (await db_session.scalars(select(Game))).one()
+    mission = (await db_session.scalars(select(Mission))).one()
+    third = await _ended_lobby(db_session, game, mission, "THIRD3", [(user, 3, True), (other, 1, False)])
+    await db_session.commit()
+
+    games = await UserStatsService(db_session).backfill(chunk_size=2)
+    await db_session.commit()
+
+    assert games == 3
+    assert await db_session.get(GameArchive, third.id) is not None
+    stats = await _stats_by_user(db_session)
+    # (parties jouées, gagnées, missions réussies, score cumulé)
+    assert stats[user.id] == (3, 2, 2, 10)
+    assert stats[other.id] == (3, 1, 1, 7)
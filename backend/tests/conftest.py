@@ -6,12 +6,19 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
+import asyncio
+import os
+
 import pytest
 from httpx import AsyncClient, ASGITransport
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from db.database import Base, engine, get_async_session
+from db.database import Base, get_async_session, get_engine
 from main import app
 from models import *  # Import all models so Base.metadata knows about them
 from repositories.user_repository import UserRepository
@@ -23,32 +30,102 @@ from services.auth.link_builder import NotificationLinkBuilder
 from services.notifications.interface import NotificationService
 from services.notifications.dependencies import get_notification_service as get_notification_service_dependency
 from tests.api.helpers import init_game_types
+from tests.query_budget import QueryRecorder
+from utils import password_hashing
 
 
 default_db_url = "sqlite+aiosqlite:///:memory:"
 
-# Créer un moteur de test avec SQLite en mémoire
+
+def worker_database_url(url: str, worker: str | None) -> str:
+    """
+    Une base par worker pytest-xdist (``gw0``, ``gw1``…) : suffixe du fichier SQLite ou
+    du nom de la base PostgreSQL. SQLite en mémoire est déjà propre à chaque processus.
+    """
+    parsed = make_url(url)
+    if not worker or not parsed.database or parsed.database == ":memory:":
+        return url
+    if parsed.get_backend_name() == "sqlite":
+        stem, dot, suffix = parsed.database.rpartition(".")
+        database = f"{stem}_{worker}.{suffix}" if dot else f"{parsed.database}_{worker}"
+    else:
+        database = f"{parsed.database}_{worker}"
+    return parsed.set(database=database).render_as_string(hide_password=False)
+
+
+# TEST_DATABASE_URL : autre base de test (fichier SQLite, PostgreSQL), SQLite en mémoire par défaut
+test_db_url = worker_database_url(
+    os.environ.get("TEST_DATABASE_URL", default_db_url), os.environ.get("PYTEST_XDIST_WORKER"),
+)
+is_sqlite = make_url(test_db_url).get_backend_name() == "sqlite"
+
+# Créer un moteur de test ; SQLite : une seule connexion partagée (la base en mémoire vit
+# dans cette connexion). Ailleurs, pas de pool : chaque test a sa propre boucle d'événements.
 test_engine = create_async_engine(
-    default_db_url,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+    test_db_url,
+    **(
+        {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+        if is_sqlite else {"poolclass": NullPool}
+    ),
     echo=False,
 )
 
-# Session factory pour les tests
-TestSessionLocal = async_sessionmaker(
-    test_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+if is_sqlite:
+    # pysqlite gère mal les SAVEPOINT : transactions émises explicitement
+    @event.listens_for(test_engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(test_engine.sync_engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+def session_factory(connection, join_transaction_mode: str = "create_savepoint") -> async_sessionmaker:
+    """
+    Sessions liées à la transaction du test, annulée à la fin du test : leurs ``commit()``
+    ne libèrent qu'un SAVEPOINT (``create_savepoint``) ou ne font rien (``rollback_only``).
+    """
+    return async_sessionmaker(
+        connection,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+        join_transaction_mode=join_transaction_mode,
+    )
+
+
+# Les hash argon2 par défaut coûtent ~0,2 s (inscription, connexion) : paramètres minimaux
+# pour les tests, le hash reste un vrai argon2 vérifié par le même code
+password_hashing.password_hasher = PasswordHash((Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1),))
+
+# Enregistre les instructions SQL par requête HTTP (budgets) et pour toute la suite (rapport)
+query_recorder = QueryRecorder()
+query_recorder.attach(test_engine)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--sql-report",
+        action="store_true",
+        default=False,
+        help="Affiche les instructions SQL les plus fréquentes et les plus coûteuses de la suite.",
+    )
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not config.getoption("--sql-report"):
+        return
+    terminalreporter.section("SQL report")
+    for line in query_recorder.report():
+        terminalreporter.write_line(line)
 
 
 @pytest.fixture(scope="session")
 def production_engine():
     """Fixture pour l'engine de production (réelle)."""
-    return engine
+    return get_engine()
 
 
 @pytest.fixture(scope="function", autouse=False)
@@ -67,18 +144,49 @@ async def cleanup_production_connections(production_engine):
         pass
 
 
+@pytest.fixture(scope="session")
+def database_schema():
+    """Schéma créé une seule fois pour toute la session (par worker)."""
+    async def create_schema():
+        async with test_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def drop_schema():
+        async with test_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await test_engine.dispose()
+
+    asyncio.run(create_schema())
+    yield
+    asyncio.run(drop_schema())
+
+
 @pytest.fixture(scope="function")
-async def db_session():
-    """Create a test database session for each test."""
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+async def db_connection(database_schema):
+    """Connexion du test, dans une transaction annulée à la fin du test."""
+    async with test_engine.connect() as connection:
+        transaction = await connection.begin()
+        yield connection
+        await transaction.rollback()
+
 
-    async with TestSessionLocal() as session:
+@pytest.fixture(scope="function")
+async def db_session(db_connection):
+    """Create a test database session for each test (rolled back with the test transaction)."""
+    async with session_factory(db_connection)() as session:
         yield session
-        await session.rollback()
 
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+
+@pytest.fixture(scope="function")
+def session_maker(db_connection):
+    """
+    Session factory du test, pour les tâches de fond qui ouvrent leurs propres sessions.
+
+    Sans SAVEPOINT : ces sessions tournent en même temps que ``db_session`` sur la même
+    connexion, et des SAVEPOINT entrelacés (libérés dans le désordre) seraient invalides.
+    """
+    return session_factory(db_connection, "rollback_only")
 
 
 @pytest.fixture(scope="function")
@@ -95,12 +203,27 @@ async def client(db_session, notification_service):
     app.dependency_overrides[get_notification_service_dependency] = lambda: notification_service
 
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as test_client:
+    async with AsyncClient(
+        transport=transport,
+        base_url="http://test",
+        event_hooks=query_recorder.event_hooks(),
+    ) as test_client:
         yield test_client
 
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def assert_max_queries():
+    """
+    Budget de requêtes SQL par requête HTTP :
+
+        with assert_max_queries(3):
+            await client.get("/api/lobbies/...")
+    """
+    return query_recorder.budget
+
+
 class DummyNotificationService(NotificationService):
     def __init__(self) -> None:
         self.calls = []
@@ -163,10 +286,3 @@ async def initialized_game_types(db_session, game_type_repository):
     """
     game_types = await init_game_types(game_type_repository)
     return game_type_repository, game_types
-
-
-@pytest.fixture(scope="session", autouse=True)
-async def setup_test_db():
-    """Setup test database and clean up after all tests."""
-    yield
-    await test_engine.dispose()
@@ -0,0 +1,72 @@
+"""
+Fabriques de données pour les tests : une instruction INSERT multi-lignes par table.
+
+Plus rapides que ``create_user_and_get_token`` (inscription puis connexion HTTP, deux
+calculs argon2 par utilisateur) quand un test a besoin de nombreux utilisateurs ou
+joueurs sans tester l'authentification elle-même :
+
+    users = await create_users(db_session, 5)
+    players = await create_players(db_session, lobby.id, users)
+    headers = auth_headers(auth_service, users[0])
+"""
+from functools import cache
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Player, PlayerStatus, User
+from services.auth import AuthenticationService
+from utils.password_hashing import hash_password
+from tests.api.helpers import get_auth_headers
+
+
+DEFAULT_PASSWORD = "password123"
+
+
+@cache
+def _password_hash(password: str) -> str:
+    return hash_password(password)
+
+
+async def create_users(
+    session: AsyncSession,
+    count: int,
+    prefix: str = "user",
+    password: str = DEFAULT_PASSWORD,
+    is_active: bool = True,
+) -> list[User]:
+    """Crée ``count`` utilisateurs (``{prefix}{i}`` / ``{prefix}{i}@test.com``), même mot de passe."""
+    result = await session.scalars(
+        insert(User).returning(User),
+        [
+            {
+                "username": f"{prefix}{index}",
+                "email": f"{prefix}{index}@test.com",
+                "hashed_password": _password_hash(password),
+                "is_active": is_active,
+            }
+            for index in range(count)
+        ],
+    )
+    return list(result)
+
+
+async def create_players(
+    session: AsyncSession,
+    lobby_id: UUID,
+    users: Sequence[User],
+    status: PlayerStatus = PlayerStatus.WAITING,
+) -> list[Player]:
+    """Inscrit les utilisateurs dans le lobby."""
+    result = await session.scalars(
+        insert(Player).returning(Player),
+        [{"lobby_id": lobby_id, "user_id": user.id, "status": status} for user in users],
+    )
+    return list(result)
+
+
+def auth_headers(auth_service: AuthenticationService, user: User) -> dict:
+    """En-têtes d'authentification d'un utilisateur, sans passer par ``/auth/jwt/login``."""
+    return get_auth_headers(auth_service.create_access_token(user.id))
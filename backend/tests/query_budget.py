@@ -0,0 +1,143 @@
+"""
+Instrumentation SQL des tests : nombre de requêtes et latence par requête HTTP.
+
+Le ``QueryRecorder`` est branché sur le moteur de test (événements
+``before/after_cursor_execute``) et sur les hooks de ``httpx.AsyncClient`` :
+chaque requête HTTP ouvre une fenêtre qui collecte les instructions SQL exécutées.
+Les tests déclarent un budget via la fixture ``assert_max_queries`` :
+
+    async def test_get_lobby(client, assert_max_queries):
+        with assert_max_queries(3):
+            await client.get(f"/api/lobbies/{lobby_id}")
+"""
+from __future__ import annotations
+
+import contextlib
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+_WHITESPACE = re.compile(r"\s+")
+# "IN (?, ?, ?)" / "IN ($1, $2)" -> "IN (...)" pour regrouper les variantes d'une même requête
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|\$\d+|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|\$\d+|%\(\w+\)s|:\w+)\s*\)")
+# Mise en place du schéma de test (create_all / drop_all) et SAVEPOINT de l'isolation
+# des tests : exclus du rapport et des budgets
+_SCHEMA_PREFIXES = ("PRAGMA", "CREATE ", "DROP ", "BEGIN", "SAVEPOINT ", "RELEASE SAVEPOINT ", "ROLLBACK TO SAVEPOINT ")
+
+
+def normalize_statement(statement: str) -> str:
+    """Forme canonique d'une instruction SQL (espaces, listes de paramètres)."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAM_LIST.sub("(...)", statement)
+
+
+@dataclass
+class RequestWindow:
+    """Instructions SQL exécutées pendant une requête HTTP."""
+
+    label: str
+    statements: list[tuple[str, float]] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def describe(self) -> str:
+        lines = [f"{self.label}: {self.count} queries, {self.duration * 1000:.1f} ms"]
+        lines += [f"  {i}. {sql}" for i, (sql, _) in enumerate(self.statements, 1)]
+        return "\n".join(lines)
+
+
+class QueryRecorder:
+    """Enregistre les instructions SQL par requête HTTP et agrège les statistiques de la suite."""
+
+    def __init__(self) -> None:
+        self.windows: list[RequestWindow] = []
+        self._current: Optional[RequestWindow] = None
+        self._started_at: float = 0.0
+        # Statistiques cumulées : instruction normalisée -> [nombre, durée totale]
+        self.totals: dict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+
+    # -- branchement -----------------------------------------------------------------
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def event_hooks(self) -> dict:
+        """Hooks à passer à ``httpx.AsyncClient(event_hooks=...)``."""
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    # -- événements ------------------------------------------------------------------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        sql = normalize_statement(statement)
+        if sql.startswith(_SCHEMA_PREFIXES):
+            return
+        totals = self.totals[sql]
+        totals[0] += 1
+        totals[1] += elapsed
+        if self._current is not None:
+            self._current.statements.append((sql, elapsed))
+
+    async def _on_request(self, request) -> None:
+        self._current = RequestWindow(label=f"{request.method} {request.url.path}")
+        self._started_at = time.perf_counter()
+
+    async def _on_response(self, response) -> None:
+        if self._current is None:
+            return
+        self._current.duration = time.perf_counter() - self._started_at
+        self.windows.append(self._current)
+        self._current = None
+
+    # -- budgets ---------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def budget(self, max_queries: int, max_ms: float | None = None) -> Iterator[list[RequestWindow]]:
+        """
+        Vérifie que chaque requête HTTP émise dans le bloc respecte le budget
+        (nombre d'instructions SQL et, optionnellement, durée en millisecondes).
+        """
+        start = len(self.windows)
+        windows: list[RequestWindow] = []
+        yield windows
+        windows.extend(self.windows[start:])
+        assert windows, "assert_max_queries: no HTTP request was made inside the block"
+
+        errors = []
+        for window in windows:
+            if window.count > max_queries:
+                errors.append(f"expected at most {max_queries} queries\n{window.describe()}")
+            if max_ms is not None and window.duration * 1000 > max_ms:
+                errors.append(f"expected at most {max_ms} ms\n{window.describe()}")
+        assert not errors, "\n\n".join(errors)
+
+    # -- rapport ---------------------------------------------------------------------
+
+    def report(self, top: int = 10) -> list[str]:
+        """Lignes du rapport : instructions les plus fréquentes et les plus coûteuses."""
+        if not self.totals:
+            return []
+
+        def fmt(sql: str, count: float, total: float) -> str:
+            return f"{int(count):>6} x {total * 1000:>9.1f} ms  {sql[:120]}"
+
+        items = list(self.totals.items())
+        lines = [f"Top {top} SQL statements by count:"]
+        lines += [fmt(sql, *stats) for sql, stats in sorted(items, key=lambda i: i[1][0], reverse=True)[:top]]
+        lines.append(f"Top {top} SQL statements by total time:")
+        lines += [fmt(sql, *stats) for sql, stats in sorted(items, key=lambda i: i[1][1], reverse=True)[:top]]
+        return lines
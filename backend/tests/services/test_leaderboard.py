@@ -0,0 +1,51 @@
+"""
+Tests pour le classement en mémoire des lobbies.
+
+shortcut : uv run pytest tests/services/test_leaderboard.py -v
+"""
+import random
+
+from services.leaderboard import Leaderboard
+
+
+def _ranks(board: Leaderboard) -> dict:
+    return {entry.player_id: entry.rank for entry in board.standings()}
+
+
+def test_leaderboard_orders_by_score_then_arrival():
+    """Score décroissant, puis ordre d'arrivée à égalité."""
+    board = Leaderboard([("a", "ua", 1), ("b", "ub", 3), ("c", "uc", 1)])
+
+    assert [entry.player_id for entry in board.standings()] == ["b", "a", "c"]
+    assert board.rank_of("c") == 3
+
+
+def test_leaderboard_reports_only_rank_changes():
+    """Seuls le joueur déplacé et les joueurs dépassés sont signalés."""
+    board = Leaderboard([("a", "ua", 10), ("b", "ub", 8), ("c", "uc", 5), ("d", "ud", 1)])
+
+    changes = board.update_scores({"c": 9})
+
+    assert [(c.player_id, c.rank, c.previous_rank) for c in changes] == [("c", 2, 3), ("b", 3, 2)]
+    assert board.update_scores({"a": 10}) == []
+
+
+def test_leaderboard_batch_matches_full_sort():
+    """Une série de mises à jour donne le même classement qu'un tri complet."""
+    rng = random.Random(42)
+    players = [(f"p{i}", f"u{i}", rng.randint(0, 20)) for i in range(50)]
+    board = Leaderboard(players)
+    scores = {player_id: score for player_id, _, score in players}
+
+    for _ in range(20):
+        before = _ranks(board)
+        batch = {f"p{rng.randrange(50)}": rng.randint(0, 40) for _ in range(5)}
+        changes = board.update_scores(batch)
+        scores.update(batch)
+
+        order = sorted(scores, key=lambda pid: (-scores[pid], int(pid[1:])))
+        expected = {pid: rank for rank, pid in enumerate(order, 1)}
+        assert _ranks(board) == expected
+        moved = {pid for pid in expected if expected[pid] != before[pid]}
+        assert moved <= {c.player_id for c in changes}
+        assert all(c.previous_rank == before[c.player_id] for c in changes)
@@ -0,0 +1,79 @@
+"""
+Tests pour le janitor des lobbies abandonnés et terminés.
+
+shortcut : uv run pytest tests/services/test_lobby_janitor.py -v
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from models import (
+    Game, GameArchive, GameType, Lobby, LobbyStatus, Mission, MissionAssigned,
+    Player, PlayerStatus, Round, User,
+)
+from services.leaderboard import leaderboards
+from services.lobby_janitor import LobbyJanitor
+
+
+async def _lobby(db_session, game, host, name, status, age_seconds, players=()):
+    lobby = Lobby(name=name, code=name.upper()[:6], game_id=game.id, host_id=host.id, status=status)
+    db_session.add(lobby)
+    await db_session.flush()
+    for user, player_status in players:
+        db_session.add(Player(lobby_id=lobby.id, user_id=user.id, status=player_status, score=3))
+    await db_session.flush()
+    await db_session.execute(
+        update(Lobby)
+        .where(Lobby.id == lobby.id)
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(seconds=age_seconds))
+    )
+    return lobby
+
+
+@pytest.mark.asyncio
+async def test_janitor_expires_idle_lobbies_and_archives_ended_games(db_session, session_maker):
+    """Les lobbies abandonnés sont supprimés, les parties terminées archivées puis supprimées."""
+    host = User(email="host@test.com", username="host", hashed_password="x", is_active=True)
+    player = User(email="player@test.com", username="player", hashed_password="x", is_active=True)
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([host, player, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+
+    abandoned = await _lobby(db_session, game, host, "abandoned", LobbyStatus.WAITING, 7200,
+                             players=[(player, PlayerStatus.LEFT)])
+    waiting = await _lobby(db_session, game, host, "waiting", LobbyStatus.WAITING, 7200,
+                           players=[(player, PlayerStatus.WAITING)])
+    ended = await _lobby(db_session, game, host, "ended", LobbyStatus.ENDED, 7200,
+                         players=[(host, PlayerStatus.COMPLETED), (player, PlayerStatus.COMPLETED)])
+    recent = await _lobby(db_session, game, host, "recent", LobbyStatus.ENDED, 10)
+
+    mission = Mission(game_id=game.id, title="Mission", description="Test", difficulty=10)
+    db_session.add_all([mission, Round(lobby_id=ended.id, round_number=1)])
+    await db_session.flush()
+    ended_player = await db_session.scalar(select(Player).where(Player.lobby_id == ended.id).limit(1))
+    db_session.add(MissionAssigned(player_id=ended_player.id, mission_id=mission.id))
+    await db_session.commit()
+
+    leaderboards.load(str(ended.id), [])
+    deleted = []
+    janitor = LobbyJanitor(session_maker, idle_ttl=3600, ended_retention=600, batch_size=1, on_deleted=deleted.extend)
+    reclaimed = await janitor.run_once()
+
+    # abandoned : 1 joueur + lobby ; ended : 1 mission + 2 joueurs + 1 round + lobby
+    assert reclaimed == 2 + 5
+    assert deleted == [abandoned.id, ended.id]
+    assert leaderboards.get(str(ended.id)) is None
+    async with session_maker() as session:
+        remaining = set(await session.scalars(select(Lobby.id)))
+        assert remaining == {waiting.id, recent.id}
+        assert await session.scalar(select(func.count(MissionAssigned.id))) == 0
+
+        archive = await session.get(GameArchive, ended.id)
+        assert archive.player_count == 2
+        assert archive.round_count == 1
+        assert sum(len(p[3]) for p in archive.payload["players"]) == 1
+        assert await session.get(GameArchive, abandoned.id) is None
@@ -0,0 +1,160 @@
+"""
+Tests pour les timers de manche (roue temporelle hachée).
+
+shortcut : uv run pytest tests/services/test_round_timer.py -v
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from models import Game, GameType, Lobby, RoundTimer, User
+from models.lobby import LobbyPhase
+from services.round_timer import RoundTimerService, TimingWheel
+
+
+async def _lobbies(db_session, count):
+    host = User(email="host@test.com", username="host", hashed_password="x", is_active=True)
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([host, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    lobbies = [
+        Lobby(name=f"lobby{index}", code=f"TIMER{index}", game_id=game.id, host_id=host.id)
+        for index in range(count)
+    ]
+    db_session.add_all(lobbies)
+    await db_session.commit()
+    return [lobby.id for lobby in lobbies]
+
+
+def test_timing_wheel_expires_after_several_revolutions():
+    """Un timer plus long qu'un tour de roue expire exactement au bon tick ; l'annulation est O(1)."""
+    wheel = TimingWheel(size=4)
+    wheel.schedule("short", 1)
+    wheel.schedule("long", 10)
+    wheel.schedule("cancelled", 2)
+    assert wheel.cancel("cancelled")
+
+    fired = {tick: wheel.advance() for tick in range(1, 12)}
+
+    assert fired[1] == ["short"]
+    assert fired[10] == ["long"]
+    assert sum(len(keys) for keys in fired.values()) == 2
+    assert len(wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_round_timer_fires_and_cancels(db_session, session_maker):
+    """Un seul pilote pour tous les lobbies : les timers échus déclenchent le callback, les annulés non."""
+    fired = []
+
+    async def on_expire(lobby_id):
+        fired.append(lobby_id)
+
+    first, second, cancelled = await _lobbies(db_session, 3)
+    timers = RoundTimerService(on_expire, session_maker, tick=0.01, wheel_size=8)
+    timers.start()
+    try:
+        await timers.schedule(first, 0.05)
+        await timers.schedule(second, 0.12)
+        await timers.schedule(cancelled, 0.05)
+        assert await timers.cancel(cancelled)
+        await asyncio.sleep(0.3)
+    finally:
+        await timers.stop()
+
+    assert fired == [first, second]
+    assert timers.remaining(first) is None
+    # Les échéances passées ne sont plus persistées
+    assert (await db_session.execute(select(RoundTimer))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_round_timer_pause_resume_keeps_remaining_time(db_session, session_maker):
+    """La pause fige le temps restant (persisté) et la reprise repart de ce temps."""
+    fired = []
+
+    async def on_expire(lobby_id):
+        fired.append(lobby_id)
+
+    (lobby_id,) = await _lobbies(db_session, 1)
+    timers = RoundTimerService(on_expire, session_maker, tick=0.01, wheel_size=8)
+    timers.start()
+    try:
+        await timers.schedule(lobby_id, 0.2)
+        await asyncio.sleep(0.05)
+        remaining = await timers.pause(lobby_id)
+        assert 0.1 < remaining <= 0.16
+
+        await asyncio.sleep(0.3)
+        assert fired == []
+        assert timers.is_paused(lobby_id)
+        persisted = await db_session.get(RoundTimer, lobby_id)
+        assert persisted.deadline_at is None
+        assert persisted.remaining_seconds == pytest.approx(remaining)
+
+        assert await timers.resume(lobby_id) == remaining
+        await asyncio.sleep(remaining + 0.1)
+    finally:
+        await timers.stop()
+
+    assert fired == [lobby_id]
+
+
+@pytest.mark.asyncio
+async def test_round_timer_restores_persisted_deadlines(db_session, session_maker):
+    """Au redémarrage, les échéances persistées sont réarmées ; celles déjà dépassées expirent aussitôt."""
+    fired = []
+
+    async def on_expire(lobby_id):
+        fired.append(lobby_id)
+
+    overdue, upcoming, paused = await _lobbies(db_session, 3)
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        RoundTimer(lobby_id=overdue, deadline_at=now - timedelta(seconds=5)),
+        RoundTimer(lobby_id=upcoming, deadline_at=now + timedelta(seconds=60)),
+        RoundTimer(lobby_id=paused, deadline_at=None, remaining_seconds=42.0),
+    ])
+    await db_session.commit()
+
+    timers = RoundTimerService(on_expire, session_maker, tick=0.01, wheel_size=8)
+    timers.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        await timers.stop()
+
+    assert fired == [overdue]
+    assert 59 < timers.remaining(upcoming) <= 60
+    assert timers.remaining(paused) == 42.0
+    assert timers.remaining(uuid.uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_round_timer_default_callback_moves_lobby_to_validation(db_session, session_maker):
+    """Sans callback fourni, l'échéance passe le lobby en phase de validation et l'annonce une seule fois."""
+    broadcasts = []
+
+    async def broadcast(event, data, lobby_id):
+        broadcasts.append((event, data, lobby_id))
+
+    lobby_id, other = await _lobbies(db_session, 2)
+    timers = RoundTimerService(session_maker=session_maker, tick=0.01, wheel_size=8, broadcast=broadcast)
+    timers.start()
+    try:
+        await timers.schedule(lobby_id, 0.03)
+        await asyncio.sleep(0.15)
+    finally:
+        await timers.stop()
+    # Déjà en validation : rien à annoncer
+    assert await timers.transition_to_validation(lobby_id) is False
+
+    phases = dict((await db_session.execute(select(Lobby.id, Lobby.phase))).all())
+    assert phases == {lobby_id: LobbyPhase.VALIDATION, other: LobbyPhase.NONE}
+    assert broadcasts == [("phase_changed", {"lobby_id": str(lobby_id), "phase": "validation"}, str(lobby_id))]
@@ -0,0 +1,105 @@
+"""
+Tests pour le service de scoring (validation des missions).
+
+shortcut : uv run pytest tests/services/test_scoring_service.py -v
+"""
+import pytest
+from sqlalchemy import select
+
+from models import (
+    Game, GameType, Lobby, Mission, MissionAssigned, MissionAssignedStatus, Player, User,
+)
+from models.lobby import LobbyPhase
+from services.leaderboard import LeaderboardRegistry
+from services.scoring_service import ScoringService, mission_points
+
+
+@pytest.fixture
+async def validation_lobby(db_session):
+    """Lobby en phase de validation : 3 joueurs, une mission active chacun."""
+    users = [User(email=f"u{i}@test.com", username=f"u{i}", hashed_password="x") for i in range(3)]
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([*users, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    lobby = Lobby(name="Lobby", code="SCORE2", game_id=game.id, host_id=users[0].id, phase=LobbyPhase.VALIDATION)
+    mission = Mission(game_id=game.id, title="Mission", description="Test", difficulty=60)
+    db_session.add_all([lobby, mission])
+    await db_session.flush()
+    players = [Player(lobby_id=lobby.id, user_id=user.id, score=score) for user, score in zip(users, [4, 2, 0])]
+    db_session.add_all(players)
+    await db_session.flush()
+    assignments = [MissionAssigned(player_id=player.id, mission_id=mission.id) for player in players]
+    db_session.add_all(assignments)
+    await db_session.flush()
+    return lobby, users, players, assignments
+
+
+@pytest.mark.asyncio
+async def test_validate_missions_increments_scores_and_reports_rank_changes(db_session, validation_lobby):
+    """Les scores sont incrémentés en base et seuls les changements de rang sont retournés."""
+    lobby, users, players, assignments = validation_lobby
+    service = ScoringService(db_session, LeaderboardRegistry())
+
+    changes = await service.validate_missions(lobby.id, {
+        assignments[2].id: MissionAssignedStatus.COMPLETED,
+        assignments[1].id: MissionAssignedStatus.FAILED,
+    }, validated_by=users[0].id)
+
+    points = mission_points(60)
+    assert points == 3
+    assert [(c.player_id, c.score, c.rank, c.previous_rank) for c in changes] == [
+        (str(players[2].id), 3, 2, 3),
+        (str(players[1].id), 2, 3, 2),
+    ]
+    scores = dict((await db_session.execute(select(Player.id, Player.score))).all())
+    assert scores[players[2].id] == 3
+
+    # Une mission déjà résolue ne rapporte pas de points une seconde fois
+    again = await service.validate_missions(lobby.id, {assignments[2].id: MissionAssignedStatus.COMPLETED})
+    assert again == []
+
+
+@pytest.mark.asyncio
+async def test_validate_missions_requires_host_and_validation_phase(db_session, validation_lobby):
+    """Seul l'hôte valide, et uniquement en phase de validation."""
+    lobby, users, _, assignments = validation_lobby
+    service = ScoringService(db_session, LeaderboardRegistry())
+    results = {assignments[0].id: MissionAssignedStatus.COMPLETED}
+
+    with pytest.raises(PermissionError):
+        await service.validate_missions(lobby.id, results, validated_by=users[1].id)
+
+    lobby.phase = LobbyPhase.ROUND
+    await db_session.flush()
+    with pytest.raises(ValueError):
+        await service.validate_missions(lobby.id, results, validated_by=users[0].id)
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_reloaded_for_late_joiner_and_dropped_on_rollback(db_session, validation_lobby):
+    """Un joueur arrivé après le chargement du classement y figure ; une transaction annulée oublie le classement."""
+    lobby, users, players, assignments = validation_lobby
+    registry = LeaderboardRegistry()
+    service = ScoringService(db_session, registry)
+    await service.validate_missions(lobby.id, {assignments[1].id: MissionAssignedStatus.COMPLETED})
+    assert len(registry.get(str(lobby.id))) == 3
+
+    late_user = User(email="late@test.com", username="late", hashed_password="x")
+    db_session.add(late_user)
+    await db_session.flush()
+    late = Player(lobby_id=lobby.id, user_id=late_user.id, score=10)
+    db_session.add(late)
+    await db_session.flush()
+    late_assignment = MissionAssigned(player_id=late.id, mission_id=assignments[0].mission_id)
+    db_session.add(late_assignment)
+    await db_session.flush()
+
+    changes = await service.validate_missions(lobby.id, {late_assignment.id: MissionAssignedStatus.COMPLETED})
+    assert [(c.player_id, c.score, c.rank, c.previous_rank) for c in changes][0] == (str(late.id), 13, 1, 1)
+    assert str(late.id) in registry.get(str(lobby.id))
+
+    await db_session.rollback()
+    assert registry.get(str(lobby.id)) is None
@@ -0,0 +1,76 @@
+"""
+Tests pour la configuration de logs structurés.
+
+shortcut : uv run pytest tests/test_logging_config.py -v
+"""
+import json
+import logging
+import queue
+import sys
+
+from core.logging_config import ContextFilter, DeferredQueueHandler, JsonFormatter, SamplingFilter, log_context, parse_sample_rates
+
+
+def _record(name: str = "websocket.connexion_manager", level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, "hello %s", ("world",), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_includes_context_and_extra():
+    """Les identifiants de corrélation et les champs extra sont sérialisés en JSON."""
+    record = _record(user_id="u-1")
+    with log_context(request_id="req-1", sid="sid-1", lobby_id="L1"):
+        ContextFilter().filter(record)
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["level"] == "INFO"
+    assert payload["request_id"] == "req-1"
+    assert payload["sid"] == "sid-1"
+    assert payload["lobby_id"] == "L1"
+    assert payload["user_id"] == "u-1"
+
+
+def test_context_is_reset_after_block():
+    """Le contexte ne fuit pas hors du bloc ``log_context``."""
+    with log_context(sid="sid-1"):
+        pass
+    record = _record()
+    ContextFilter().filter(record)
+    assert record.sid is None
+
+
+def test_sampling_filter_by_module():
+    """Les INFO d'un module échantillonné à 0 sont ignorés, pas les WARNING."""
+    sampling = SamplingFilter(parse_sample_rates("websocket=0, websocket.reaper=1"))
+
+    assert sampling.filter(_record("websocket.connexion_manager")) is False
+    assert sampling.filter(_record("websocket.reaper")) is True
+    assert sampling.filter(_record("websocket.connexion_manager", logging.WARNING)) is True
+    assert sampling.filter(_record("api.lobby")) is True
+
+
+def test_queue_handler_defers_formatting_to_the_listener():
+    """Le record empilé garde ``args`` et ``exc_info`` : message et trace restent séparés."""
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("api.lobby", logging.ERROR, __file__, 1, "hello %s", ("world",), None)
+        record.exc_info = sys.exc_info()
+    with log_context(request_id="req-1"):
+        handler.handle(record)
+
+    queued = log_queue.get_nowait()
+    assert queued.args == ("world",)
+    assert queued.exc_info is not None
+    assert queued.request_id == "req-1"
+
+    payload = json.loads(JsonFormatter().format(queued))
+    assert payload["message"] == "hello world"
+    assert "ValueError: boom" in payload["exc_info"]
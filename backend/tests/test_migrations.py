@@ -0,0 +1,115 @@
+"""
+Tests pour les migrations versionnées et la vérification du schéma au démarrage.
+
+shortcut : uv run pytest tests/test_migrations.py -v
+"""
+import uuid
+
+import pytest
+from sqlalchemy import event, insert, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from db.database import Base
+from db.migrations import LATEST_VERSION, MIGRATIONS, Migration, SchemaVersionError, ensure_schema, v0001_initial
+from models import ChatMessage, Mission
+
+
+@pytest.fixture
+async def empty_engine():
+    """Base SQLite vide, distincte de la base de test."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    yield engine
+    await engine.dispose()
+
+
+async def _tables(engine) -> set[str]:
+    async with engine.connect() as connection:
+        return set(await connection.run_sync(lambda sync: inspect(sync).get_table_names()))
+
+
+@pytest.mark.asyncio
+async def test_ensure_schema_migrates_then_checks_with_one_query(empty_engine):
+    """Première fois : migrations appliquées et versionnées ; ensuite, une seule requête."""
+    assert await ensure_schema(empty_engine) == LATEST_VERSION
+    assert {"schema_version", "users", "lobbies", "missions"} <= await _tables(empty_engine)
+
+    statements = []
+    event.listen(empty_engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    assert await ensure_schema(empty_engine) == LATEST_VERSION
+    assert len(statements) == 1
+    assert "schema_version" in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_pending_migrations_are_applied_once_in_order(empty_engine):
+    """Seules les migrations plus récentes que la version enregistrée sont appliquées."""
+    await ensure_schema(empty_engine)
+    applied = []
+
+    async def add_notes(connection):
+        applied.append(2)
+        await connection.execute(text("CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY)"))
+
+    migrations = [*MIGRATIONS, Migration(LATEST_VERSION + 1, "Notes", add_notes)]
+
+    assert await ensure_schema(empty_engine, migrations=migrations) == LATEST_VERSION + 1
+    assert await ensure_schema(empty_engine, migrations=migrations) == LATEST_VERSION + 1
+    assert applied == [2]
+    assert "notes" in await _tables(empty_engine)
+
+
+@pytest.mark.asyncio
+async def test_outdated_schema_without_auto_migrate(empty_engine):
+    """Sans migration automatique, un schéma en retard empêche le démarrage."""
+    with pytest.raises(SchemaVersionError):
+        await ensure_schema(empty_engine, auto_migrate=False)
+
+    assert "schema_version" not in await _tables(empty_engine)
+
+
+async def _columns(engine) -> dict[str, set[str]]:
+    def read(sync):
+        inspector = inspect(sync)
+        return {table: {column["name"] for column in inspector.get_columns(table)} for table in inspector.get_table_names()}
+
+    async with engine.connect() as connection:
+        return await connection.run_sync(read)
+
+
+@pytest.mark.asyncio
+async def test_migrated_schema_matches_models(empty_engine):
+    """Une base migrée a les tables et colonnes des modèles : tout changement de modèle a sa migration."""
+    await ensure_schema(empty_engine)
+
+    columns = await _columns(empty_engine)
+    columns.pop("schema_version")
+    assert columns == {table.name: {column.name for column in table.columns} for table in Base.metadata.sorted_tables}
+
+
+@pytest.mark.asyncio
+async def test_database_created_before_migrations_is_upgraded(empty_engine):
+    """Base créée par l'ancien create_all (schéma initial, sans schema_version) : mise à niveau puis utilisable."""
+    tables = v0001_initial.metadata.tables
+    game_id = uuid.uuid4()
+    async with empty_engine.begin() as connection:
+        await v0001_initial.upgrade(connection)
+        await connection.execute(insert(tables["games"]).values(
+            id=game_id, name="Cluedo", description="Enquête", min_players=2, max_players=6,
+        ))
+        await connection.execute(insert(tables["missions"]).values(
+            id=uuid.uuid4(), game_id=game_id, title="Alibi", type="MISSION", description="d", difficulty=10,
+        ))
+    assert "is_known_by_player" not in (await _columns(empty_engine))["missions"]
+
+    assert await ensure_schema(empty_engine) == LATEST_VERSION
+
+    async with AsyncSession(empty_engine) as session:
+        mission = (await session.execute(select(Mission))).scalar_one()
+        assert mission.title == "Alibi"
+        assert mission.is_known_by_player is True
+        assert mission.is_known_by_others is False
+        session.add(ChatMessage(lobby_id=uuid.uuid4(), user_id=uuid.uuid4(), content="salut"))
+        await session.flush()
+    assert {"round_timers", "game_archive", "user_stats", "chat_messages"} <= await _tables(empty_engine)
@@ -0,0 +1,46 @@
+"""
+Tests pour le lanceur de production (python -m server).
+
+shortcut : uv run pytest tests/test_server.py -v
+"""
+import pytest
+
+from server import build_config, check_socketio, parse_args
+from websocket.socket_server import build_client_manager
+
+
+def test_several_workers_require_websocket_transport_or_sticky_sessions():
+    """Le long-polling sans sessions collantes est refusé dès qu'il y a plusieurs workers."""
+    errors, _ = check_socketio(4, ["polling", "websocket"], "redis://localhost", sticky=False)
+    assert errors
+
+    assert check_socketio(4, ["websocket"], "redis://localhost", sticky=False) == ([], [])
+    assert check_socketio(4, ["polling", "websocket"], "redis://localhost", sticky=True) == ([], [])
+    assert check_socketio(1, ["polling", "websocket"], None, sticky=False) == ([], [])
+
+
+def test_several_workers_without_message_queue_warn():
+    """Sans file partagée, les événements restent locaux au worker : avertissement."""
+    errors, warnings = check_socketio(2, ["websocket"], None, sticky=False)
+
+    assert errors == []
+    assert len(warnings) == 1
+
+
+def test_build_config_uses_fast_loop_and_graceful_timeouts():
+    """uvloop/httptools quand ils sont installés, délais d'arrêt et de keep-alive transmis."""
+    pytest.importorskip("uvloop")
+    pytest.importorskip("httptools")
+    config = build_config(parse_args(["--workers", "8", "--timeout-graceful-shutdown", "12"]))
+
+    assert config["app"] == "main:app"
+    assert config["workers"] == 8
+    assert (config["loop"], config["http"]) == ("uvloop", "httptools")
+    assert config["timeout_graceful_shutdown"] == 12
+
+
+def test_client_manager_from_message_queue_url():
+    """Pas d'URL : gestionnaire local ; schéma inconnu : erreur explicite."""
+    assert build_client_manager(None) is None
+    with pytest.raises(ValueError):
+        build_client_manager("kafka://localhost")
@@ -0,0 +1,87 @@
+"""
+Tests pour l'arrêt coordonné : annonce aux sockets, échéance du vidage, chaînage des signaux.
+
+shortcut : uv run pytest tests/test_shutdown.py -v
+"""
+import asyncio
+import os
+import signal
+
+import pytest
+
+from core import shutdown as shutdown_module
+from core.shutdown import GracefulShutdown
+from websocket.connexion_manager import ConnexionManager, WebSocketUser
+from tests.websocket.helpers import FakeSioServer
+
+
+ALICE = WebSocketUser(id="u-alice", username="alice")
+BOB = WebSocketUser(id="u-bob", username="bob")
+
+
+@pytest.mark.asyncio
+async def test_flush_abandons_slow_step_and_runs_the_next_ones(monkeypatch):
+    """Une étape qui dépasse l'échéance est abandonnée ; les suivantes tournent quand même."""
+    monkeypatch.setattr(shutdown_module, "MIN_STEP_SECONDS", 0.05)
+    ran = []
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        ran.append("fast")
+
+    durations = await GracefulShutdown(timeout=0).flush([("slow", slow), ("fast", fast)])
+
+    assert durations["slow"] is None
+    assert ran == ["fast"]
+
+
+@pytest.mark.asyncio
+async def test_signal_runs_hooks_once_then_forwards_to_previous_handler():
+    """Au signal : étapes d'annonce d'abord, puis le gestionnaire précédent (uvicorn)."""
+    order = []
+    previous = signal.signal(signal.SIGUSR1, lambda sig, frame: order.append("previous"))
+    shutdown = GracefulShutdown(timeout=1, signals=(signal.SIGUSR1,))
+
+    async def announce():
+        order.append("announce")
+
+    shutdown.on_signal("announce", announce)
+    try:
+        shutdown.install()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        for _ in range(50):
+            if "previous" in order:
+                break
+            await asyncio.sleep(0.01)
+        await shutdown.drain()
+    finally:
+        shutdown.uninstall()
+        signal.signal(signal.SIGUSR1, previous)
+
+    assert order == ["announce", "previous"]
+    assert shutdown.draining is True
+
+
+@pytest.mark.asyncio
+async def test_announce_restart_spreads_reconnects_and_stays_quiet():
+    """Chaque socket reçoit son délai puis est déconnecté, sans user_left ni bascule d'hôte."""
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    for sid, user in (("s1", ALICE), ("s2", BOB)):
+        await manager.register_connection(sid, user)
+        await manager.join_lobby(sid, "L1")
+
+    assert await manager.announce_restart(reconnect_delay=2, reconnect_jitter=8) == 2
+
+    hints = sio.events("server_restarting")
+    assert {to for _, _, _, to in hints} == {"s1", "s2"}
+    assert all(2 <= data["reconnect_in"] <= 10 for _, data, _, _ in hints)
+    assert sorted(sio.disconnected) == ["s1", "s2"]
+
+    # Le serveur Socket.IO appelle ensuite le gestionnaire disconnect
+    for sid in ("s1", "s2"):
+        await manager.remove_connection(sid)
+    assert sio.events("user_left") == []
+    assert not manager.host_migration._pending
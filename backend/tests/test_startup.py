@@ -0,0 +1,41 @@
+"""
+Tests pour le démarrage à froid : ce que ``import main`` ne doit plus charger.
+
+shortcut : uv run pytest tests/test_startup.py -v
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from db import database
+
+
+backend_dir = Path(__file__).parent.parent
+
+DEFERRED_MODULES = [
+    "socketio", "engineio", "requests", "aiosmtplib", "asyncpg", "pwdlib", "websocket.socket_server",
+    "services.lobby_janitor", "services.round_timer",
+]
+
+
+def test_import_main_defers_rarely_used_subsystems():
+    """Serveur Socket.IO, tâches de fond, pilote, SMTP et argon2 sont chargés au démarrage ou au premier usage."""
+    code = f"import json, sys, main; print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=backend_dir, capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+@pytest.mark.asyncio
+async def test_session_maker_creates_the_engine_on_first_session(monkeypatch):
+    """La première session ouverte crée le moteur et y lie la session factory."""
+    monkeypatch.setattr(database, "engine", None)
+    monkeypatch.setattr(database.async_session_maker, "kw", {**database.async_session_maker.kw, "bind": None})
+
+    async with database.async_session_maker() as session:
+        assert database.engine is not None
+        assert session.bind is database.engine
+    await database.close_db()
@@ -0,0 +1,35 @@
+"""
+Tests pour l'unité de travail (une transaction par requête).
+
+shortcut : uv run pytest tests/test_unit_of_work.py -v
+"""
+import pytest
+from sqlalchemy import func, select
+
+from db.unit_of_work import UnitOfWork
+from models import Tag
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_on_success(db_session):
+    """Les écritures flushées sont validées une seule fois à la sortie du bloc."""
+    async with UnitOfWork(db_session):
+        db_session.add(Tag(name="coop"))
+        await db_session.flush()
+
+    assert not db_session.in_transaction()
+    count = await db_session.scalar(select(func.count(Tag.id)))
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error(db_session):
+    """Une exception annule toutes les écritures de l'unité de travail."""
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork(db_session):
+            db_session.add(Tag(name="coop"))
+            await db_session.flush()
+            raise RuntimeError("boom")
+
+    count = await db_session.scalar(select(func.count(Tag.id)))
+    assert count == 0
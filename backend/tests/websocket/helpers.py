@@ -0,0 +1,63 @@
+"""
+Helpers pour les tests WebSocket.
+"""
+from collections import defaultdict
+from types import SimpleNamespace
+
+
+class FakeClientManager:
+    """Remplace le client manager Socket.IO (sids connectés, mapping eio)."""
+
+    def __init__(self) -> None:
+        self.connected: set[str] = set()
+
+    def is_connected(self, sid, namespace):
+        return sid in self.connected
+
+    def eio_sid_from_sid(self, sid, namespace):
+        return f"eio-{sid}"
+
+
+class FakeSioServer:
+    """Remplace ``socketio.AsyncServer`` : enregistre les rooms et les émissions."""
+
+    def __init__(self) -> None:
+        self.rooms: dict[str, set[str]] = defaultdict(set)
+        self.sessions: dict[str, dict] = {}
+        self.emitted: list[tuple[str, dict, str | None, str | None]] = []
+        self.skipped: list[set[str]] = []        # skip_sid de chaque émission (même index)
+        self.disconnected: list[str] = []
+        self.manager = FakeClientManager()
+        self.eio = SimpleNamespace(sockets={})
+
+    def connect(self, sid: str, last_ping: float | None = None) -> None:
+        """Simule un socket Engine.IO vivant pour ``sid``."""
+        self.manager.connected.add(sid)
+        self.eio.sockets[f"eio-{sid}"] = SimpleNamespace(closed=False, last_ping=last_ping)
+
+    async def save_session(self, sid, session):
+        self.sessions[sid] = session
+
+    async def enter_room(self, sid, room):
+        self.rooms[room].add(sid)
+
+    async def leave_room(self, sid, room):
+        self.rooms[room].discard(sid)
+
+    async def emit(self, event, data, room=None, to=None, skip_sid=None, **kwargs):
+        self.emitted.append((event, data, room, to))
+        self.skipped.append({skip_sid} if isinstance(skip_sid, str) else set(skip_sid or ()))
+
+    async def disconnect(self, sid, **kwargs):
+        self.disconnected.append(sid)
+
+    def received(self, sid: str) -> list[tuple[str, dict]]:
+        """Émissions effectivement reçues par ``sid`` (room, destinataire direct, ``skip_sid``)."""
+        return [
+            (event, data)
+            for (event, data, room, to), skipped in zip(self.emitted, self.skipped)
+            if sid not in skipped and (sid in (room, to) or sid in self.rooms.get(room or to, ()))
+        ]
+
+    def events(self, name: str) -> list:
+        return [e for e in self.emitted if e[0] == name]
@@ -0,0 +1,184 @@
+"""
+Tests pour le chat des lobbies (tampon circulaire, limite de débit, persistance par lots).
+
+shortcut : uv run pytest tests/websocket/test_chat.py -v
+"""
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from models import ChatMessage, Game, GameType, Lobby, User
+from websocket.chat import ChatPersister, LobbyChat, TokenBucket
+from websocket.connexion_manager import ConnexionManager, WebSocketUser
+from tests.websocket.helpers import FakeSioServer
+
+
+ALICE = WebSocketUser(id="u-alice", username="alice")
+BOB = WebSocketUser(id="u-bob", username="bob")
+
+
+async def _manager(*users):
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    for user in users:
+        await manager.register_connection(f"sid-{user.username}", user)
+        await manager.join_lobby(f"sid-{user.username}", "L1")
+    return manager, sio
+
+
+def test_token_bucket_allows_burst_then_refills():
+    """Une rafale de ``capacity`` messages passe, puis un jeton par 1/rate secondes."""
+    bucket = TokenBucket(rate=2.0, capacity=3)
+    bucket.updated = now = 100.0
+
+    assert [bucket.allow(now) for _ in range(4)] == [True, True, True, False]
+    assert bucket.allow(now + 0.25) is False
+    assert bucket.allow(now + 0.5) is True
+
+
+@pytest.mark.asyncio
+async def test_chat_history_is_a_bounded_ring_buffer():
+    """Les messages sont diffusés au lobby ; un nouvel arrivant reçoit les N derniers depuis la mémoire."""
+    manager, sio = await _manager(ALICE)
+    chat = LobbyChat(manager, history_size=3, rate=100, burst=100)
+
+    for index in range(5):
+        await chat.post("sid-alice", "L1", f"  message {index} ")
+
+    assert len(sio.events("chat_message")) == 5
+    assert sio.events("chat_message")[0][2] == "L1"
+
+    await manager.register_connection("sid-bob", BOB)
+    await manager.join_lobby("sid-bob", "L1")
+    await chat.send_history("sid-bob", "L1")
+
+    _, data, _, to = sio.events("chat_history")[-1]
+    assert to == "sid-bob"
+    assert [message["text"] for message in data["messages"]] == ["message 2", "message 3", "message 4"]
+    assert data["messages"][0]["user"] == {"id": ALICE.id, "username": "alice"}
+
+
+@pytest.mark.asyncio
+async def test_chat_rejects_rate_limited_and_invalid_messages():
+    """Au-delà de la rafale, les messages sont refusés à l'émetteur seulement ; idem messages vides ou trop longs."""
+    manager, sio = await _manager(ALICE, BOB)
+    chat = LobbyChat(manager, rate=0.001, burst=2, max_length=10)
+
+    results = [await chat.post("sid-alice", "L1", "hello") for _ in range(3)]
+    assert [result is not None for result in results] == [True, True, False]
+    # Le seau est par utilisateur
+    assert await chat.post("sid-bob", "L1", "hi") is not None
+
+    assert await chat.post("sid-bob", "L1", "   ") is None
+    assert await chat.post("sid-bob", "L1", "x" * 11) is None
+    assert await chat.post("sid-bob", "L1", None) is None
+
+    errors = sio.events("error")
+    assert [to for _, _, _, to in errors] == ["sid-alice", "sid-bob", "sid-bob", "sid-bob"]
+    assert errors[0][1] == {"event": "chat_message", "message": "Rate limit exceeded"}
+    assert len(chat.history("L1")) == 3
+
+    # Un seau vide n'est pas évincé : se reconnecter ne réinitialise pas la limite
+    assert chat.evict_idle_buckets() == 0
+    await manager.remove_connection("sid-alice")
+    await manager.register_connection("sid-alice-2", ALICE)
+    await manager.join_lobby("sid-alice-2", "L1")
+    assert await chat.post("sid-alice-2", "L1", "again") is None
+
+
+@pytest.mark.asyncio
+async def test_chat_persister_writes_in_batches(db_session, session_maker):
+    """La persistance est asynchrone : rien n'est écrit avant le flush, puis un INSERT par lot."""
+    user = User(email="chat@test.com", username="chat", hashed_password="x", is_active=True)
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([user, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    lobby = Lobby(name="Lobby", code="CHAT01", game_id=game.id, host_id=user.id)
+    db_session.add(lobby)
+    await db_session.commit()
+
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    await manager.register_connection("sid", WebSocketUser(id=str(user.id), username="chat"))
+    await manager.join_lobby("sid", str(lobby.id))
+    persister = ChatPersister(session_maker, interval=60, batch_size=2, max_pending=4)
+    chat = LobbyChat(manager, rate=100, burst=100, persister=persister)
+
+    for index in range(5):
+        await chat.post("sid", str(lobby.id), f"message {index}")
+    count = select(func.count()).select_from(ChatMessage)
+    assert await db_session.scalar(count) == 0
+    # File bornée : le plus ancien message est abandonné
+    assert len(persister) == 4
+
+    assert await persister.flush() == 4
+    contents = list(await db_session.scalars(select(ChatMessage.content).order_by(ChatMessage.created_at)))
+    assert contents == ["message 1", "message 2", "message 3", "message 4"]
+    assert set(await db_session.scalars(select(ChatMessage.user_id))) == {user.id}
+    assert [message["id"] for message in chat.history(str(lobby.id))][-2:] == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_chat_persister_drops_invalid_rows_without_blocking_the_queue(db_session, session_maker):
+    """Identifiants invalides refusés à l'enregistrement ; une ligne refusée par la base n'empêche pas l'écriture des autres."""
+    user = User(email="chat@test.com", username="chat", hashed_password="x", is_active=True)
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([user, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    lobby = Lobby(name="Lobby", code="CHAT02", game_id=game.id, host_id=user.id)
+    db_session.add(lobby)
+    await db_session.commit()
+
+    persister = ChatPersister(session_maker, interval=60, batch_size=10, max_pending=10)
+    assert persister.record("not-a-uuid", user.id, "lost", 1_000) is False
+    assert persister.record(str(lobby.id), str(user.id), "first", 1_000) is True
+    # Ligne acceptée à l'enregistrement mais refusée par la base (NOT NULL ici ; clé étrangère sur PostgreSQL)
+    persister._pending.append((lobby.id, user.id, None, 2_000))
+    assert persister.record(lobby.id, user.id, "second", 3_000) is True
+
+    assert await persister.flush() == 2
+    assert len(persister) == 0
+    contents = list(await db_session.scalars(select(ChatMessage.content).order_by(ChatMessage.created_at)))
+    assert contents == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_chat_history_is_released_when_lobby_empties():
+    """Historique oublié quand le dernier joueur part ou quand le lobby est supprimé."""
+    manager, sio = await _manager(ALICE, BOB)
+    chat = LobbyChat(manager, rate=100, burst=100)
+    await chat.post("sid-alice", "L1", "hello")
+
+    await manager.leave_lobby("sid-alice")
+    assert len(chat.history("L1")) == 1
+    await manager.leave_lobby("sid-bob")
+    assert chat.history("L1") == []
+
+    await manager.join_lobby("sid-bob", "L2")
+    await chat.post("sid-bob", "L2", "hi")
+    chat.drop_lobbies([uuid.UUID(int=1), "L2"])
+    assert chat.history("L2") == []
+
+
+@pytest.mark.asyncio
+async def test_idle_rate_buckets_are_evicted_on_next_message():
+    """Un seau inutilisé depuis ``burst / rate`` secondes est évincé, même vidé en pleine rafale."""
+    manager, sio = await _manager(ALICE, BOB)
+    chat = LobbyChat(manager, rate=1, burst=2)
+    await chat.post("sid-alice", "L1", "one")
+    await chat.post("sid-alice", "L1", "two")
+    # Alice part en pleine rafale (seau vide), sans repasser par un chemin de départ
+    await manager.remove_connection("sid-alice")
+    assert list(chat._buckets) == [ALICE.id]
+
+    chat._buckets[ALICE.id].updated -= 2
+    await chat.post("sid-bob", "L1", "hi")
+
+    assert list(chat._buckets) == [BOB.id]
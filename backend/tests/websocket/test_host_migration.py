@@ -0,0 +1,131 @@
+"""
+Tests pour la bascule d'hôte après déconnexion.
+
+shortcut : uv run pytest tests/websocket/test_host_migration.py -v
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from models import Game, GameType, Lobby, Player, PlayerStatus, User
+from websocket.connexion_manager import ConnexionManager, WebSocketUser
+from websocket.host_migration import HostMigration
+from tests.websocket.helpers import FakeSioServer
+
+
+GRACE = 0.05
+
+
+@pytest.fixture
+async def lobby_with_players(db_session, session_maker):
+    """
+    Lobby en base (hôte = premier utilisateur, les trois sont joueurs) et manager dont les
+    trois utilisateurs sont en ligne, l'hôte du lobby étant suivi.
+    """
+    users = [
+        User(email=f"{name}@test.com", username=name, hashed_password="x", is_active=True)
+        for name in ("host", "early", "late")
+    ]
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([*users, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    lobby = Lobby(name="Lobby", code="HOSTMG", game_id=game.id, host_id=users[0].id)
+    db_session.add(lobby)
+    await db_session.flush()
+    db_session.add_all([Player(lobby_id=lobby.id, user_id=user.id, status=PlayerStatus.WAITING) for user in users])
+    await db_session.commit()
+
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    manager.host_migration = HostMigration(manager, session_maker, grace_period=GRACE)
+    lobby_id = str(lobby.id)
+    for user in users:
+        await manager.register_connection(f"sid-{user.username}", WebSocketUser(id=str(user.id), username=user.username))
+        await manager.join_lobby(f"sid-{user.username}", lobby_id)
+    await manager.host_migration.track(lobby_id)
+    yield lobby, users, manager, sio
+    manager.host_migration.cancel_all()
+
+
+async def _host_id(db_session, lobby):
+    await db_session.refresh(lobby, ["host_id"])
+    return lobby.host_id
+
+
+@pytest.mark.asyncio
+async def test_host_migrates_to_longest_connected_player(db_session, lobby_with_players):
+    """Après le délai de grâce, le joueur en ligne depuis le plus longtemps devient hôte."""
+    lobby, (host, early, _), manager, sio = lobby_with_players
+
+    await manager.remove_connection("sid-host")
+    assert await _host_id(db_session, lobby) == host.id
+    await asyncio.sleep(GRACE * 4)
+
+    assert await _host_id(db_session, lobby) == early.id
+    assert sio.events("host_changed") == [(
+        "host_changed",
+        {"lobby_id": str(lobby.id), "previous_host_id": str(host.id), "host_id": str(early.id)},
+        str(lobby.id),
+        None,
+    )]
+
+
+@pytest.mark.asyncio
+async def test_host_reconnecting_within_grace_period_keeps_the_lobby(db_session, lobby_with_players):
+    """Un hôte qui revient avant la fin du délai de grâce reste hôte."""
+    lobby, (host, _, _), manager, sio = lobby_with_players
+
+    await manager.remove_connection("sid-host")
+    await manager.register_connection("sid-host-2", WebSocketUser(id=str(host.id), username="host"))
+    await manager.join_lobby("sid-host-2", str(lobby.id))
+    await asyncio.sleep(GRACE * 4)
+
+    assert await _host_id(db_session, lobby) == host.id
+    assert sio.events("host_changed") == []
+
+
+@pytest.mark.asyncio
+async def test_non_host_departure_does_not_change_host(db_session, lobby_with_players):
+    """Le départ d'un joueur qui n'est pas hôte ne programme aucune bascule."""
+    lobby, (host, early, _), manager, sio = lobby_with_players
+
+    await manager.remove_connection("sid-early")
+    assert manager.host_migration._pending == {}
+    await asyncio.sleep(GRACE * 4)
+
+    assert await _host_id(db_session, lobby) == host.id
+    assert sio.events("host_changed") == []
+
+
+@pytest.mark.asyncio
+async def test_successor_must_be_an_active_player_of_the_lobby(db_session, lobby_with_players):
+    """Un utilisateur en ligne sans joueur actif dans le lobby (parti) n'est pas candidat."""
+    lobby, (host, early, late), manager, sio = lobby_with_players
+    player = (await db_session.execute(
+        select(Player).where(Player.lobby_id == lobby.id, Player.user_id == early.id)
+    )).scalar_one()
+    player.status = PlayerStatus.LEFT
+    await db_session.commit()
+
+    await manager.remove_connection("sid-host")
+    await asyncio.sleep(GRACE * 4)
+
+    assert await _host_id(db_session, lobby) == late.id
+    assert sio.events("host_changed")[0][1]["host_id"] == str(late.id)
+
+
+@pytest.mark.asyncio
+async def test_new_host_departure_is_followed(db_session, lobby_with_players):
+    """Après une bascule, c'est le départ du nouvel hôte qui programme la suivante."""
+    lobby, (host, early, late), manager, sio = lobby_with_players
+
+    await manager.remove_connection("sid-host")
+    await asyncio.sleep(GRACE * 4)
+    await manager.remove_connection("sid-early")
+    await asyncio.sleep(GRACE * 4)
+
+    assert await _host_id(db_session, lobby) == late.id
@@ -0,0 +1,101 @@
+"""
+Tests pour l'index de présence et le ConnexionManager.
+
+shortcut : uv run pytest tests/websocket/test_presence.py -v
+"""
+import pytest
+
+from websocket.connexion_manager import ConnexionManager, WebSocketUser
+from websocket.lobby_service import LobbyService
+from websocket.presence import PresenceIndex
+from tests.websocket.helpers import FakeSioServer
+
+
+ALICE = WebSocketUser(id="u-alice", username="alice")
+BOB = WebSocketUser(id="u-bob", username="bob")
+
+
+def test_presence_multiple_sockets_per_user():
+    """Un second onglet ne remplace pas le premier."""
+    presence = PresenceIndex()
+
+    assert presence.add_connection("s1", ALICE) is True
+    assert presence.add_connection("s2", ALICE) is False
+    assert set(presence.sids_for_user(ALICE.id)) == {"s1", "s2"}
+
+    departure = presence.remove_connection("s1")
+    assert departure.offline is False
+    assert set(presence.sids_for_user(ALICE.id)) == {"s2"}
+
+    departure = presence.remove_connection("s2")
+    assert departure.offline is True
+    assert not presence.sids_for_user(ALICE.id)
+    assert presence.connection_count == 0
+
+
+def test_presence_lobby_counts_distinct_users():
+    """online_count compte les utilisateurs, pas les sockets."""
+    presence = PresenceIndex()
+    presence.add_connection("s1", ALICE)
+    presence.add_connection("s2", ALICE)
+    presence.add_connection("s3", BOB)
+
+    assert presence.join_lobby("s1", "L1").first_in_lobby is True
+    assert presence.join_lobby("s2", "L1").first_in_lobby is False
+    assert presence.join_lobby("s3", "L1").first_in_lobby is True
+
+    assert presence.online_count("L1") == 2
+    assert presence.sids_in_lobby("L1") == {"s1", "s2", "s3"}
+    assert list(presence.online_users("L1")) == [ALICE.id, BOB.id]
+    assert presence.lobby_of_user(ALICE.id) == "L1"
+
+    lobby_id, last = presence.leave_lobby("s1")
+    assert (lobby_id, last) == ("L1", False)
+    assert presence.online_count("L1") == 2
+
+    departure = presence.remove_connection("s2")
+    assert departure.lobby_id == "L1"
+    assert departure.left_lobby is True
+    assert presence.online_count("L1") == 1
+    assert presence.lobby_of_user(ALICE.id) is None
+
+
+def test_presence_switching_lobby_detaches_previous():
+    """Rejoindre un autre lobby détache le socket de l'ancien."""
+    presence = PresenceIndex()
+    presence.add_connection("s1", ALICE)
+    presence.join_lobby("s1", "L1")
+
+    change = presence.join_lobby("s1", "L2")
+
+    assert change.previous_lobby_id == "L1"
+    assert change.left_previous is True
+    assert change.first_in_lobby is True
+    assert presence.online_count("L1") == 0
+    assert presence.online_count("L2") == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_emits_presence_only_on_first_and_last_socket():
+    """user_joined / user_left ne sont émis que pour le premier et le dernier socket."""
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    lobby_service = LobbyService(None, manager)
+
+    await manager.register_connection("s1", ALICE)
+    await manager.register_connection("s2", ALICE)
+
+    await lobby_service.join_lobby("s1", "L1")
+    await lobby_service.join_lobby("s2", "L1")
+    assert len(sio.events("user_joined")) == 1
+    assert sio.rooms["L1"] == {"s1", "s2"}
+
+    await manager.remove_connection("s1")
+    assert sio.events("user_left") == []
+
+    await manager.remove_connection("s2")
+    left = sio.events("user_left")
+    assert len(left) == 1
+    assert left[0][1]["user"]["id"] == ALICE.id
+    assert left[0][1]["online_count"] == 0
+    assert sio.rooms["L1"] == set()
@@ -0,0 +1,56 @@
+"""
+Tests pour le reaper de connexions et le plafond de sockets par utilisateur.
+
+shortcut : uv run pytest tests/websocket/test_reaper.py -v
+"""
+import time
+
+import pytest
+
+from core.metrics import metrics
+from websocket.connexion_manager import ConnexionManager, WebSocketUser
+from websocket.reaper import ConnectionReaper
+from tests.websocket.helpers import FakeSioServer
+
+
+ALICE = WebSocketUser(id="u-alice", username="alice")
+
+
+@pytest.mark.asyncio
+async def test_reaper_evicts_zombie_sockets():
+    """Les sockets fermés ou sans pong sont évincés, les autres conservés."""
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+
+    for sid in ("alive", "closed", "stale"):
+        await manager.register_connection(sid, ALICE)
+        await manager.join_lobby(sid, "L1")
+    sio.connect("alive")
+    sio.connect("stale", last_ping=time.time() - 60)
+
+    reaper = ConnectionReaper(manager, interval=1, ping_timeout=10)
+    reaped = await reaper.reap_once()
+
+    assert reaped == 2
+    assert set(manager.sids_for_user(ALICE.id)) == {"alive"}
+    assert manager.presence.sids_in_lobby("L1") == {"alive"}
+    assert sorted(sio.disconnected) == ["closed", "stale"]
+    snapshot = metrics.snapshot()
+    assert snapshot["socketio_live_sockets"] == 1
+    assert snapshot["socketio_reaped_last_interval"] == 2
+
+
+@pytest.mark.asyncio
+async def test_register_connection_enforces_per_user_cap():
+    """Au-delà du plafond, les nouvelles connexions sont refusées."""
+    manager = ConnexionManager(FakeSioServer())
+    manager.max_sockets_per_user = 2
+
+    await manager.register_connection("s1", ALICE)
+    await manager.register_connection("s2", ALICE)
+    with pytest.raises(ConnectionRefusedError):
+        await manager.register_connection("s3", ALICE)
+
+    await manager.remove_connection("s1")
+    await manager.register_connection("s3", ALICE)
+    assert set(manager.sids_for_user(ALICE.id)) == {"s2", "s3"}
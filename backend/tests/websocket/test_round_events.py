@@ -0,0 +1,145 @@
+"""
+Tests pour les événements de manche (``lobby:start_round``, ``lobby:pause_game``,
+``lobby:resume_game``, ``lobby:end_round``), le timer qu'ils pilotent et la validation
+des missions qui suit (``lobby:validate_missions``).
+
+shortcut : uv run pytest tests/websocket/test_round_events.py -v
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from models import Game, GameType, Lobby, Mission, MissionAssigned, Player, RoundTimer, User
+from models.lobby import LobbyPhase
+from services.leaderboard import leaderboards
+from services.round_timer import RoundTimerService
+from websocket.connexion_manager import ConnexionManager, WebSocketUser
+from websocket.lobby_service import LobbyService
+from tests.websocket.helpers import FakeSioServer
+
+
+@pytest.fixture
+async def round_lobby(db_session, session_maker):
+    """Lobby en base, hôte et invité connectés, timers pilotés par une roue rapide."""
+    host = User(email="host@test.com", username="host", hashed_password="x", is_active=True)
+    guest = User(email="guest@test.com", username="guest", hashed_password="x", is_active=True)
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([host, guest, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    lobby = Lobby(name="Lobby", code="ROUNDS", game_id=game.id, host_id=host.id)
+    db_session.add(lobby)
+    await db_session.commit()
+
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    timers = RoundTimerService(
+        session_maker=session_maker, tick=0.01, wheel_size=8, broadcast=manager.broadcast_public,
+    )
+    service = LobbyService(None, manager, session_maker=session_maker, timers=timers)
+    lobby_id = str(lobby.id)
+    for user in (host, guest):
+        await manager.register_connection(f"sid-{user.username}", WebSocketUser(id=str(user.id), username=user.username))
+        await manager.join_lobby(f"sid-{user.username}", lobby_id)
+    timers.start()
+    yield lobby, service, timers, sio
+    await timers.stop()
+    leaderboards.drop(lobby_id)
+
+
+async def _phase(db_session, lobby):
+    await db_session.refresh(lobby, ["phase"])
+    return lobby.phase
+
+
+@pytest.mark.asyncio
+async def test_start_round_arms_the_timer_and_expires_into_validation(db_session, round_lobby):
+    """``lobby:start_round`` passe en manche et arme le timer ; l'échéance passe en validation."""
+    lobby, service, timers, sio = round_lobby
+    lobby_id = str(lobby.id)
+
+    await service.start_round("sid-host", lobby_id, 0.05)
+    assert await _phase(db_session, lobby) == LobbyPhase.ROUND
+    assert timers.remaining(lobby_id) is not None
+    await asyncio.sleep(0.2)
+
+    assert await _phase(db_session, lobby) == LobbyPhase.VALIDATION
+    assert [data["phase"] for _, data, _, _ in sio.events("phase_changed")] == ["round", "validation"]
+    assert (await db_session.execute(select(RoundTimer))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_pause_and_resume_keep_the_remaining_time(db_session, round_lobby):
+    """La pause fige le temps restant (pas d'échéance pendant la pause), la reprise le réarme."""
+    lobby, service, timers, sio = round_lobby
+    lobby_id = str(lobby.id)
+
+    await service.start_round("sid-host", lobby_id, 0.1)
+    await service.pause_game("sid-host", lobby_id)
+    assert timers.is_paused(lobby_id)
+    await asyncio.sleep(0.2)
+    assert await _phase(db_session, lobby) == LobbyPhase.ROUND
+
+    await service.resume_game("sid-host", lobby_id)
+    await asyncio.sleep(0.25)
+
+    assert await _phase(db_session, lobby) == LobbyPhase.VALIDATION
+    assert len(sio.events("game_paused")) == 1
+    assert len(sio.events("game_resumed")) == 1
+
+
+@pytest.mark.asyncio
+async def test_end_round_cancels_the_timer(db_session, round_lobby):
+    """``lobby:end_round`` annule le timer et passe immédiatement en validation."""
+    lobby, service, timers, sio = round_lobby
+    lobby_id = str(lobby.id)
+
+    await service.start_round("sid-host", lobby_id, 60)
+    await service.end_round("sid-host", lobby_id)
+
+    assert timers.remaining(lobby_id) is None
+    assert await _phase(db_session, lobby) == LobbyPhase.VALIDATION
+
+
+@pytest.mark.asyncio
+async def test_round_events_are_host_only(db_session, round_lobby):
+    """Un joueur qui n'est pas l'hôte reçoit une erreur et aucun timer n'est armé."""
+    lobby, service, timers, sio = round_lobby
+    lobby_id = str(lobby.id)
+
+    await service.start_round("sid-guest", lobby_id, 0.05)
+    await service.pause_game("sid-guest", lobby_id)
+
+    assert timers.remaining(lobby_id) is None
+    assert await _phase(db_session, lobby) == LobbyPhase.NONE
+    errors = [data for event, data in sio.received("sid-guest") if event == "error"]
+    assert [error["event"] for error in errors] == ["lobby:start_round", "lobby:pause_game"]
+    assert sio.events("phase_changed") == []
+
+
+@pytest.mark.asyncio
+async def test_round_then_validation_scores_through_socket_events(db_session, round_lobby):
+    """Manche terminée par l'hôte puis ``lobby:validate_missions`` : scores en base et classement diffusé."""
+    lobby, service, timers, sio = round_lobby
+    lobby_id = str(lobby.id)
+    guest_id = (await db_session.execute(select(User.id).where(User.username == "guest"))).scalar_one()
+    mission = Mission(game_id=lobby.game_id, title="Mission", description="Test", difficulty=60)
+    players = [Player(lobby_id=lobby.id, user_id=user_id) for user_id in (lobby.host_id, guest_id)]
+    db_session.add_all([mission, *players])
+    await db_session.flush()
+    assignment = MissionAssigned(player_id=players[1].id, mission_id=mission.id)
+    db_session.add(assignment)
+    await db_session.commit()
+
+    await service.start_round("sid-host", lobby_id, 60)
+    await service.end_round("sid-host", lobby_id)
+    await service.validate_missions("sid-host", lobby_id, {str(assignment.id): "completed"})
+
+    await db_session.refresh(players[1], ["score"])
+    assert players[1].score > 0
+    (update,) = sio.events("leaderboard_update")
+    ranks = {change["player_id"]: change["rank"] for change in update[1]["changes"]}
+    assert ranks[str(players[1].id)] == 1
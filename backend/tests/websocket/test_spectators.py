@@ -0,0 +1,86 @@
+"""
+Tests pour le mode spectateur des lobbies.
+
+shortcut : uv run pytest tests/websocket/test_spectators.py -v
+"""
+import pytest
+
+from websocket.chat import LobbyChat
+from websocket.connexion_manager import ConnexionManager, WebSocketUser, spectator_room
+from tests.websocket.helpers import FakeSioServer
+
+
+LOBBY = "lobby-1"
+
+
+@pytest.fixture
+async def manager_with_spectators():
+    """Deux joueurs et trois spectateurs dans le même lobby (aucune base de données)."""
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    for name in ("alice", "bob"):
+        await manager.register_connection(f"sid-{name}", WebSocketUser(id=f"user-{name}", username=name))
+        await manager.join_lobby(f"sid-{name}", LOBBY)
+    for index in range(3):
+        sid = f"sid-watcher-{index}"
+        await manager.register_connection(sid, WebSocketUser(id=f"watcher-{index}", username=f"watcher{index}"))
+        await manager.watch_lobby(sid, LOBBY)
+    sio.emitted.clear()
+    yield manager, sio
+    manager.host_migration.cancel_all()
+
+
+@pytest.mark.asyncio
+async def test_spectators_join_a_separate_room(manager_with_spectators):
+    """Les spectateurs sont dans la room ``lobby_id:spectators`` et ne comptent pas comme joueurs en ligne."""
+    manager, sio = manager_with_spectators
+
+    assert sio.rooms[LOBBY] == {"sid-alice", "sid-bob"}
+    assert sio.rooms[spectator_room(LOBBY)] == {"sid-watcher-0", "sid-watcher-1", "sid-watcher-2"}
+    assert manager.online_count(LOBBY) == 2
+    assert manager.presence.spectator_count(LOBBY) == 3
+    assert sio.sessions["sid-watcher-0"] == {"lobby_id": LOBBY, "spectator": True}
+
+
+@pytest.mark.asyncio
+async def test_public_events_are_emitted_once_to_spectators(manager_with_spectators):
+    """Un événement public est émis une seule fois vers la room des spectateurs ; un événement privé jamais."""
+    manager, sio = manager_with_spectators
+
+    await manager.broadcast("mission_assigned", {"secret": "kill bob"}, LOBBY)
+    await manager.broadcast("mission_validated", {"secret": "done"}, LOBBY, public={"player": "alice"})
+    chat = LobbyChat(manager)
+    await chat.post("sid-alice", LOBBY, "gg")
+
+    spectator_events = [(event, data) for event, data, room, _ in sio.emitted if room == spectator_room(LOBBY)]
+    assert spectator_events == [
+        ("mission_validated", {"player": "alice"}),
+        ("chat_message", chat.history(LOBBY)[0]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_spectator_cannot_post_and_becomes_player_on_join(manager_with_spectators):
+    """Un spectateur n'écrit pas dans le chat ; rejoindre le lobby en joueur le retire des spectateurs."""
+    manager, sio = manager_with_spectators
+
+    assert manager.presence.lobby_of_sid("sid-watcher-0") is None
+    await manager.join_lobby("sid-watcher-0", LOBBY)
+
+    assert "sid-watcher-0" not in sio.rooms[spectator_room(LOBBY)]
+    assert "sid-watcher-0" in sio.rooms[LOBBY]
+    assert manager.presence.spectator_count(LOBBY) == 2
+    assert manager.online_count(LOBBY) == 3
+
+
+@pytest.mark.asyncio
+async def test_spectator_disconnect_is_silent(manager_with_spectators):
+    """La déconnexion d'un spectateur ne diffuse rien et ne déclenche pas de bascule d'hôte."""
+    manager, sio = manager_with_spectators
+
+    await manager.remove_connection("sid-watcher-1")
+
+    assert sio.emitted == []
+    assert manager.presence.spectator_count(LOBBY) == 2
+    assert "sid-watcher-1" not in sio.rooms[spectator_room(LOBBY)]
+    assert not manager.host_migration._pending
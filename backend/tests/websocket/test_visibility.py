@@ -0,0 +1,157 @@
+"""
+Tests pour la diffusion selon la visibilité (payload public + patchs secrets).
+
+shortcut : uv run pytest tests/websocket/test_visibility.py -v
+"""
+import pytest
+from sqlalchemy import select
+
+from models import Game, GameType, Lobby, Mission, MissionAssigned, MissionAssignedStatus, Player, User
+from websocket.connexion_manager import ConnexionManager, WebSocketUser, spectator_room
+from websocket.lobby_service import LobbyService
+from websocket.visibility import assignment_views, full_view
+from tests.websocket.helpers import FakeSioServer
+
+
+LOBBY = "lobby-1"
+# joueur -> (connue du joueur, connue des autres)
+VISIBILITY = {
+    "alice": (True, True),      # publique
+    "bob": (True, False),       # secrète, connue de bob seul
+    "carol": (False, True),     # connue des autres, pas de carol
+    "dave": (False, False),     # connue de personne
+}
+
+
+def _missions_by_player():
+    return {
+        f"player-{name}": {
+            "user_id": f"user-{name}",
+            "mission_id": f"assigned-{name}",
+            "mission": {
+                "id": f"mission-{name}",
+                "title": f"Mission {name}",
+                "description": "Test",
+                "is_known_by_player": known_by_player,
+                "is_known_by_others": known_by_others,
+            },
+        }
+        for name, (known_by_player, known_by_others) in VISIBILITY.items()
+    }
+
+
+@pytest.fixture
+async def lobby():
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    for name in VISIBILITY:
+        await manager.register_connection(f"sid-{name}", WebSocketUser(id=f"user-{name}", username=name))
+        await manager.join_lobby(f"sid-{name}", LOBBY)
+    await manager.register_connection("sid-watcher", WebSocketUser(id="user-watcher", username="watcher"))
+    await manager.watch_lobby("sid-watcher", LOBBY)
+    sio.emitted.clear()
+    sio.skipped.clear()
+    yield manager, sio
+    manager.host_migration.cancel_all()
+
+
+def _merged(sio, sid):
+    """Rejoue côté client : payload public puis fusion des patchs reçus."""
+    state = None
+    for event, data in sio.received(sid):
+        if event == "missions_assigned":
+            state = {**data, "missions": dict(data["missions"])}
+        elif event == "missions_assigned_patch":
+            state["missions"].update(data["missions"])
+    return state
+
+
+def _visible(state):
+    return sorted(player_id.removeprefix("player-") for player_id in state["missions"])
+
+
+@pytest.mark.asyncio
+async def test_each_player_sees_only_allowed_missions(lobby):
+    """Chaque joueur reconstruit exactement sa vue ; le spectateur ne voit que le public."""
+    manager, sio = lobby
+    views = assignment_views(LOBBY, _missions_by_player())
+
+    await manager.broadcast_views("missions_assigned", views, LOBBY)
+
+    assert _visible(_merged(sio, "sid-alice")) == ["alice", "carol"]
+    assert _visible(_merged(sio, "sid-bob")) == ["alice", "bob", "carol"]
+    assert _visible(_merged(sio, "sid-carol")) == ["alice"]
+    assert _visible(_merged(sio, "sid-dave")) == ["alice", "carol"]
+    assert _visible(_merged(sio, "sid-watcher")) == ["alice"]
+    players = [f"user-{name}" for name in VISIBILITY]
+    for name in VISIBILITY:
+        assert _merged(sio, f"sid-{name}") == full_view(views, f"user-{name}", players)
+
+
+@pytest.mark.asyncio
+async def test_public_payload_is_emitted_once_per_room(lobby):
+    """Le payload public part une fois au lobby et une fois aux spectateurs ; les patchs sont individuels."""
+    manager, sio = lobby
+    views = assignment_views(LOBBY, _missions_by_player())
+
+    await manager.broadcast_views("missions_assigned", views, LOBBY)
+
+    assert [(room, to) for _, _, room, to in sio.events("missions_assigned")] == [
+        (LOBBY, None),
+        (spectator_room(LOBBY), None),
+    ]
+    # Un patch par destinataire (secrets regroupés), jamais d'émission au lobby entier
+    patches = sio.events("missions_assigned_patch")
+    assert [(room, to) for _, _, room, to in patches] == [(None, "sid-alice"), (None, "sid-bob"), (None, "sid-dave")]
+    assert sorted(patches[1][1]["missions"]) == ["player-bob", "player-carol"]
+
+
+@pytest.mark.asyncio
+async def test_assign_missions_event_broadcasts_views(db_session, session_maker):
+    """``lobby:assign_missions`` : missions tirées en base puis diffusées selon leur visibilité."""
+    users = [
+        User(email=f"{name}@test.com", username=name, hashed_password="x", is_active=True)
+        for name in ("host", "bob", "carol")
+    ]
+    game_type = GameType(name="Mission", description="Test")
+    db_session.add_all([*users, game_type])
+    await db_session.flush()
+    game = Game(name="Game", description="Test", game_type_id=game_type.id)
+    db_session.add(game)
+    await db_session.flush()
+    # Toutes secrètes pour les autres joueurs : seuls des patchs individuels
+    db_session.add_all([
+        Mission(game_id=game.id, title=f"Mission {index}", description="Test", difficulty=10,
+                is_known_by_player=True, is_known_by_others=False)
+        for index in range(3)
+    ])
+    lobby = Lobby(name="Lobby", code="ASSIGN", game_id=game.id, host_id=users[0].id)
+    db_session.add(lobby)
+    await db_session.flush()
+    players = [Player(lobby_id=lobby.id, user_id=user.id) for user in users]
+    db_session.add_all(players)
+    await db_session.commit()
+
+    sio = FakeSioServer()
+    manager = ConnexionManager(sio)
+    service = LobbyService(None, manager, session_maker=session_maker)
+    lobby_id = str(lobby.id)
+    for user in users:
+        await manager.register_connection(f"sid-{user.username}", WebSocketUser(id=str(user.id), username=user.username))
+        await manager.join_lobby(f"sid-{user.username}", lobby_id)
+
+    await service.assign_missions("sid-bob", lobby_id)
+    assert sio.events("missions_assigned") == []
+
+    await service.assign_missions("sid-host", lobby_id)
+
+    assigned = (await db_session.execute(
+        select(MissionAssigned.player_id).where(MissionAssigned.status == MissionAssignedStatus.ACTIVE)
+    )).scalars().all()
+    assert sorted(assigned) == sorted(player.id for player in players)
+    assert sio.events("missions_assigned")[0][1]["missions"] == {}
+    patches = sio.events("missions_assigned_patch")
+    assert sorted(to for _, _, _, to in patches) == ["sid-bob", "sid-carol", "sid-host"]
+    for user, player in zip(users, players):
+        assert list(_merged(sio, f"sid-{user.username}")["missions"]) == [str(player.id)]
+    manager.host_migration.cancel_all()
@@ -1,12 +1,18 @@
+password_hasher = None
 
-from pwdlib import PasswordHash
 
+def get_password_hasher():
+    """Hacheur argon2, créé au premier usage (pwdlib et argon2 ne pèsent pas sur l'import)."""
+    global password_hasher
+    if password_hasher is None:
+        from pwdlib import PasswordHash
 
-password_hasher = PasswordHash.recommended()
+        password_hasher = PasswordHash.recommended()
+    return password_hasher
 
 
 def hash_password(password: str) -> str:
-    return password_hasher.hash(password)
+    return get_password_hasher().hash(password)
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return password_hasher.verify(password, hashed_password)
\ No newline at end of file
+    return get_password_hasher().verify(password, hashed_password)
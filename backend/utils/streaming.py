@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Iterable
+
+
+# Taille cible des morceaux envoyés au client : évite un appel send() par ligne
+CHUNK_SIZE = 64 * 1024
+
+
+async def iter_ndjson(items: AsyncIterable[dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Encode un flux de dictionnaires en NDJSON, par morceaux d'environ ``chunk_size`` octets."""
+    buffer: list[str] = []
+    size = 0
+    async for item in items:
+        line = json.dumps(item, default=str, ensure_ascii=False, separators=(",", ":")) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+async def iter_csv(
+    header: Iterable[str],
+    rows: AsyncIterable[Iterable[Any]],
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Encode un flux de lignes en CSV (en-tête compris), par morceaux d'environ ``chunk_size`` octets."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def iter_gzip(chunks: AsyncIterable[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Compresse un flux d'octets en gzip au fil de l'eau (un seul compresseur, mémoire constante)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)     # 16 + : en-tête gzip
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Découpe un flux d'octets (UTF-8) en lignes, sans jamais conserver plus d'une ligne en mémoire."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def parse_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Lit un flux NDJSON ligne par ligne : ``(numéro de ligne, objet)``. Une ligne invalide
+    donne ``(numéro, ValueError)`` au lieu d'interrompre la lecture ; les lignes vides sont ignorées.
+    """
+    number = 0
+    async for line in lines:
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, ValueError(f"Invalid JSON: {exc}")
+
+
+async def parse_csv(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Lit un flux CSV avec en-tête : ``(numéro de ligne, dict)``. Les champs vides sont omis
+    (valeurs par défaut du schéma) ; un champ entre guillemets peut contenir des retours à la ligne.
+    """
+    header: list[str] | None = None
+    record: list[str] = []
+    number = start = 0
+    async for line in lines:
+        number += 1
+        if not record:
+            start = number
+        record.append(line)
+        text = "\n".join(record)
+        if text.count('"') % 2:
+            continue                        # guillemet ouvert : l'enregistrement continue
+        record = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield start, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+        else:
+            yield start, {name: value for name, value in zip(header, values) if value != ""}
+    if record:
+        yield start, ValueError("Unterminated quoted field")
+
+
+def parse_records(lines: AsyncIterable[str], format: str) -> AsyncIterator[tuple[int, Any]]:
+    """``parse_csv`` ou ``parse_ndjson`` selon ``format``."""
+    return parse_csv(lines) if format == "csv" else parse_ndjson(lines)
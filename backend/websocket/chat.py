@@ -0,0 +1,280 @@
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from itertools import count
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from core.config import settings
+from core.metrics import metrics
+from db.database import async_session_maker
+from db.unit_of_work import UnitOfWork
+from models import ChatMessage
+
+
+logger = logging.getLogger(__name__)
+
+messages_total = metrics.counter("chat_messages_total", "Messages de chat diffusés")
+rate_limited_total = metrics.counter("chat_messages_rate_limited_total", "Messages de chat refusés par la limite de débit")
+persisted_total = metrics.counter("chat_messages_persisted_total", "Messages de chat écrits en base")
+dropped_total = metrics.counter("chat_messages_dropped_total", "Messages de chat abandonnés avant écriture (file pleine)")
+rejected_total = metrics.counter("chat_messages_rejected_total", "Messages de chat invalides ou refusés par la base, abandonnés")
+
+
+class TokenBucket:
+    """Seau à jetons : ``rate`` jetons par seconde, au plus ``capacity`` en réserve."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        if self.refill(now) < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class ChatPersister:
+    """
+    Écriture asynchrone des messages dans ``chat_messages`` : les messages sont
+    accumulés en mémoire puis insérés par lots (un INSERT multi-lignes par lot)
+    toutes les ``interval`` secondes, hors du chemin de diffusion.
+
+    Les identifiants sont validés à l'enregistrement (``record``). Un lot refusé par la
+    base (``IntegrityError``/``DataError``, ex. lobby supprimé entre-temps) est réécrit
+    ligne par ligne : seules les lignes fautives sont abandonnées, elles ne bloquent pas
+    la file. Une autre erreur (base indisponible) remet le lot en tête de file.
+    """
+
+    def __init__(
+        self,
+        session_maker=None,
+        interval: float | None = None,
+        batch_size: int | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        self.session_maker = session_maker or async_session_maker
+        self.interval = interval if interval is not None else settings.CHAT_FLUSH_INTERVAL
+        self.batch_size = batch_size if batch_size is not None else settings.CHAT_FLUSH_BATCH_SIZE
+        self.max_pending = max_pending if max_pending is not None else settings.CHAT_MAX_PENDING
+        self._pending: Deque[tuple] = deque()         # (lobby_id, user_id, content, sent_at en ms), UUID convertis
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, lobby_id, user_id, content: str, sent_at: int) -> bool:
+        """Met un message en file d'écriture ; ``False`` (abandonné) si ses identifiants sont invalides."""
+        try:
+            row = (_as_uuid(lobby_id), _as_uuid(user_id), content, sent_at)
+        except ValueError:
+            rejected_total.inc()
+            logger.warning("chat message rejected", extra={"lobby_id": str(lobby_id), "user_id": str(user_id)})
+            return False
+        if len(self._pending) >= self.max_pending:
+            # Base trop lente : on sacrifie les plus anciens plutôt que la mémoire
+            self._pending.popleft()
+            dropped_total.inc()
+        self._pending.append(row)
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête la tâche sans interrompre une écriture en cours, puis vide la file."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("chat flush failed")
+
+    async def flush(self) -> int:
+        """Écrit les messages en attente, une transaction par lot ; retourne le nombre écrit."""
+        written = 0
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            try:
+                await self._insert(batch)
+                written += len(batch)
+            except (IntegrityError, DataError):
+                written += await self._insert_rows(batch)
+            except BaseException:
+                # Le lot est remis en tête de file pour la prochaine passe (ou compté comme perdu à l'arrêt)
+                self._pending.extendleft(reversed(batch))
+                raise
+        persisted_total.inc(written)
+        return written
+
+    async def _insert(self, rows: List[tuple]) -> None:
+        async with self.session_maker() as session, UnitOfWork(session):
+            await session.execute(insert(ChatMessage), [
+                {
+                    "id": uuid.uuid4(),
+                    "lobby_id": lobby_id,
+                    "user_id": user_id,
+                    "content": content,
+                    "created_at": datetime.fromtimestamp(sent_at / 1000, timezone.utc),
+                }
+                for lobby_id, user_id, content, sent_at in rows
+            ])
+
+    async def _insert_rows(self, batch: List[tuple]) -> int:
+        """Réécrit un lot refusé ligne par ligne ; les lignes refusées sont abandonnées."""
+        written = 0
+        for row in batch:
+            try:
+                await self._insert([row])
+                written += 1
+            except (IntegrityError, DataError) as error:
+                rejected_total.inc()
+                logger.warning("chat message rejected by the database", extra={
+                    "lobby_id": str(row[0]), "user_id": str(row[1]), "error": type(error.orig).__name__,
+                })
+        return written
+
+
+class LobbyChat:
+    """
+    Chat des lobbies.
+
+    Chaque lobby garde ses ``history_size`` derniers messages dans un tampon circulaire
+    (``deque(maxlen=...)``) : un nouvel arrivant reçoit l'historique depuis la mémoire,
+    sans lecture en base. Chaque utilisateur a son seau à jetons (``rate`` messages par
+    seconde, rafale de ``burst``) ; un seau inutilisé depuis ``burst / rate`` secondes est
+    de nouveau plein, donc équivalent à un seau neuf : il est évincé au message suivant,
+    quel que soit le chemin de départ de l'utilisateur. La persistance, optionnelle, est
+    déléguée à ``ChatPersister``.
+    """
+
+    def __init__(
+        self,
+        manager,
+        history_size: int | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+        max_length: int | None = None,
+        persister: Optional[ChatPersister] = None,
+    ) -> None:
+        self.manager = manager
+        self.history_size = history_size if history_size is not None else settings.CHAT_HISTORY_SIZE
+        self.rate = rate if rate is not None else settings.CHAT_RATE
+        self.burst = burst if burst is not None else settings.CHAT_BURST
+        self.max_length = max_length if max_length is not None else settings.CHAT_MAX_LENGTH
+        self.persister = persister
+        self._history: Dict[str, Deque[dict]] = {}      # lobby_id -> derniers messages
+        # user_id -> seau à jetons, du moins au plus récemment utilisé
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._idle_after = self.burst / self.rate if self.rate > 0 else float("inf")
+        self._sequence = count(1)
+        manager.on_lobby_empty.append(self.drop_lobby)
+
+    def history(self, lobby_id: str) -> List[dict]:
+        return list(self._history.get(lobby_id, ()))
+
+    async def send_history(self, sid: str, lobby_id: str) -> None:
+        await self.manager.send_to(sid, "chat_history", {"messages": self.history(lobby_id)})
+
+    async def post(self, sid: str, lobby_id: str, text: str) -> Optional[dict]:
+        """Diffuse un message dans le lobby ; retourne le message ou ``None`` s'il est refusé."""
+        user = self.manager.get_user(sid)
+        if user is None:
+            return None
+
+        text = (text or "").strip() if isinstance(text, str) else ""
+        if not text or len(text) > self.max_length:
+            await self._reject(sid, f"Message must be between 1 and {self.max_length} characters")
+            return None
+
+        now = time.monotonic()
+        self.evict_idle_buckets(now)
+        bucket = self._buckets.get(user.id)
+        if bucket is None:
+            bucket = self._buckets[user.id] = TokenBucket(self.rate, self.burst)
+        else:
+            self._buckets.move_to_end(user.id)
+        if not bucket.allow(now):
+            rate_limited_total.inc()
+            await self._reject(sid, "Rate limit exceeded")
+            return None
+
+        # Identifiant séquentiel et horodatage en millisecondes : ni uuid4 ni isoformat
+        # sur le chemin chaud (les UUID de chat_messages sont générés à l'écriture)
+        sent_at = int(time.time() * 1000)
+        message = {
+            "id": next(self._sequence),
+            "user": {"id": user.id, "username": user.username},
+            "text": text,
+            "sent_at": sent_at,
+        }
+        history = self._history.get(lobby_id)
+        if history is None:
+            history = self._history[lobby_id] = deque(maxlen=self.history_size)
+        history.append(message)
+
+        if self.persister is not None:
+            self.persister.record(lobby_id, user.id, text, sent_at)
+
+        messages_total.inc()
+        await self.manager.broadcast_public("chat_message", message, lobby_id)
+        return message
+
+    def evict_idle_buckets(self, now: Optional[float] = None) -> int:
+        """
+        Évince les seaux inutilisés depuis ``burst / rate`` secondes (pleins, donc équivalents
+        à un seau neuf : se reconnecter ne contourne pas la limite). Les seaux sont rangés
+        par dernière utilisation : seuls les plus anciens sont examinés.
+        """
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        while self._buckets:
+            user_id, bucket = next(iter(self._buckets.items()))
+            if now - bucket.updated < self._idle_after:
+                break
+            del self._buckets[user_id]
+            evicted += 1
+        return evicted
+
+    def drop_lobby(self, lobby_id: str) -> None:
+        """Oublie l'historique d'un lobby vide ou supprimé."""
+        self._history.pop(str(lobby_id), None)
+
+    def drop_lobbies(self, lobby_ids) -> None:
+        for lobby_id in lobby_ids:
+            self.drop_lobby(lobby_id)
+
+    async def _reject(self, sid: str, message: str) -> None:
+        await self.manager.send_to(sid, "error", {"event": "chat_message", "message": message})
+
+
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
@@ -1,6 +1,9 @@
+import asyncio
+import logging
+import random
 import uuid
 
-from typing import Dict
+from typing import AbstractSet, Callable, List, Optional
 
 from core.config import settings
 from repositories.jwt_repository import JWTRepository
@@ -8,6 +11,18 @@ from repositories.jwt_repository import JWTRepository
 from pydantic import BaseModel
 from db.database import async_session_maker
 from repositories.user_repository import UserRepository
+from websocket.host_migration import HostMigration
+from websocket.presence import PresenceIndex
+from websocket.visibility import Views, recipient_patches
+
+
+logger = logging.getLogger(__name__)
+
+
+def spectator_room(lobby_id: str) -> str:
+    """Room Socket.IO des spectateurs d'un lobby (flux public uniquement)."""
+    return f"{lobby_id}:spectators"
+
 
 class WebSocketUser(BaseModel):
     id: str
@@ -18,14 +33,19 @@ class WebSocketUser(BaseModel):
 class ConnexionManager:
     def __init__(self, sio_server):
         self.sio_server = sio_server
-        self.active_users: Dict[str, WebSocketUser] = {}    # sid     -> WebSocketUser
-        self.user_lobbies: Dict[str, str] = {}              # user_id -> lobby_id
+        self.presence = PresenceIndex()                     # sid <-> user, user <-> lobby, lobby -> sids
+        self.max_sockets_per_user = settings.SOCKETIO_MAX_SOCKETS_PER_USER
         self.jwt_repository = JWTRepository(
             secret_key=settings.SECRET_KEY,
             algorithm=settings.ALGORITHM,
             refresh_secret_key=settings.REFRESH_SECRET_KEY or settings.SECRET_KEY,
         )
         self.user_repository = UserRepository(async_session_maker())
+        self.host_migration = HostMigration(self)
+        self.draining = False                               # arrêt en cours : plus de nouvelle connexion
+        # État en mémoire des autres modules (chat...) à libérer quand le dernier joueur en ligne
+        # quitte un lobby. Appelés sur tous les chemins de départ, reaper compris.
+        self.on_lobby_empty: List[Callable[[str], None]] = []
 
     async def authenticate(self, token: str) -> WebSocketUser:
         """ Décode le token et retourne l'utilisateur """
@@ -37,33 +57,142 @@ class ConnexionManager:
                 raise ConnectionRefusedError("User not found")
             return WebSocketUser(id=str(user.id), username=user.username)
         except Exception as exc:
-            print(f"Error decoding token: {exc}")
+            logger.info("websocket authentication failed", extra={"error": str(exc)})
             raise ConnectionRefusedError("Invalid or expired token") from exc
 
 
-    async def register_connection(self, sid: str, user: WebSocketUser):
-        """ Enregistre la connexion de l'utilisateur """
-        self.active_users[sid] = user
-        print(f"✅ {user.username} connected (SID={sid})")
-    
+    def get_user(self, sid: str) -> Optional[WebSocketUser]:
+        return self.presence.get_user(sid)
+
+    def sids_for_user(self, user_id: str) -> AbstractSet[str]:
+        return self.presence.sids_for_user(user_id)
+
+    def online_count(self, lobby_id: str) -> int:
+        return self.presence.online_count(lobby_id)
+
+    async def register_connection(self, sid: str, user: WebSocketUser) -> bool:
+        """ Enregistre la connexion de l'utilisateur (True si c'est son premier socket) """
+        if len(self.presence.sids_for_user(user.id)) >= self.max_sockets_per_user:
+            raise ConnectionRefusedError("Too many connections for this user")
+        first = self.presence.add_connection(sid, user)
+        logger.info("websocket connected", extra={"user_id": user.id, "sid": sid})
+        return first
+
     async def remove_connection(self, sid: str):
         """ Enlève la connexion de l'utilisateur """
-        if sid in self.active_users:
-            user = self.active_users.pop(sid, None)
-            await self.leave_lobby(sid, self.user_lobbies.get(user.id, None))
+        watched = self.presence.watching(sid)
+        departure = self.presence.remove_connection(sid)
+        if watched:
+            await self.sio_server.leave_room(sid, spectator_room(watched))
+        if departure.lobby_id:
+            await self.sio_server.leave_room(sid, departure.lobby_id)
+            if departure.left_lobby and not self.draining:
+                await self._user_left(departure.user, departure.lobby_id)
+        return departure
+
+    async def announce_restart(self, reconnect_delay: float, reconnect_jitter: float) -> int:
+        """
+        Redémarrage du serveur : chaque socket reçoit ``server_restarting`` avec son propre
+        délai (``reconnect_delay`` + tirage dans ``[0, reconnect_jitter]``) puis est déconnecté
+        côté serveur. Un client déconnecté par le serveur ne se reconnecte pas de lui-même :
+        il attend ce délai, ce qui étale les reconnexions au lieu d'une tempête à la
+        fermeture du worker. Retourne le nombre de sockets prévenus.
+        """
+        self.draining = True
+        self.host_migration.cancel_all()
+        sids = list(self.presence)
+
+        async def notify(sid: str) -> None:
+            reconnect_in = reconnect_delay + random.uniform(0, reconnect_jitter)
+            await self.send_to(sid, "server_restarting", {"reconnect_in": round(reconnect_in, 1)})
+            await self.sio_server.disconnect(sid)
+
+        await asyncio.gather(*(notify(sid) for sid in sids), return_exceptions=True)
+        logger.info("websocket restart announced", extra={"sockets": len(sids)})
+        return len(sids)
+
+    async def join_lobby(self, sid: str, lobby_id: str) -> bool:
+        """ Fait entrer le socket dans le lobby (True si c'est le premier socket de l'utilisateur dans ce lobby) """
+        user = self.presence.get_user(sid)
+        await self._stop_watching(sid)
+        change = self.presence.join_lobby(sid, lobby_id)
+        if change.previous_lobby_id:
+            await self.sio_server.leave_room(sid, change.previous_lobby_id)
+            if change.left_previous:
+                await self._user_left(user, change.previous_lobby_id)
+        if change.first_in_lobby:
+            self.host_migration.user_returned(lobby_id, user.id)
 
-    async def join_lobby(self, sid: str, lobby_id: str):
         await self.sio_server.save_session(sid, {"lobby_id": lobby_id})
         await self.sio_server.enter_room(sid, lobby_id)
-        self.user_lobbies[self.active_users[sid].id] = lobby_id
-        print(f"✅ {self.active_users[sid].username} joined lobby {lobby_id} (SID={sid})")
-    
-    async def leave_lobby(self, sid: str, lobby_id: str):
+        logger.info("websocket joined lobby", extra={"user_id": user.id, "sid": sid, "lobby_id": lobby_id})
+        return change.first_in_lobby
+
+    async def watch_lobby(self, sid: str, lobby_id: str) -> None:
+        """
+        Fait entrer le socket dans le lobby en spectateur : room ``lobby_id:spectators``,
+        aucune ligne ``players``, ni compté en ligne ni candidat à la bascule d'hôte.
+        """
+        if self.presence.lobby_of_sid(sid):
+            await self.leave_lobby(sid)
+        previous = self.presence.watch_lobby(sid, lobby_id)
+        if previous:
+            await self.sio_server.leave_room(sid, spectator_room(previous))
+        await self.sio_server.save_session(sid, {"lobby_id": lobby_id, "spectator": True})
+        await self.sio_server.enter_room(sid, spectator_room(lobby_id))
+        logger.info("websocket watching lobby", extra={"sid": sid, "lobby_id": lobby_id})
+
+    async def _stop_watching(self, sid: str) -> None:
+        watched = self.presence.stop_watching(sid)
+        if watched:
+            await self.sio_server.leave_room(sid, spectator_room(watched))
+
+    async def leave_lobby(self, sid: str):
+        await self._stop_watching(sid)
+        lobby_id, last = self.presence.leave_lobby(sid)
         if lobby_id:
             await self.sio_server.leave_room(sid, lobby_id)
+            if last:
+                await self._user_left(self.presence.get_user(sid), lobby_id)
+
+    async def _user_left(self, user: WebSocketUser, lobby_id: str):
+        """Dernier socket de ``user`` dans le lobby : bascule d'hôte, annonce, et nettoyage si le lobby est vide."""
+        self.host_migration.user_left(lobby_id, user.id)
+        online_count = self.presence.online_count(lobby_id)
+        await self.broadcast_public("user_left", {"user": user.model_dump(), "online_count": online_count}, lobby_id)
+        if not online_count:
+            self.host_migration.forget_lobby(lobby_id)
+            for callback in self.on_lobby_empty:
+                callback(lobby_id)
 
-    async def broadcast(self, event: str, data: dict, lobby_id: str):
+    async def broadcast(self, event: str, data: dict, lobby_id: str, public: Optional[dict] = None):
+        """
+        Diffuse aux joueurs du lobby. ``public`` : version filtrée de l'événement pour les
+        spectateurs, construite une fois par l'appelant et émise une seule fois vers leur room
+        (le paquet est encodé une fois pour tous les spectateurs). Sans ``public``, les
+        spectateurs ne reçoivent rien.
+        """
         await self.sio_server.emit(event, data, room=lobby_id)
+        if public is not None and self.presence.spectator_count(lobby_id):
+            await self.sio_server.emit(event, public, room=spectator_room(lobby_id))
+
+    async def broadcast_public(self, event: str, data: dict, lobby_id: str):
+        """Diffuse un événement sans information secrète aux joueurs et aux spectateurs."""
+        await self.broadcast(event, data, lobby_id, public=data)
+
+    async def broadcast_views(self, event: str, views: Views, lobby_id: str):
+        """
+        Diffuse un événement dont chaque joueur voit une partie différente sans sérialiser
+        une vue complète par socket : ``views.public`` est émis une fois au lobby (et une
+        fois aux spectateurs), puis chaque joueur en ligne reçoit sous ``{event}_patch`` un
+        seul patch regroupant ce qu'il est seul à voir (``private``) et les secrets des
+        autres qui lui sont visibles (``hidden``) : une émission par socket, et non une par secret.
+        """
+        await self.broadcast(event, views.public, lobby_id, public=views.public)
+        patch_event = f"{event}_patch"
+        for user_id, patch in recipient_patches(views, self.presence.online_users(lobby_id)).items():
+            for sid in self.presence.sids_for_user(user_id):
+                await self.sio_server.emit(patch_event, patch, to=sid)
 
     async def send_to(self, sid: str, event: str, data: dict):
         await self.sio_server.emit(event, data, to=sid)
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import uuid
+from typing import Dict, Optional, Tuple
+
+from core.config import settings
+from core.metrics import metrics
+from db.database import async_session_maker
+from db.unit_of_work import UnitOfWork
+from repositories.lobby_repository import LobbyRepository
+from repositories.player_repository import PlayerRepository
+
+
+logger = logging.getLogger(__name__)
+
+host_migrations_total = metrics.counter("lobby_host_migrations_total", "Hôtes remplacés après déconnexion")
+
+
+class HostMigration:
+    """
+    Bascule d'hôte après déconnexion.
+
+    L'hôte de chaque lobby présent sur ce worker est lu une fois (``track``, au premier
+    utilisateur entré) et gardé en mémoire. Quand le dernier socket de l'hôte quitte le
+    lobby, une bascule est programmée après ``grace_period`` secondes (annulée s'il revient
+    entre-temps) ; le départ d'un autre joueur ne programme rien. Le nouvel hôte est le
+    joueur en ligne depuis le plus longtemps d'après l'index de présence parmi les joueurs
+    actifs du lobby en base ; la bascule est un seul ``UPDATE lobbies SET host_id``
+    conditionné à l'ancien hôte, suivi d'un delta ``host_changed``.
+    """
+
+    def __init__(self, manager, session_maker=None, grace_period: float | None = None) -> None:
+        self.manager = manager
+        self.session_maker = session_maker or async_session_maker
+        self.grace_period = grace_period if grace_period is not None else settings.HOST_MIGRATION_GRACE_PERIOD
+        self._pending: Dict[Tuple[str, str], asyncio.TimerHandle] = {}     # (lobby_id, user_id) -> échéance
+        self._tasks: set[asyncio.Task] = set()
+        self._hosts: Dict[str, str] = {}                                    # lobby_id -> host_id
+
+    async def track(self, lobby_id: str) -> None:
+        """Lit l'hôte de ``lobby_id`` s'il n'est pas déjà connu (une requête par lobby)."""
+        if lobby_id in self._hosts:
+            return
+        try:
+            lobby_uuid = uuid.UUID(lobby_id)
+        except ValueError:
+            return
+        try:
+            async with self.session_maker() as session:
+                host_id = await LobbyRepository(session).get_host_id(lobby_uuid)
+        except Exception:
+            logger.exception("host lookup failed", extra={"lobby_id": lobby_id})
+            return
+        if host_id is not None:
+            self._hosts.setdefault(lobby_id, str(host_id))
+
+    def forget_lobby(self, lobby_id: str) -> None:
+        """Plus personne en ligne dans ``lobby_id`` : l'hôte sera relu au prochain ``track``."""
+        self._hosts.pop(lobby_id, None)
+
+    def user_left(self, lobby_id: str, user_id: str) -> None:
+        """Le dernier socket de ``user_id`` a quitté ``lobby_id`` : programme la bascule s'il est l'hôte."""
+        self.user_returned(lobby_id, user_id)
+        if self._hosts.get(lobby_id) != user_id:
+            return
+        loop = asyncio.get_running_loop()
+        self._pending[(lobby_id, user_id)] = loop.call_later(self.grace_period, self._expire, lobby_id, user_id)
+
+    def user_returned(self, lobby_id: str, user_id: str) -> None:
+        """``user_id`` est revenu dans ``lobby_id`` avant la fin du délai de grâce."""
+        handle = self._pending.pop((lobby_id, user_id), None)
+        if handle is not None:
+            handle.cancel()
+
+    def cancel_all(self) -> None:
+        for handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
+
+    async def stop(self) -> None:
+        """Arrêt du serveur : plus de bascule programmée, celles en cours se terminent."""
+        self.cancel_all()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _expire(self, lobby_id: str, user_id: str) -> None:
+        self._pending.pop((lobby_id, user_id), None)
+        task = asyncio.create_task(self.migrate(lobby_id, user_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def migrate(self, lobby_id: str, previous_host_id: str) -> Optional[str]:
+        """Transfère l'hôte de ``lobby_id`` si ``previous_host_id`` l'était ; retourne le nouvel hôte."""
+        presence = self.manager.presence
+        if presence.lobby_of_user(previous_host_id) == lobby_id:
+            return None
+        candidates = [user_id for user_id in presence.online_users(lobby_id) if user_id != previous_host_id]
+        if not candidates:
+            return None
+
+        try:
+            async with self.session_maker() as session, UnitOfWork(session):
+                players = await PlayerRepository(session).get_active_user_ids(uuid.UUID(lobby_id))
+                # online_users est trié par ancienneté dans le lobby ; seul un joueur du lobby peut devenir hôte
+                new_host_id = next((user_id for user_id in candidates if uuid.UUID(user_id) in players), None)
+                if new_host_id is None:
+                    return None
+                transferred = await LobbyRepository(session).transfer_host(
+                    uuid.UUID(lobby_id), uuid.UUID(previous_host_id), uuid.UUID(new_host_id)
+                )
+        except Exception:
+            logger.exception("host migration failed", extra={"lobby_id": lobby_id})
+            return None
+        if not transferred:
+            return None
+
+        if lobby_id in self._hosts:
+            self._hosts[lobby_id] = new_host_id
+        host_migrations_total.inc()
+        logger.info("lobby host migrated", extra={"lobby_id": lobby_id, "host_id": new_host_id})
+        await self.manager.broadcast_public(
+            "host_changed",
+            {"lobby_id": lobby_id, "previous_host_id": previous_host_id, "host_id": new_host_id},
+            lobby_id,
+        )
+        return new_host_id
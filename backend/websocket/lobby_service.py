@@ -1,19 +1,171 @@
+import uuid
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import async_session_maker
+from db.unit_of_work import UnitOfWork
+from models import MissionAssignedStatus
+from models.lobby import LobbyPhase
 from websocket.connexion_manager import ConnexionManager
 from repositories.lobby_repository import LobbyRepository
+from services.mission_assignment_service import MissionAssignmentService
+from services.round_timer import RoundTimerService, round_timer
+from services.scoring_service import ScoringService
+from websocket.visibility import assignment_views
 
 
 class LobbyService:
-    def __init__(self, db: AsyncSession, websocket_manager: ConnexionManager):
+    def __init__(
+        self,
+        db: AsyncSession,
+        websocket_manager: ConnexionManager,
+        session_maker=None,
+        timers: RoundTimerService | None = None,
+    ):
         self.db = db
         self.lobby_repo = LobbyRepository(db)
         self.websocket_manager = websocket_manager
+        self.session_maker = session_maker or async_session_maker
+        self.round_timer = timers or round_timer
 
     async def join_lobby(self, sid: str, lobby_id: str):
-        user = self.websocket_manager.active_users.get(sid)
-        await self.websocket_manager.join_lobby(sid, lobby_id)
+        user = self.websocket_manager.get_user(sid)
+        first_in_lobby = await self.websocket_manager.join_lobby(sid, lobby_id)
 
         ## Ajouter en db
         # await self.lobby_repo.add_player(lobby_id, user.id)
 
-        await self.websocket_manager.broadcast("user_joined", {"user": user.model_dump()}, lobby_id)
+        # Un onglet supplémentaire du même utilisateur ne change pas la présence
+        if first_in_lobby:
+            # Hôte lu une fois par lobby : seul son départ programme une bascule
+            await self.websocket_manager.host_migration.track(lobby_id)
+            await self.websocket_manager.broadcast_public(
+                "user_joined",
+                {"user": user.model_dump(), "online_count": self.websocket_manager.online_count(lobby_id)},
+                lobby_id,
+            )
+
+    async def validate_missions(self, sid: str, lobby_id: str, results: dict):
+        """
+        Valide les missions (hôte uniquement, phase de validation) et diffuse
+        uniquement les changements de classement.
+        """
+        user = self.websocket_manager.get_user(sid)
+        try:
+            parsed = {uuid.UUID(key): MissionAssignedStatus(value) for key, value in results.items()}
+            async with self.session_maker() as session, UnitOfWork(session):
+                changes = await ScoringService(session).validate_missions(
+                    uuid.UUID(lobby_id), parsed, validated_by=uuid.UUID(user.id)
+                )
+        except (ValueError, PermissionError) as exc:
+            await self.websocket_manager.send_to(sid, "error", {"event": "lobby:validate_missions", "message": str(exc)})
+            return
+
+        if changes:
+            await self.websocket_manager.broadcast_public(
+                "leaderboard_update",
+                {"changes": [change._asdict() for change in changes]},
+                lobby_id,
+            )
+
+    async def assign_missions(self, sid: str, lobby_id: str):
+        """
+        Attribue une mission à chaque joueur actif (hôte uniquement) et diffuse l'attribution
+        selon la visibilité des missions : payload public commun, un patch par joueur.
+        """
+        if not await self._check_host(sid, lobby_id, "lobby:assign_missions"):
+            return
+        async with self.session_maker() as session, UnitOfWork(session):
+            missions_by_player = await MissionAssignmentService(session).assign_missions(uuid.UUID(lobby_id))
+        if not missions_by_player:
+            await self.websocket_manager.send_to(
+                sid, "error", {"event": "lobby:assign_missions", "message": "No player or mission to assign"},
+            )
+            return
+        await self.websocket_manager.broadcast_views(
+            "missions_assigned", assignment_views(lobby_id, missions_by_player), lobby_id,
+        )
+
+    async def start_round(self, sid: str, lobby_id: str, duration=None):
+        """
+        Démarre une manche (hôte uniquement) : phase ``round`` et, si ``duration`` (secondes)
+        est fourni, timer de fin de manche qui fera passer le lobby en validation.
+        """
+        if duration is not None:
+            try:
+                duration = float(duration)
+            except (TypeError, ValueError):
+                duration = 0.0
+            if duration <= 0:
+                await self.websocket_manager.send_to(
+                    sid, "error", {"event": "lobby:start_round", "message": "Round duration must be positive"},
+                )
+                return
+        if not await self._check_host(sid, lobby_id, "lobby:start_round"):
+            return
+        async with self.session_maker() as session, UnitOfWork(session):
+            started = await LobbyRepository(session).set_phase(uuid.UUID(lobby_id), LobbyPhase.ROUND)
+        if not started:
+            await self.websocket_manager.send_to(
+                sid, "error", {"event": "lobby:start_round", "message": "Cannot start a round in this lobby"},
+            )
+            return
+
+        if duration is not None:
+            await self.round_timer.schedule(lobby_id, duration)
+        else:
+            # Manche sans limite : un éventuel timer d'une manche précédente n'a plus lieu d'être
+            await self.round_timer.cancel(lobby_id)
+        await self.websocket_manager.broadcast_public(
+            "phase_changed",
+            {"lobby_id": lobby_id, "phase": LobbyPhase.ROUND.value, "duration": duration},
+            lobby_id,
+        )
+
+    async def end_round(self, sid: str, lobby_id: str):
+        """Termine la manche avant l'échéance (hôte uniquement) : timer annulé, phase de validation."""
+        if not await self._check_host(sid, lobby_id, "lobby:end_round"):
+            return
+        await self.round_timer.cancel(lobby_id)
+        if not await self.round_timer.transition_to_validation(uuid.UUID(lobby_id)):
+            await self.websocket_manager.send_to(
+                sid, "error", {"event": "lobby:end_round", "message": "No round in progress"},
+            )
+
+    async def pause_game(self, sid: str, lobby_id: str):
+        """Met la manche en pause (hôte uniquement) : le temps restant est conservé."""
+        if not await self._check_host(sid, lobby_id, "lobby:pause_game"):
+            return
+        remaining = await self.round_timer.pause(lobby_id)
+        if remaining is None:
+            await self.websocket_manager.send_to(
+                sid, "error", {"event": "lobby:pause_game", "message": "No round timer running"},
+            )
+            return
+        await self.websocket_manager.broadcast_public(
+            "game_paused", {"lobby_id": lobby_id, "remaining": round(remaining, 1)}, lobby_id,
+        )
+
+    async def resume_game(self, sid: str, lobby_id: str):
+        """Reprend la manche en pause (hôte uniquement) avec son temps restant."""
+        if not await self._check_host(sid, lobby_id, "lobby:resume_game"):
+            return
+        remaining = await self.round_timer.resume(lobby_id)
+        if remaining is None:
+            await self.websocket_manager.send_to(
+                sid, "error", {"event": "lobby:resume_game", "message": "Game is not paused"},
+            )
+            return
+        await self.websocket_manager.broadcast_public(
+            "game_resumed", {"lobby_id": lobby_id, "remaining": round(remaining, 1)}, lobby_id,
+        )
+
+    async def _check_host(self, sid: str, lobby_id: str, event: str) -> bool:
+        """Contrôle « hôte uniquement » d'un événement ; l'émetteur reçoit ``error`` sinon."""
+        user = self.websocket_manager.get_user(sid)
+        async with self.session_maker() as session:
+            host_id = await LobbyRepository(session).get_host_id(uuid.UUID(lobby_id))
+        if host_id is not None and str(host_id) == user.id:
+            return True
+        message = "Lobby not found" if host_id is None else "Only the host can control the round"
+        await self.websocket_manager.send_to(sid, "error", {"event": event, "message": message})
+        return False
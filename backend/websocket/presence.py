@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, AbstractSet, Dict, Iterator, NamedTuple, Optional, Set
+
+if TYPE_CHECKING:
+    from websocket.connexion_manager import WebSocketUser
+
+
+_EMPTY: frozenset = frozenset()
+
+
+class LobbyChange(NamedTuple):
+    """Résultat d'un changement de lobby pour un socket."""
+    previous_lobby_id: Optional[str]   # lobby quitté par le socket (s'il y en avait un)
+    left_previous: bool                # True si c'était le dernier socket de l'utilisateur dans ce lobby
+    first_in_lobby: bool               # True si c'est le premier socket de l'utilisateur dans le nouveau lobby
+
+
+class Departure(NamedTuple):
+    """Résultat de la suppression d'un socket."""
+    user: Optional["WebSocketUser"]
+    lobby_id: Optional[str]
+    left_lobby: bool                   # dernier socket de l'utilisateur dans le lobby
+    offline: bool                      # dernier socket de l'utilisateur tout court
+
+
+class PresenceIndex:
+    """
+    Index de présence en mémoire : sid <-> user (1-N), user <-> lobby, lobby -> sids,
+    plus les spectateurs (sid <-> lobby observé), comptés à part des joueurs.
+
+    Toutes les méthodes sont synchrones : sous asyncio, chaque mise à jour est donc
+    atomique (aucun ``await`` ne peut s'intercaler au milieu d'une modification).
+    Les lectures (``sids_for_user``, ``online_count``…) sont en O(1).
+    """
+
+    def __init__(self) -> None:
+        self._users: Dict[str, "WebSocketUser"] = {}         # sid      -> WebSocketUser
+        self._user_sids: Dict[str, Set[str]] = {}            # user_id  -> {sid}
+        self._sid_lobby: Dict[str, str] = {}                 # sid      -> lobby_id
+        self._user_lobby: Dict[str, str] = {}                # user_id  -> lobby_id
+        self._lobby_sids: Dict[str, Set[str]] = {}           # lobby_id -> {sid}
+        self._lobby_users: Dict[str, Dict[str, int]] = {}    # lobby_id -> {user_id: nb de sockets}, ordre d'arrivée
+        self._sid_watching: Dict[str, str] = {}              # sid      -> lobby_id observé
+        self._lobby_spectators: Dict[str, Set[str]] = {}     # lobby_id -> {sid} spectateurs
+
+    # --- Connexions ---
+
+    def add_connection(self, sid: str, user: "WebSocketUser") -> bool:
+        """Enregistre un socket. Retourne True si c'est le premier socket de l'utilisateur."""
+        if sid in self._users:
+            return False
+        self._users[sid] = user
+        sids = self._user_sids.setdefault(user.id, set())
+        sids.add(sid)
+        return len(sids) == 1
+
+    def remove_connection(self, sid: str) -> Departure:
+        """Supprime un socket de l'index (et de son lobby éventuel)."""
+        user = self._users.pop(sid, None)
+        if user is None:
+            return Departure(None, None, False, False)
+
+        lobby_id, left_lobby = self._detach_from_lobby(sid, user.id)
+        self.stop_watching(sid)
+
+        sids = self._user_sids.get(user.id)
+        offline = True
+        if sids is not None:
+            sids.discard(sid)
+            offline = not sids
+            if offline:
+                del self._user_sids[user.id]
+        return Departure(user, lobby_id, left_lobby, offline)
+
+    # --- Lobbies ---
+
+    def join_lobby(self, sid: str, lobby_id: str) -> LobbyChange:
+        """Rattache un socket à un lobby (en le détachant de son lobby précédent)."""
+        user = self._users.get(sid)
+        if user is None:
+            raise KeyError(f"Unknown sid {sid}")
+
+        previous = self._sid_lobby.get(sid)
+        if previous == lobby_id:
+            return LobbyChange(None, False, False)
+
+        left_previous = False
+        if previous is not None:
+            _, left_previous = self._detach_from_lobby(sid, user.id)
+
+        self._sid_lobby[sid] = lobby_id
+        self._lobby_sids.setdefault(lobby_id, set()).add(sid)
+        lobby_users = self._lobby_users.setdefault(lobby_id, {})
+        count = lobby_users.get(user.id, 0)
+        lobby_users[user.id] = count + 1
+        self._user_lobby[user.id] = lobby_id
+        return LobbyChange(previous, left_previous, count == 0)
+
+    def watch_lobby(self, sid: str, lobby_id: str) -> Optional[str]:
+        """Fait d'un socket un spectateur de ``lobby_id`` ; retourne le lobby observé auparavant."""
+        if sid not in self._users:
+            raise KeyError(f"Unknown sid {sid}")
+        previous = self.stop_watching(sid)
+        self._sid_watching[sid] = lobby_id
+        self._lobby_spectators.setdefault(lobby_id, set()).add(sid)
+        return previous
+
+    def stop_watching(self, sid: str) -> Optional[str]:
+        """Retire un socket des spectateurs ; retourne le lobby qu'il observait."""
+        lobby_id = self._sid_watching.pop(sid, None)
+        if lobby_id is None:
+            return None
+        spectators = self._lobby_spectators.get(lobby_id)
+        if spectators is not None:
+            spectators.discard(sid)
+            if not spectators:
+                del self._lobby_spectators[lobby_id]
+        return lobby_id
+
+    def leave_lobby(self, sid: str) -> tuple[Optional[str], bool]:
+        """Détache un socket de son lobby. Retourne (lobby_id, dernier socket de l'utilisateur)."""
+        user = self._users.get(sid)
+        if user is None:
+            return None, False
+        return self._detach_from_lobby(sid, user.id)
+
+    def _detach_from_lobby(self, sid: str, user_id: str) -> tuple[Optional[str], bool]:
+        lobby_id = self._sid_lobby.pop(sid, None)
+        if lobby_id is None:
+            return None, False
+
+        lobby_sids = self._lobby_sids.get(lobby_id)
+        if lobby_sids is not None:
+            lobby_sids.discard(sid)
+            if not lobby_sids:
+                del self._lobby_sids[lobby_id]
+
+        last = True
+        lobby_users = self._lobby_users.get(lobby_id)
+        if lobby_users is not None and user_id in lobby_users:
+            lobby_users[user_id] -= 1
+            last = lobby_users[user_id] <= 0
+            if last:
+                del lobby_users[user_id]
+                if not lobby_users:
+                    del self._lobby_users[lobby_id]
+
+        if last and self._user_lobby.get(user_id) == lobby_id:
+            del self._user_lobby[user_id]
+        return lobby_id, last
+
+    # --- Lectures O(1) ---
+
+    def get_user(self, sid: str) -> Optional["WebSocketUser"]:
+        return self._users.get(sid)
+
+    def sids_for_user(self, user_id: str) -> AbstractSet[str]:
+        """Sockets ouverts d'un utilisateur (vue en lecture seule, ne pas modifier)."""
+        return self._user_sids.get(user_id, _EMPTY)
+
+    def lobby_of_sid(self, sid: str) -> Optional[str]:
+        return self._sid_lobby.get(sid)
+
+    def lobby_of_user(self, user_id: str) -> Optional[str]:
+        return self._user_lobby.get(user_id)
+
+    def sids_in_lobby(self, lobby_id: str) -> AbstractSet[str]:
+        return self._lobby_sids.get(lobby_id, _EMPTY)
+
+    def online_count(self, lobby_id: str) -> int:
+        """Nombre d'utilisateurs distincts en ligne dans un lobby."""
+        return len(self._lobby_users.get(lobby_id, ()))
+
+    def watching(self, sid: str) -> Optional[str]:
+        return self._sid_watching.get(sid)
+
+    def spectator_count(self, lobby_id: str) -> int:
+        return len(self._lobby_spectators.get(lobby_id, ()))
+
+    def online_users(self, lobby_id: str) -> Iterator[str]:
+        """user_ids en ligne dans un lobby, du plus ancien au plus récent."""
+        return iter(self._lobby_users.get(lobby_id, {}))
+
+    def is_online(self, user_id: str) -> bool:
+        return user_id in self._user_sids
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, sid: str) -> bool:
+        return sid in self._users
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._users))
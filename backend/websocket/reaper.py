@@ -0,0 +1,80 @@
+import asyncio
+import contextlib
+import time
+
+from core.config import settings
+from core.metrics import metrics
+
+
+live_sockets = metrics.gauge("socketio_live_sockets", "Sockets présents dans l'index de présence")
+reaped_last_interval = metrics.gauge("socketio_reaped_last_interval", "Sockets évincés lors de la dernière passe")
+reaped_total = metrics.counter("socketio_reaped_total", "Sockets évincés depuis le démarrage")
+
+
+class ConnectionReaper:
+    """
+    Tâche périodique qui évince de ``ConnexionManager`` les sessions fantômes :
+    sockets déjà fermés côté Engine.IO (handler ``disconnect`` manqué) ou qui
+    n'ont pas répondu au dernier ping dans le délai ``ping_timeout``.
+    """
+
+    def __init__(
+        self,
+        manager,
+        interval: float | None = None,
+        ping_timeout: float | None = None,
+        namespace: str = "/",
+    ) -> None:
+        self.manager = manager
+        self.interval = interval if interval is not None else settings.SOCKETIO_REAPER_INTERVAL
+        self.ping_timeout = ping_timeout if ping_timeout is not None else settings.SOCKETIO_PING_TIMEOUT
+        self.namespace = namespace
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.reap_once()
+
+    async def reap_once(self) -> int:
+        """Effectue une passe et retourne le nombre de sockets évincés."""
+        reaped = 0
+        for sid in self.manager.presence:
+            if self._is_alive(sid):
+                continue
+            await self.manager.remove_connection(sid)
+            with contextlib.suppress(Exception):
+                await self.manager.sio_server.disconnect(sid, namespace=self.namespace)
+            reaped += 1
+
+        live_sockets.set(self.manager.presence.connection_count)
+        reaped_last_interval.set(reaped)
+        reaped_total.inc(reaped)
+        return reaped
+
+    def _is_alive(self, sid: str) -> bool:
+        sio_server = self.manager.sio_server
+        if not sio_server.manager.is_connected(sid, self.namespace):
+            return False
+
+        eio_sid = sio_server.manager.eio_sid_from_sid(sid, self.namespace)
+        socket = sio_server.eio.sockets.get(eio_sid)
+        if socket is None or socket.closed:
+            return False
+
+        # last_ping est positionné à l'envoi d'un ping et remis à None à la réception du pong
+        last_ping = getattr(socket, "last_ping", None)
+        if last_ping and time.time() - last_ping > self.ping_timeout:
+            return False
+        return True
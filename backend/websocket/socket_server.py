@@ -1,13 +1,35 @@
 
+import logging
+
 import socketio
 from db.database import async_session_maker
 from websocket.lobby_service import LobbyService
 from websocket.connexion_manager import ConnexionManager
+from websocket.reaper import ConnectionReaper
+from websocket.chat import ChatPersister, LobbyChat
 from core.config import settings
+from core.logging_config import bind_context
+
+
+def build_client_manager(url: str | None) -> socketio.AsyncManager | None:
+    """
+    File de messages partagée entre workers (``SOCKETIO_MESSAGE_QUEUE``) : sans elle, un
+    événement émis vers un lobby n'atteint que les sockets connectés au même worker.
+    """
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return socketio.AsyncRedisManager(url)
+    raise ValueError(f"Unsupported SOCKETIO_MESSAGE_QUEUE: {url}")
+
 
 sio_server = socketio.AsyncServer(
     async_mode="asgi",
+    client_manager=build_client_manager(settings.SOCKETIO_MESSAGE_QUEUE),
     cors_allowed_origins=[],
+    transports=[transport.strip() for transport in settings.SOCKETIO_TRANSPORTS.split(",")],
+    ping_interval=settings.SOCKETIO_PING_INTERVAL,
+    ping_timeout=settings.SOCKETIO_PING_TIMEOUT,
 )
 
 
@@ -19,9 +41,18 @@ sio_app = socketio.ASGIApp(
 db = async_session_maker()
 manager = ConnexionManager(sio_server)
 lobby_service = LobbyService(db, manager)
+reaper = ConnectionReaper(manager)
+chat_persister = ChatPersister() if settings.CHAT_PERSIST else None
+chat = LobbyChat(manager, persister=chat_persister)
+
+logger = logging.getLogger(__name__)
 
 @sio_server.event
 async def connect(sid, environ, auth):
+    bind_context(sid=sid)
+    if manager.draining:
+        # Redémarrage en cours : le client réessaiera sur un autre worker
+        raise ConnectionRefusedError("server_restarting")
     # Authentification
     token = auth.get("token") if auth else None
     if not token:
@@ -35,8 +66,9 @@ async def connect(sid, environ, auth):
 
 @sio_server.event
 async def disconnect(sid):
+    bind_context(sid=sid, lobby_id=manager.presence.lobby_of_sid(sid))
     await manager.remove_connection(sid)
-    print(f"🔌 SID={sid} disconnected")
+    logger.info("websocket disconnected")
 
 
 
@@ -45,8 +77,77 @@ async def disconnect(sid):
 @sio_server.event
 async def join_lobby(sid, data):
     lobby_id = data.get("lobby_id")
+    bind_context(sid=sid, lobby_id=lobby_id)
     await lobby_service.join_lobby(sid, lobby_id)
+    # Historique depuis le tampon circulaire du lobby, sans lecture en base
+    await chat.send_history(sid, lobby_id)
+
+
+@sio_server.event
+async def watch_lobby(sid, data):
+    lobby_id = data.get("lobby_id")
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        # Spectateur : aucune lecture ni écriture en base
+        await manager.watch_lobby(sid, lobby_id)
+        await manager.send_to(sid, "watching", {"lobby_id": lobby_id, "online_count": manager.online_count(lobby_id)})
+        await chat.send_history(sid, lobby_id)
+
+
+@sio_server.event
+async def chat_message(sid, data):
+    lobby_id = manager.presence.lobby_of_sid(sid)
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        await chat.post(sid, lobby_id, (data or {}).get("text"))
+
+
+@sio_server.on("lobby:validate_missions")
+async def validate_missions(sid, data):
+    lobby_id = manager.presence.lobby_of_sid(sid)
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        await lobby_service.validate_missions(sid, lobby_id, data.get("results", {}))
+
+
+@sio_server.on("lobby:assign_missions")
+async def assign_missions(sid, data=None):
+    lobby_id = manager.presence.lobby_of_sid(sid)
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        await lobby_service.assign_missions(sid, lobby_id)
+
+
+@sio_server.on("lobby:start_round")
+async def start_round(sid, data):
+    lobby_id = manager.presence.lobby_of_sid(sid)
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        await lobby_service.start_round(sid, lobby_id, (data or {}).get("duration"))
+
+
+@sio_server.on("lobby:end_round")
+async def end_round(sid, data=None):
+    lobby_id = manager.presence.lobby_of_sid(sid)
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        await lobby_service.end_round(sid, lobby_id)
+
+
+@sio_server.on("lobby:pause_game")
+async def pause_game(sid, data=None):
+    lobby_id = manager.presence.lobby_of_sid(sid)
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        await lobby_service.pause_game(sid, lobby_id)
+
 
+@sio_server.on("lobby:resume_game")
+async def resume_game(sid, data=None):
+    lobby_id = manager.presence.lobby_of_sid(sid)
+    bind_context(sid=sid, lobby_id=lobby_id)
+    if lobby_id:
+        await lobby_service.resume_game(sid, lobby_id)
 
 
-__all__ = ["sio_server", "sio_app"]
\ No newline at end of file
+__all__ = ["sio_server", "sio_app", "reaper", "chat_persister"]
\ No newline at end of file
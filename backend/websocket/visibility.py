@@ -0,0 +1,95 @@
+"""
+Diffusion selon la visibilité : un payload public commun et des patchs secrets par joueur
+"""
+from typing import Dict, Iterable, Mapping, NamedTuple
+
+
+class Views(NamedTuple):
+    """
+    Vues d'un événement à information partielle.
+
+    - ``public`` : payload commun à tout le lobby (et aux spectateurs), encodé une seule fois ;
+    - ``private`` : user_id -> patch visible par ce seul joueur ;
+    - ``hidden`` : user_id -> patch visible par tous les joueurs du lobby sauf lui.
+
+    Les patchs ont la même forme que le payload public : le client les fusionne dessus.
+    """
+    public: dict
+    private: Dict[str, dict]
+    hidden: Dict[str, dict]
+
+
+def assignment_views(lobby_id, missions_by_player: Mapping) -> Views:
+    """
+    Vues de l'attribution des missions (``MissionAssignmentService.assign_missions``).
+
+    ``missions_by_player`` : player_id -> ``{"user_id", "mission_id", "mission": {...}}``. Selon
+    ``is_known_by_player`` / ``is_known_by_others``, la mission d'un joueur va dans le payload
+    public (connue de tous), dans son patch privé (connue de lui seul), dans un patch pour
+    les autres (connue des autres seulement) ou nulle part (secrète pour tous).
+    """
+    public: Dict[str, dict] = {}
+    private: Dict[str, dict] = {}
+    hidden: Dict[str, dict] = {}
+
+    for player_id, assignment in missions_by_player.items():
+        mission = assignment["mission"]
+        entry = {
+            "mission_id": str(assignment["mission_id"]),
+            "mission": {
+                "id": str(mission["id"]),
+                "title": mission["title"],
+                "description": mission["description"],
+            },
+        }
+        user_id = str(assignment["user_id"])
+        known_by_player, known_by_others = mission["is_known_by_player"], mission["is_known_by_others"]
+        if known_by_player and known_by_others:
+            public[str(player_id)] = entry
+        elif known_by_player:
+            _missions(private, user_id)[str(player_id)] = entry
+        elif known_by_others:
+            _missions(hidden, user_id)[str(player_id)] = entry
+
+    return Views(
+        public={"lobby_id": str(lobby_id), "phase": "assignment", "missions": public},
+        private=private,
+        hidden=hidden,
+    )
+
+
+def _missions(patches: Dict[str, dict], user_id: str) -> Dict[str, dict]:
+    patch = patches.get(user_id)
+    if patch is None:
+        patch = patches[user_id] = {"missions": {}}
+    return patch["missions"]
+
+
+def recipient_patches(views: Views, players: Iterable[str]) -> Dict[str, dict]:
+    """
+    Patch unique de chaque joueur de ``players`` : son patch privé fusionné avec les patchs
+    ``hidden`` des autres joueurs. Les joueurs sans rien de secret à recevoir sont absents.
+    """
+    patches: Dict[str, dict] = {}
+    for user_id in players:
+        missions = dict(views.private.get(user_id, {}).get("missions", {}))
+        for other, patch in views.hidden.items():
+            if other != user_id:
+                missions.update(patch["missions"])
+        if missions:
+            patches[user_id] = {"missions": missions}
+    return patches
+
+
+def full_view(views: Views, user_id: str, players: Iterable[str]) -> dict:
+    """
+    Vue complète d'un joueur (payload public fusionné avec les patchs qui le concernent).
+    Sert de référence aux tests et au benchmark : c'est ce qu'il faudrait sérialiser par
+    socket sans patchs.
+    """
+    missions = dict(views.public["missions"])
+    missions.update(views.private.get(user_id, {}).get("missions", {}))
+    for other in players:
+        if other != user_id:
+            missions.update(views.hidden.get(other, {}).get("missions", {}))
+    return {**views.public, "missions": missions}